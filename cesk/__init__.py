@@ -5,22 +5,32 @@ import sys
 from collections import deque
 import errno
 from utils import find_injection
-from cesk.structures import State, Ctrl, Envr, Stor, Kont
-from cesk.interpret import (decl_helper, execute, get_value,
+from cesk.ctrl import Ctrl
+from cesk.structures import State, Envr, Stor, Kont
+from cesk.slots import Collapses
+from cesk.scheduler import get_scheduler, FifoScheduler, ProgramOrder
+from cesk.parallel import ParallelEvaluator, index_nodes
+from cesk.graph import open_graph_writer
+from cesk.library_functions import printed, reset_output, write_output
+from cesk.interpret import (decl_helper, execute, get_value, set_widening,
                             implemented_nodes as impl_nodes)
 import cesk.linksearch as ls
 from cesk.exceptions import CESKException, MemoryAccessViolation, \
                             UnknownConfiguration
 from cesk.values import generate_function_definition
-logging.basicConfig(filename='logfile.txt', level=logging.DEBUG,
+from cesk.summaries import Summary
+from cesk.budget import Budget
+import cesk.config as cnf
+import cesk.trace as trace
+logging.basicConfig(filename='logfile.txt', level=logging.WARNING,
                     format='%(levelname)s: %(message)s', filemode='w')
 
 class StateEnumeration: #pylint: disable=too-few-public-methods
     """ Keeps track of information about a state """
     next_id = 0
-    def __init__(self, time):
+    def __init__(self, time, keep_successors=True):
         self.time = time
-        self.successors = set()
+        self.successors = set() if keep_successors else None
         self.ident = StateEnumeration.next_id
         self.time0 = time
         StateEnumeration.next_id += 1
@@ -29,95 +39,307 @@ class StateEnumeration: #pylint: disable=too-few-public-methods
         """ string of first created to last updated """
         return str(self.ident)+'-'+str(self.time0)+'/'+str(self.time)
 
-def main(ast, graph_file_name, injection_point): #pylint: disable=too-many-locals,too-many-branches,too-many-statements
-    """Injects execution into main funciton and maintains work queue"""
+class Exploration:
+    """ The states seen so far, the states waiting to be evaluated and
+        the counters reported by main. Edges go to the graph writer as
+        they are found, successor sets are only kept if asked for """
 
-    #values to be returned
-    memory_safe = True
-    states_generated = 1
-    states_matched = 0
-    states_evaluated = 0
+    def __init__(self, start_state, worklist, graph=None,
+                 keep_successors=False):
+        self.graph = graph
+        self.keep_successors = keep_successors
+        #map of states to time last seen and states generated from
+        self.seen_set = {}
+        #map of states to the error states they led to
+        self.errors = {}
+        self.worklist = worklist
+        #map of store addresses to the states that read them
+        self.dependents = {}
+        self.states_generated = 1
+        self.states_matched = 0
+        self.states_evaluated = 0
+        #collections by the number of addresses they reclaimed, and the
+        #blocks, bases and continuations reclaimed in all
+        self.reclaimed = {}
+        self.reclaimed_total = [0, 0, 0]
+        self.enumerate(start_state)
+        worklist.push(start_state)
+
+    def enumerate(self, state, failed=False):
+        """ Adds a state that has not been seen to the seen set """
+        enumeration = StateEnumeration(state.time_stamp, self.keep_successors)
+        self.seen_set[state] = enumeration
+        if self.graph is not None:
+            self.graph.add_node(enumeration.ident, str(enumeration.ident) +
+                                '-' + str(enumeration.time0) + '\n' +
+                                str(state), failed)
+        return enumeration
+
+    def add_successor(self, enumeration, successor, successor_enumeration):
+        """ Records the edge from a state to one of its successors """
+        if self.graph is not None:
+            self.graph.add_edge(enumeration.ident, successor_enumeration.ident)
+        if self.keep_successors:
+            enumeration.successors.add(successor)
+
+    def evaluate(self, state):
+        """ Executes a state and records the results """
+        if trace.CONTROL:
+            trace.emit('control', "Evaluate %s", state.ctrl)
+        tracking = needs_tracking(state)
+        if tracking:
+            state.stor.start_tracking()
+        if grows_stor(state):
+            self.errors.pop(state, None)
+        try:
+            successors, errors = execute(state)
+            self.record(state, successors, errors)
+        except MemoryAccessViolation as error:
+            logging.error("Access Violation")
+            self.add_error(state, str(error))
+
+        if tracking:
+            reads, writes = state.stor.stop_tracking()
+            for address in reads:
+                #a dict keeps the order states are requeued in the same
+                #from run to run
+                self.dependents.setdefault(address, {})[state] = None
+            for address in writes:
+                for dependent in self.dependents.get(address, ()):
+                    self.worklist.push(dependent)
+
+    def record(self, state, successors, errors):
+        """ Queues the successors of an evaluated state that are new or
+            were seen at an earlier time """
+        seen_set = self.seen_set
+        enumeration = seen_set[state]
+        self.states_evaluated += 1
+        for successor in successors:
+            self.states_generated += 1
+            if successor.kont_addr != state.kont_addr and \
+                    needs_collection(successor):
+                #frames and continuations only die when a call returns
+                self.collect(successor)
+            successor_enumeration = seen_set.get(successor)
+            if successor_enumeration is None:
+                successor_enumeration = self.enumerate(successor)
+                self.worklist.push(successor)
+            elif successor.time_stamp > successor_enumeration.time:
+                successor_enumeration.time = successor.time_stamp
+                self.worklist.push(successor)
+            else:
+                self.states_matched += 1
+            self.add_successor(enumeration, successor, successor_enumeration)
+        for error in errors:
+            self.add_error(state, error)
+
+    def collect(self, state):
+        """ Collects the garbage in the store of a successor, which may
+            share its store with the other successors, see Stor.collect """
+        state.set_stor(Stor(state.stor))
+        reclaimed = state.stor.collect(state.envr, state.kont_addr)
+        total = sum(reclaimed)
+        self.reclaimed[total] = self.reclaimed.get(total, 0) + 1
+        for kind, count in enumerate(reclaimed):
+            self.reclaimed_total[kind] += count
+
+    def gc_report(self):
+        """ Collections made and addresses reclaimed, None without gc """
+        if cnf.CONFIG['gc'] == 'none':
+            return None
+        blocks, bases, konts = self.reclaimed_total
+        return {'collections': sum(self.reclaimed.values()),
+                'blocks': blocks, 'bases': bases, 'continuations': konts,
+                'histogram': {str(total): self.reclaimed[total]
+                              for total in sorted(self.reclaimed)}}
+
+    def add_error(self, state, message):
+        """ Adds an error state as a successor of state """
+        error_state = state.get_error(message)
+        self.errors.setdefault(state, set()).add(error_state)
+        error_enumeration = self.seen_set.get(error_state)
+        if error_enumeration is None:
+            error_enumeration = self.enumerate(error_state, True)
+        elif error_state.time_stamp > error_enumeration.time:
+            error_enumeration.time = error_state.time_stamp
+        self.add_successor(self.seen_set[state], error_state,
+                           error_enumeration)
+
+    @property
+    def failed_states(self):
+        """ The error states of the last evaluation of each state """
+        return set().union(*self.errors.values())
+
+    def restart(self, start_state, budget):
+        """ Explores again from start_state, replacing the states seen, the
+            errors found and the output printed. A streamed graph goes on
+            with the states of the second exploration, which are numbered
+            after those of the first, a graphviz graph only has the second
+            since it is built from the states seen. If the budget runs out
+            the second exploration is given up, the first is kept with its
+            counters and output, and since it finished the budget is renewed.
+            Returns False then """
+        first = (self.seen_set, self.errors, self.dependents,
+                 self.states_generated, self.states_matched,
+                 self.states_evaluated, printed())
+        reset_output()
+        self.seen_set = {}
+        self.errors = {}
+        self.dependents = {}
+        self.enumerate(start_state)
+        self.worklist.push(start_state)
+        while self.worklist and not budget.spent(self.states_evaluated):
+            self.evaluate(self.worklist.pop())
+        if budget.exhausted is None:
+            return True
+        (self.seen_set, self.errors, self.dependents, self.states_generated,
+         self.states_matched, self.states_evaluated, output) = first
+        reset_output()
+        write_output(output)
+        while self.worklist:
+            self.worklist.pop()
+        budget.renew()
+        return False
+
+def main(ast, graph_file_name, injection_point, jobs=1, #pylint: disable=too-many-arguments
+         graph_format='graphviz', budget=None, checkpoint=None):
+    """Injects execution into main funciton and maintains work queue, until
+    it is empty or the budget is spent. The exploration is saved to the
+    checkpoint, which is only used without jobs. What the program printed
+    is returned last"""
+    if budget is None:
+        budget = Budget()
 
     #Search ast. link children to parents, map names FuncDef and Label nodes
     ls.LinkSearch().visit(ast)
+    #number the statements and find their successors
+    Ctrl.build_cfg()
+    if checkpoint is not None:
+        index_nodes(ast) #nodes are saved by their index
     injection_function = find_injection(ast, injection_point)[0]
 
+    Collapses.count = 0
+    Stor.gc_block_ids = {}
+    Stor.gc_next_block_id = 1
+    Stor.jmp_konts = set()
+    Summary.reset()
+    reset_output()
     start_state = prepare_start_state(injection_function)
-    #map of states to time last seen and states generated from
-    seen_set = {start_state:StateEnumeration(start_state.time_stamp)}
-    failed_states = set()
-    frontier = set([start_state])
-    while frontier: #is not empty
-        new_frontier = set()
-        for next_state in frontier:
-            try:
-                successors, errors = execute(next_state)
-                states_evaluated += 1
-                for successor in successors:
-                    states_generated += 1
-                    if successor not in seen_set:
-                        seen_set[successor] = \
-                            StateEnumeration(successor.time_stamp)
-                        new_frontier.add(successor)
-                    elif successor.time_stamp > seen_set[successor].time:
-                        seen_set[successor].time = successor.time_stamp
-                        new_frontier.add(successor)
-                    else:
-                        states_matched += 1
-                    seen_set[next_state].successors.add(successor)
-                for error in errors:
-                    error_state = next_state.get_error(error)
-                    seen_set[next_state].successors.add(error_state)
-                    failed_states.add(error_state)
-                    if error_state not in seen_set:
-                        seen_set[error_state] = \
-                            StateEnumeration(error_state.time_stamp)
-                    elif error_state.time_stamp > seen_set[error_state].time:
-                        seen_set[error_state].time = error_state.time_stamp
-
-            except MemoryAccessViolation as error: #pylint: disable=broad-except
-                logging.error("Access Violation")
-                error_state = next_state.get_error(str(error))
-                seen_set[next_state].successors.add(error_state)
-                failed_states.add(error_state)
-                if error_state not in seen_set:
-                    seen_set[error_state] = \
-                        StateEnumeration(error_state.time_stamp)
-                elif error_state.time_stamp > seen_set[error_state].time:
-                    seen_set[error_state].time = error_state.time_stamp
-
-        frontier = new_frontier
-
-    memory_safe = len(failed_states) == 0
-
-    if graph_file_name is not None:
-        from graphviz import Digraph
-        graph = Digraph("CESK State Graph", filename=graph_file_name)
-        graph.attr('node', shape='diamond', style='filled', color='red')
-        for state in failed_states:
-            graph.node(seen_set[state].get_time()+"\n"+str(state))
-
-        graph.attr('node', shape='ellipse', style='solid', color='black')
-        for state, enumeration in seen_set.items():
-            node = enumeration.get_time()+"\n"+str(state)
-            for to_state in enumeration.successors:
-                node2 = seen_set[to_state].get_time()+"\n"+str(to_state)
-                graph.edge(node, node2)
-
-        graph.render()
-
-    return memory_safe, states_generated, states_matched, states_evaluated
+    parallel_report = None
+    if needs_widening():
+        set_widening(ProgramOrder(injection_function).loop_depth)
+    with open_graph_writer(graph_file_name, graph_format) as graph:
+        #the graphviz graph is built from the successor sets at the end
+        keep_successors = graph_file_name is not None and graph is None
+        try:
+            if jobs > 1:
+                exploration = Exploration(start_state, FifoScheduler(),
+                                          graph, keep_successors)
+                with ParallelEvaluator(ast, jobs) as evaluator:
+                    evaluator.explore(exploration, budget)
+                    parallel_report = evaluator.report()
+            else:
+                exploration = Exploration(start_state,
+                                          get_scheduler(injection_function),
+                                          graph, keep_successors)
+                run_serial(exploration, budget, checkpoint)
+                if needs_widening() and \
+                        not start_state.has_persistent_stor() and \
+                        budget.exhausted is None:
+                    narrow(exploration, start_state, injection_function,
+                           budget)
+        finally:
+            set_widening(None)
+
+    memory_safe = len(exploration.failed_states) == 0
+    if memory_safe and budget.exhausted is not None:
+        memory_safe = "unknown" #the states left may have errors
+
+    if keep_successors:
+        render_graphviz(exploration, graph_file_name)
+
+    return (memory_safe, exploration.states_generated,
+            exploration.states_matched, exploration.states_evaluated,
+            Collapses.count, exploration.gc_report(),
+            Summary.report(cnf.CONFIG['summaries'] == 'memo'),
+            budget.report(exploration.worklist), parallel_report, printed())
+
+def run_serial(exploration, budget, checkpoint):
+    """ Evaluates the states of the worklist until it is empty or the budget
+        is spent, the exploration is saved to the checkpoint on the way and
+        when the budget runs out """
+    if checkpoint is not None and checkpoint.resume:
+        checkpoint.restore(exploration)
+    worklist = exploration.worklist
+    while worklist and not budget.spent(exploration.states_evaluated):
+        exploration.evaluate(worklist.pop())
+        if checkpoint is not None and \
+                checkpoint.due(exploration.states_evaluated):
+            checkpoint.save(exploration)
+    if checkpoint is not None and budget.exhausted is not None:
+        checkpoint.save(exploration) #a larger budget can go on
+
+def narrow(exploration, start_state, injection_function, budget):
+    """ One narrowing pass over a finished exploration, if a widened slot
+        of the store narrows, see Stor.narrow """
+    bounds = start_state.stor.narrow()
+    if bounds is not None:
+        exploration.restart(prepare_start_state(injection_function, bounds),
+                            budget)
+
+def render_graphviz(exploration, graph_file_name):
+    """ Draws the states seen and their successors, error states in red """
+    from graphviz import Digraph
+    seen_set = exploration.seen_set
+    graph = Digraph("CESK State Graph", filename=graph_file_name)
+    graph.attr('node', shape='diamond', style='filled', color='red')
+    for state in exploration.failed_states:
+        graph.node(seen_set[state].get_time()+"\n"+str(state))
+
+    graph.attr('node', shape='ellipse', style='solid', color='black')
+    for state, enumeration in seen_set.items():
+        node = enumeration.get_time()+"\n"+str(state)
+        for to_state in enumeration.successors:
+            node2 = seen_set[to_state].get_time()+"\n"+str(to_state)
+            graph.edge(node, node2)
+
+    graph.render()
+
+def needs_tracking(state):
+    """ States sharing a store are requeued by the addresses they read
+        when the tick is dependency based """
+    return cnf.CONFIG['tick'] == 'dependency' and \
+           state.stor is not None and not state.has_persistent_stor()
+
+def grows_stor(state):
+    """ Weak updates only add values to a shared store, so a state evaluated
+        again finds every error it found before, except a read of a slot
+        that was since written. Its earlier errors are dropped """
+    return cnf.CONFIG['store_update'] == 'weak' and \
+           state.stor is not None and not state.has_persistent_stor()
+
+def needs_collection(state):
+    """ Each state with its own store collects the garbage in it when the
+        gc is on """
+    return cnf.CONFIG['gc'] == 'reachable' and state.has_persistent_stor()
+
+def needs_widening():
+    """ Interval values joined by weak updates are widened inside loops """
+    return cnf.CONFIG['values'] == 'interval' and \
+           cnf.CONFIG['store_update'] == 'weak'
 
 def implemented_nodes():
     """ returns a list of implemented node type names """
     return impl_nodes()
 
-def prepare_start_state(injection_function):
-    '''Creates the first state'''
+def prepare_start_state(injection_function, bounds=None):
+    '''Creates the first state, bounds are the blocks of a narrowed
+    exploration, see Stor.narrow'''
     halt_state = State(None, None, None, 0) # zero is halt kont
     start_ctrl = Ctrl(injection_function.body)
     start_envr = Envr('main', None) #state for allocF
     start_stor = Stor()
+    start_stor.bounds = bounds
     logging.debug("Globals init start")
     init_globals(start_stor)
     logging.debug("Globals init done")
@@ -0,0 +1,59 @@
+""" Limits on the states, time and memory of a run. An exploration that
+    reaches one stops with the states it has not evaluated left on its
+    worklist, see main """
+import resource
+import time
+
+class Budget:
+    """ States evaluated, seconds and megabytes of resident memory a run may
+        use, a limit of None is not checked """
+    CHECK_EVERY = 64 #states evaluated between the time and memory checks
+
+    def __init__(self, max_states=None, max_seconds=None, max_rss=None):
+        self.max_states = max_states
+        self.max_seconds = max_seconds
+        self.max_rss = max_rss
+        self.start = time.monotonic()
+        self.next_check = 0
+        self.exhausted = None #name of the limit that stopped the run
+
+    def spent(self, states_evaluated):
+        """ True once a limit is reached, exhausted then names it. Time and
+            memory are only read every CHECK_EVERY states """
+        if self.exhausted is not None:
+            return True
+        if self.max_states is not None and \
+                states_evaluated >= self.max_states:
+            self.exhausted = 'states'
+        elif states_evaluated >= self.next_check:
+            self.next_check = states_evaluated + Budget.CHECK_EVERY
+            if self.max_seconds is not None and \
+                    time.monotonic() - self.start >= self.max_seconds:
+                self.exhausted = 'seconds'
+            elif self.max_rss is not None and rss() >= self.max_rss:
+                self.exhausted = 'rss'
+        return self.exhausted is not None
+
+    def renew(self):
+        """ Forgets the limit reached, for a pass that was given up after
+            the run had finished """
+        self.exhausted = None
+
+    def report(self, worklist):
+        """ Limit reached and the program points of the states left on the
+            worklist, None if the run finished """
+        if self.exhausted is None:
+            return None
+        frontier = {}
+        for state in worklist:
+            point = repr(state.ctrl)
+            frontier[point] = frontier.get(point, 0) + 1
+        return {'exhausted': self.exhausted,
+                'seconds': time.monotonic() - self.start,
+                'frontier': [{'point': point, 'states': frontier[point]}
+                             for point in sorted(frontier)]}
+
+def rss():
+    """ Largest resident set of the process so far in megabytes, linux
+        reports ru_maxrss in kilobytes """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
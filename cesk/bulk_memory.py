@@ -0,0 +1,170 @@
+"""Store operations of the library functions that read or write many bytes
+   at once, like memcpy, memset and strlen, see cesk.library_functions"""
+
+import logging
+import cesk.trace as trace
+from cesk.values import generate_value
+from cesk.values.base_values import ByteValue, SizedSet, BaseInteger
+import cesk.config as cnf
+from cesk.exceptions import MemoryAccessViolation
+
+class BulkMemoryMixin:
+    """ Bulk operations of Stor, they use its blocks and write through
+        _writable_block so that copies of a persistent store are not
+        changed """
+
+    def _bulk_address(self, address, action):
+        """ (block id, offset) of a pointer given to a library function that
+            reads or writes many bytes, see copy_bytes """
+        if address in self.base_pointers:
+            address = self.base_pointers[address]
+        block_id = address.get_block()
+        self._record(read=block_id)
+        self._check_address(block_id, action)
+        offset = address.offset
+        if isinstance(offset, BaseInteger):
+            offset = offset.data
+        if not isinstance(offset, int):
+            if cnf.CONFIG['store_update'] != 'weak':
+                raise MemoryAccessViolation("Unknown offset in bulk " + action)
+            logging.error("TOP memory access made")
+            offset = None #any byte of the block
+        return block_id, offset
+
+    def _each_address(self, addresses, operation):
+        """ Errors of operation on each pointer of a set, raises if it
+            failed for all of them """
+        errors = set()
+        failed = 0
+        for address in addresses:
+            try:
+                errors.update(operation(address))
+            except MemoryAccessViolation as error:
+                errors.add(str(error))
+                failed += 1
+        if failed == len(addresses):
+            raise MemoryAccessViolation(str(errors))
+        return errors
+
+    def copy_bytes(self, destination, source, length=None):
+        """ Copies length bytes from source to destination as memmove does,
+            every byte is read before one is written. A length of None
+            copies as many bytes as both blocks have left, only sound for
+            weak store updates. Returns the errors """
+        if isinstance(destination, SizedSet):
+            return self._each_address(destination, lambda dest:
+                                      self.copy_bytes(dest, source, length))
+        if isinstance(source, SizedSet):
+            return self._each_address(source, lambda src:
+                                      self.copy_bytes(destination, src,
+                                                      length))
+        dest_id, dest_offset = self._bulk_address(destination, 'write')
+        src_id, src_offset = self._bulk_address(source, 'read')
+        if dest_offset is None or src_offset is None:
+            return self._smear(dest_id, dest_offset, length)
+        src_block = self.memory[src_id]
+        if length is None:
+            length = min(src_block.size - src_offset,
+                         self.memory[dest_id].size - dest_offset)
+        if trace.STORE:
+            trace.emit('store', "Copy %d bytes from %s to %s",
+                       length, source, destination)
+        if src_block.not_in_block(src_offset, length):
+            raise MemoryAccessViolation("Illegal Read")
+        if self.memory[dest_id].not_in_block(dest_offset, length):
+            raise MemoryAccessViolation("Illegal Write")
+        self._write_range(dest_id, dest_offset,
+                          src_block.read_range(src_offset, length))
+        return set()
+
+    def write_values(self, destination, values):
+        """ Writes values one after the other from destination, returns
+            the errors """
+        if isinstance(destination, SizedSet):
+            return self._each_address(destination, lambda dest:
+                                      self.write_values(dest, values))
+        dest_id, dest_offset = self._bulk_address(destination, 'write')
+        if dest_offset is None:
+            return self._smear(dest_id, None)
+        if self.memory[dest_id].not_in_block(
+                dest_offset, sum(value.size for value in values)):
+            raise MemoryAccessViolation("Illegal Write")
+        self._write_range(dest_id, dest_offset, values)
+        return set()
+
+    def _smear(self, block_id, offset, length=None, byte=None):
+        """ Weakly sets the bytes a bulk write with an unknown offset or
+            source may reach to byte, top if byte is None. That is length
+            bytes from a known offset, otherwise the whole block """
+        block = self.memory[block_id]
+        if offset is None:
+            offset, length = 0, block.size
+        elif length is None:
+            length = block.size - offset
+        if block.not_in_block(offset, length):
+            raise MemoryAccessViolation("Illegal Write")
+        if self._writable_block(block_id).fill(offset, length, byte,
+                                               self.widen):
+            self._changed(block_id)
+        return set()
+
+    def _write_range(self, block_id, offset, values):
+        """ Writes values from offset in the block at block_id """
+        if self._writable_block(block_id).write_range(offset, values,
+                                                      self.widen):
+            self._changed(block_id)
+
+    def fill_bytes(self, destination, byte, length=None):
+        """ Sets length bytes from destination to byte as memset does, top
+            bytes if byte is None. A length of None fills the rest of the
+            block. Returns the errors """
+        if isinstance(destination, SizedSet):
+            return self._each_address(destination, lambda dest:
+                                      self.fill_bytes(dest, byte, length))
+        dest_id, dest_offset = self._bulk_address(destination, 'write')
+        if dest_offset is None:
+            return self._smear(dest_id, None, byte=byte)
+        block = self.memory[dest_id]
+        if length is None:
+            length = block.size - dest_offset
+        if trace.STORE:
+            trace.emit('store', "Fill %d bytes of %s with %s",
+                       length, destination, byte)
+        if block.not_in_block(dest_offset, length):
+            raise MemoryAccessViolation("Illegal Write")
+        if self._writable_block(dest_id).fill(dest_offset, length, byte,
+                                              self.widen):
+            self._changed(dest_id)
+        return set()
+
+    def string_length(self, address):
+        """ (shortest, longest) number of chars before a null char from
+            address, they differ when a char may or may not be null """
+        if isinstance(address, SizedSet):
+            lengths = []
+            def measure(addr):
+                lengths.append(self.string_length(addr))
+                return set()
+            self._each_address(address, measure)
+            return (min(length[0] for length in lengths),
+                    max(length[1] for length in lengths))
+        block_id, offset = self._bulk_address(address, 'read')
+        block = self.memory[block_id]
+        if offset is None:
+            return 0, block.size - 1
+        shortest = None
+        length = 0
+        while True:
+            if block.not_in_block(offset + length, 1):
+                raise MemoryAccessViolation("Illegal Read")
+            value = block.read(offset + length, 1)
+            truth = set()
+            for char in value if isinstance(value, SizedSet) else [value]:
+                if isinstance(char, ByteValue):
+                    char = generate_value(char, 'char')
+                truth.update(char.get_truth_value())
+            if False in truth and shortest is None:
+                shortest = length
+            if True not in truth:
+                return shortest, length
+            length += 1
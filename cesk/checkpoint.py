@@ -0,0 +1,157 @@
+""" Saves the exploration of a run to disk every so often so that a run that
+    was stopped can go on from its last checkpoint, see --checkpoint. AST
+    nodes are saved as their index in the node table of parallel, so the
+    run that resumes must parse the same program with the same options """
+import io
+import os
+import time
+import zlib
+import pickle
+import random
+import cesk.linksearch as ls
+import cesk.config as cnf
+from cesk import StateEnumeration
+from cesk.parallel import StatePickler, StateUnpickler, _NODES
+from cesk.persistent_map import PersistentMap
+from cesk.structures import State, Envr, Kont, Stor
+from cesk.slots import Collapses
+from cesk.summaries import Summary
+from cesk.library_functions import printed, write_output
+from cesk.exceptions import CESKException
+
+FORMAT = 4 #changed when the saved fields change
+
+class CheckpointPickler(StatePickler):
+    """ Also saves persistent maps as their items, the trie is built again
+        since the hash of a key is not the same in another process """
+    def reducer_override(self, obj): #pylint: disable=method-hidden
+        """ Persistent maps are rebuilt from their items, other objects
+            are pickled as usual """
+        if isinstance(obj, PersistentMap):
+            return (PersistentMap, (list(obj.items()),))
+        return NotImplemented
+
+class Checkpoint: #pylint: disable=too-many-instance-attributes
+    """ File the exploration is saved to every every_states states or
+        every_seconds seconds, every DEFAULT_SECONDS if neither is given.
+        With resume a run starts from the file if there is one """
+    DEFAULT_SECONDS = 300
+    CHECK_EVERY = 64 #states evaluated between reads of the clock
+
+    def __init__(self, path, every_states=None, every_seconds=None,
+                 resume=False):
+        if every_states is None and every_seconds is None:
+            every_seconds = Checkpoint.DEFAULT_SECONDS
+        self.path = path
+        self.resume = resume
+        self.every_states = every_states
+        self.every_seconds = every_seconds
+        self.last_states = 0
+        self.last_time = time.monotonic()
+        self.next_check = 0
+        self.saved = 0 #checkpoints written by this run
+
+    def due(self, states_evaluated):
+        """ True if a checkpoint should be written after states_evaluated
+            states """
+        if self.every_states is not None and \
+                states_evaluated - self.last_states >= self.every_states:
+            return True
+        if self.every_seconds is not None and \
+                states_evaluated >= self.next_check:
+            self.next_check = states_evaluated + Checkpoint.CHECK_EVERY
+            return time.monotonic() - self.last_time >= self.every_seconds
+        return False
+
+    def save(self, exploration):
+        """ Writes the exploration, the counters of the machine and the
+            output so far, replacing the last checkpoint """
+        body = io.BytesIO()
+        CheckpointPickler(body, pickle.HIGHEST_PROTOCOL).dump({
+            'seen_set': exploration.seen_set,
+            'errors': exploration.errors,
+            'dependents': exploration.dependents,
+            'frontier': list(exploration.worklist),
+            'explored': (exploration.states_generated,
+                         exploration.states_matched,
+                         exploration.states_evaluated),
+            'reclaimed': (exploration.reclaimed, exploration.reclaimed_total),
+            'counters': save_counters(),
+            'envr_lut': ls.LinkSearch.envr_lut,
+            'summaries': (Summary.table, Summary.made, Summary.hits),
+            'random': random.getstate(),
+            'output': printed()})
+        header = {'format': FORMAT, 'config': dict(cnf.CONFIG),
+                  'nodes': fingerprint()}
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as checkpoint_file:
+            pickle.dump((header, zlib.compress(body.getvalue(), 1)),
+                        checkpoint_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path) #a crash keeps the last checkpoint
+        self.last_states = exploration.states_evaluated
+        self.last_time = time.monotonic()
+        self.saved += 1
+
+    def restore(self, exploration):
+        """ Replaces the exploration with the one in the checkpoint and
+            the output it had, False if there is no checkpoint """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'rb') as checkpoint_file:
+            header, body = pickle.load(checkpoint_file)
+        if header['format'] != FORMAT:
+            raise CESKException("Checkpoint format is not supported")
+        if header['config'] != cnf.CONFIG:
+            raise CESKException("Checkpoint was made with the configuration "
+                                + str(header['config']))
+        if header['nodes'] != fingerprint():
+            raise CESKException("Checkpoint was made for another program")
+        saved = StateUnpickler(io.BytesIO(zlib.decompress(body))).load()
+        exploration.seen_set = saved['seen_set']
+        exploration.errors = saved['errors']
+        exploration.dependents = saved['dependents']
+        worklist = exploration.worklist
+        while worklist:
+            worklist.pop()
+        for state in saved['frontier']:
+            worklist.push(state)
+        exploration.states_generated, exploration.states_matched, \
+            exploration.states_evaluated = saved['explored']
+        exploration.reclaimed, exploration.reclaimed_total = \
+            saved['reclaimed']
+        restore_counters(saved['counters'])
+        ls.LinkSearch.envr_lut.update(saved['envr_lut'])
+        Summary.table, Summary.made, Summary.hits = saved['summaries']
+        random.setstate(saved['random'])
+        write_output(saved['output'])
+        self.last_states = exploration.states_evaluated
+        return True
+
+def fingerprint():
+    """ Number of nodes in the node table and a checksum of their types """
+    names = '\n'.join(type(node).__name__ for node in _NODES)
+    return len(_NODES), zlib.crc32(names.encode())
+
+def save_counters():
+    """ The class level counters that allocation and ticks advance """
+    return {'time': State._time, #pylint: disable=protected-access
+            'allocK': Kont.allocK_address,
+            'allocF': Envr.next_frame_id,
+            'allocH': Stor.heap_address_counter,
+            'collapses': Collapses.count,
+            'gc_block_ids': Stor.gc_block_ids,
+            'gc_next_block_id': Stor.gc_next_block_id,
+            'jmp_konts': Stor.jmp_konts,
+            'state_id': StateEnumeration.next_id}
+
+def restore_counters(counters):
+    """ Inverse of save_counters """
+    State._time = counters['time'] #pylint: disable=protected-access
+    Kont.allocK_address = counters['allocK']
+    Envr.next_frame_id = counters['allocF']
+    Stor.heap_address_counter = counters['allocH']
+    Collapses.count = counters['collapses']
+    Stor.gc_block_ids = counters['gc_block_ids']
+    Stor.gc_next_block_id = counters['gc_next_block_id']
+    Stor.jmp_konts = counters['jmp_konts']
+    StateEnumeration.next_id = counters['state_id']
@@ -1,51 +1,153 @@
 """ File to store global options for CESK """
 
 CONFIG = {#default values for when cesk main in run
-    'values'       : 'concrete', # {concrete, abstract, trivial}
+    'values'       : 'concrete', # {concrete, abstract, trivial, interval}
     'store_update' : 'strong',   # {strong, weak} #nill
+    'store'        : 'shared',   # {shared, persistent}
+    'scheduler'    : 'fifo',     # {fifo, lifo, rpo, loop_depth}
     'limits'       : 'CESK',     # {cesk, gcc, std}
     'allocK'       : '0-cfa', # {concrete, 0-cfa, p4f, trivial}
     'allocF'       : '0-cfa', # {concrete, 0-cfa, 1-cfa, trivial}
     'allocH'       : 'concrete', # {concrete, abstract, trivial}
-    'tick'         : 'concrete'  # {concrete, abstract, trivial}
+    'tick'         : 'concrete', # {concrete, abstract, trivial, dependency}
+    'blocks'       : 'lazy',     # {eager, lazy, smashed}
+    'set_cap'      : 0,          # values in a store slot, 0 for no cap
+    'gc'           : 'none',     # {none, reachable}
+    'summaries'    : 'none',     # {none, memo}
     }
 
 
 """
 
+values
+    concrete: integers hold one value
+    abstract: integers are concrete from -1 to K and top past that
+    trivial:  integers are negative, zero or positive
+    interval: integers are a range of values. With weak store updates the
+              ranges in a slot are joined into one, writes made inside a loop
+              widen a growing bound to the end of the type. Once the shared
+              store is stable each widened slot is narrowed to the join of
+              what was written to it and the states are explored once more
+
 store_update
     strong: all updates to the store are replaced with the new value
     weak:   stores values that the store could possibly be
 
+store
+    shared:     one store is updated in place by every state
+    persistent: every state keeps its own copy-on-write store, forking is
+                cheap and states are only matched if their stores are equal
+
+scheduler
+    fifo:       evaluate states in the order they are found (breadth first)
+    lifo:       evaluate the most recently found state first (depth first)
+    rpo:        evaluate the state earliest in reverse postorder of the
+                control flow graph first
+    loop_depth: evaluate the state inside the most loops first, ties go
+                by reverse postorder
+
 allocF
     uses m-cfa allocation not k-cfa
+
+tick
+    concrete:   every state gets a new time stamp
+    abstract:   states are stamped with the number of changes to the shared
+                store, a seen state is evaluated again once the store changed
+    trivial:    every state gets the same time stamp
+    dependency: every state gets the same time stamp, while a state runs the
+                store records what it read and a change to those addresses
+                evaluates the state again. Needs the shared store, set it
+                with --tick dependency
+
+blocks
+    eager:   every slot of a block gets a value when the block is made
+    lazy:    large blocks keep a default value and the slots written so far,
+             memory grows with the slots used rather than the size declared
+    smashed: lazy, and every element of an array shares one slot per field,
+             needs weak store updates
+
+set_cap
+    the most values a slot of the store holds under weak updates, past it
+    the integers of a type and the pointers into a block in the slot are
+    made one value, top or the join of the values for intervals. Concrete
+    values are never collapsed. 0 keeps every value
+
+gc
+    none:      the store keeps every block, base and continuation made
+    reachable: each successor of a state drops the blocks, bases and
+               continuations it can no longer reach from its frame, its
+               continuations and the globals, so that states whose stores
+               only differ in garbage match. Needs the persistent store
+
+summaries
+    none: every call evaluates the body of the function
+    memo: a call that took one path, made no heap blocks and called no
+          library function but free, memcpy, memmove, memset, strlen and
+          strcpy is summarized by the blocks it read, the blocks it
+          changed and its return value. A later call with
+          the same arguments, in a store holding the blocks the summary
+          read, makes the changes and returns without evaluating the body.
+          Needs the persistent store
 """
 
 #Groups of configuration types for different analysis
 CONCRETE = {
     'values'       : 'concrete', # {concrete, abstract}
     'store_update' : 'strong',   # {strong, weak}
+    'store'        : 'shared',   # {shared, persistent}
+    'scheduler'    : 'fifo',     # {fifo, lifo, rpo, loop_depth}
     'limits'       : 'CESK',     # {cesk, gcc, std}
     'allocK'       : 'concrete', # {concrete, 0-cfa, p4f, trivial}
     'allocF'       : 'concrete', # {concrete, 0-cfa, trivial}
     'allocH'       : 'concrete', # {concrete, abstract, trivial}
-    'tick'         : 'concrete'  # {concrete, abstract, trivial}
+    'tick'         : 'concrete', # {concrete, abstract, trivial, dependency}
+    'blocks'       : 'lazy',     # {eager, lazy, smashed}
+    'set_cap'      : 0,          # values in a store slot, 0 for no cap
+    'gc'           : 'none',     # {none, reachable}
+    'summaries'    : 'none',     # {none, memo}
     }
 ABSTRACT = {
     'values'       : 'abstract', # {concrete, abstract}
     'store_update' : 'weak',   # {strong, weak}
+    'store'        : 'shared',   # {shared, persistent}
+    'scheduler'    : 'fifo',     # {fifo, lifo, rpo, loop_depth}
     'limits'       : 'CESK',     # {cesk, gcc, std}
     'allocK'       : '0-cfa', # {concrete, 0-cfa, p4f, trivial}
     'allocF'       : '0-cfa', # {concrete, 0-cfa, trivial}
     'allocH'       : 'abstract', # {concrete, abstract, trivial}
-    'tick'         : 'abstract'  # {concrete, abstract, trivial}
+    'tick'         : 'abstract', # {concrete, abstract, trivial, dependency}
+    'blocks'       : 'lazy',       # {eager, lazy, smashed}
+    'set_cap'      : 32,         # values in a store slot, 0 for no cap
+    'gc'           : 'none',     # {none, reachable}
+    'summaries'    : 'none',     # {none, memo}
     }
 TRIVIAL = {
     'values'       : 'trivial', # {concrete, abstract}
     'store_update' : 'weak',   # {strong, weak} nill
+    'store'        : 'shared',   # {shared, persistent}
+    'scheduler'    : 'fifo',     # {fifo, lifo, rpo, loop_depth}
     'limits'       : 'CESK',     # {cesk, gcc, std}
     'allocK'       : 'trivial', # {concrete, 0-cfa, p4f, trivial}
     'allocF'       : '0-cfa', # {concrete, 0-cfa, trivial}
     'allocH'       : 'trivial', # {concrete, abstract, trivial}
-    'tick'         : 'abstract'  # {concrete, abstract, trivial}
+    'tick'         : 'abstract', # {concrete, abstract, trivial, dependency}
+    'blocks'       : 'lazy',     # {eager, lazy, smashed}
+    'set_cap'      : 32,         # values in a store slot, 0 for no cap
+    'gc'           : 'none',     # {none, reachable}
+    'summaries'    : 'none',     # {none, memo}
+    }
+INTERVAL = {
+    'values'       : 'interval', # {concrete, abstract, interval}
+    'store_update' : 'weak',   # {strong, weak}
+    'store'        : 'shared',   # {shared, persistent}
+    'scheduler'    : 'fifo',     # {fifo, lifo, rpo, loop_depth}
+    'limits'       : 'CESK',     # {cesk, gcc, std}
+    'allocK'       : '0-cfa', # {concrete, 0-cfa, p4f, trivial}
+    'allocF'       : '0-cfa', # {concrete, 0-cfa, trivial}
+    'allocH'       : 'abstract', # {concrete, abstract, trivial}
+    'tick'         : 'abstract', # {concrete, abstract, trivial, dependency}
+    'blocks'       : 'lazy',       # {eager, lazy, smashed}
+    'set_cap'      : 32,         # values in a store slot, 0 for no cap
+    'gc'           : 'none',     # {none, reachable}
+    'summaries'    : 'none',     # {none, memo}
     }
@@ -0,0 +1,166 @@
+"""The control of the CESK machine, the program point a state is at"""
+
+import pycparser
+import pycparser.c_ast as AST
+import cesk.linksearch as ls
+from cesk.exceptions import CESKException
+
+class Ctrl: #pylint:disable=too-few-public-methods
+    """Holds the control pointer or location of the program. Ctrls are
+    interned, each location has one Ctrl so comparing them is by identity
+    and the hash is computed once"""
+    _table = {} #(index, body) or node -> Ctrl
+    _label_table = {} #label name -> Ctrl of the label
+
+    def construct_node(self, node):
+        """ sets the node """
+        self.node = node
+
+    def construct_body(self, index, body):
+        """ sets the index and body """
+        self.index = index
+        self.body = body
+
+    def __new__(cls, first, second=None):
+        """There are two types of control: The normal ones that have an index in
+        a body, and the special ones that only hold a Node. This picks which
+        constructor to use"""
+        if second:
+            if isinstance(second, pycparser.c_ast.FuncDef):
+                key = (first, second.body)
+            elif isinstance(second, pycparser.c_ast.Compound):
+                key = (first, second)
+            else:
+                raise CESKException("Ctrl init body not Compound or Function: "+
+                                    str(second))
+        elif first:
+            key = first
+        else:
+            raise CESKException("Malformed Ctrl init")
+
+        ctrl = Ctrl._table.get(key)
+        if ctrl is None:
+            ctrl = super().__new__(cls)
+            ctrl.index = None
+            ctrl.body = None
+            ctrl.node = None
+            if isinstance(key, tuple):
+                ctrl.construct_body(*key)
+                ctrl.statement = ctrl.body.block_items[ctrl.index]
+            else:
+                ctrl.construct_node(key)
+                ctrl.statement = key
+            #the hash of the key is the same in every forked process
+            ctrl.hash_value = hash(key)
+            ctrl.next = None #found by get_next
+            ctrl.next_error = None #message if leaving the ctrl fails
+            Ctrl._table[key] = ctrl
+        return ctrl
+
+    def __reduce__(self):
+        if self.body:
+            return (Ctrl, (self.index, self.body))
+        return (Ctrl, (self.node,))
+
+    @staticmethod
+    def build_cfg():
+        """ Numbers every statement in a compound block and finds the
+            successor of each and the target of each label. Must be called
+            after LinkSearch """
+        for node in list(ls.LinkSearch.parent_lut):
+            if isinstance(node, AST.Compound) and node.block_items:
+                for index in range(len(node.block_items)):
+                    Ctrl(index, node).find_next()
+        for name in ls.LinkSearch.label_lut:
+            Ctrl.goto(name)
+
+    @staticmethod
+    def goto(name):
+        """ Returns the ctrl of the label with the given name """
+        ctrl = Ctrl._label_table.get(name)
+        if ctrl is None:
+            body = ls.LinkSearch.label_lut[name]
+            while not isinstance(body, AST.Compound):
+                index = ls.LinkSearch.index_lut[body]
+                body = ls.LinkSearch.parent_lut[body]
+            ctrl = Ctrl(index, body)
+            Ctrl._label_table[name] = ctrl
+        return ctrl
+
+    def stmt(self):
+        """Retrieves the statement at the location."""
+        return self.statement
+
+    def get_next(self):
+        """takes state and returns a state with ctrl for the next statement
+        to execute"""
+        if self.next is None:
+            self.find_next()
+        if self.next_error is not None:
+            #a new exception each time, a cached one would keep every
+            #traceback it was raised with
+            raise CESKException(self.next_error)
+        return self.next
+
+    def find_next(self):
+        """ Finds and remembers the ctrl after this one, or the message of
+            the error that leaving this ctrl causes """
+        if self.next is None and self.next_error is None:
+            try:
+                self.next = self._walk_next()
+            except CESKException as error:
+                self.next_error = str(error)
+
+    def _walk_next(self):
+        """ Walks up the tree to the ctrl after this one """
+        if self.body: #if a standard compound-block:index ctrl
+            if self.index + 1 < len(self.body.block_items):
+                #if there are more items in the compound block go to next
+                return Ctrl(self.index + 1, self.body)
+
+            else:
+                #if we are falling off the end of a compound block
+                parent = ls.LinkSearch.parent_lut[self.body]
+                if parent is None:
+                    #we are falling off and there is no parent block
+                    raise CESKException("Expected Return Statement")
+
+                elif isinstance(parent, AST.Compound):
+                    #find current compound block position in the parent block
+                    parent_index = ls.LinkSearch.index_lut[self.body]
+                    new_ctrl = Ctrl(parent_index, parent)
+
+                else:
+                    #if the parent is not a compound (probably an if statement)
+                    new_ctrl = Ctrl(parent) #make a special ctrl and try again
+
+                return new_ctrl.get_next()
+
+        if self.node:
+            #if it is a special ctrl as created by binop or assign
+            #try to convert to normal ctrl and try again
+            parent = ls.LinkSearch.parent_lut[self.node]
+            if isinstance(parent, AST.Compound):
+                #we found the compound we can create normal ctrl
+                parent_index = ls.LinkSearch.index_lut[self.node]
+                new_ctrl = Ctrl(parent_index, parent)
+            else:
+                #we couldn't make a normal try again on parent
+                new_ctrl = Ctrl(parent)
+            return new_ctrl.get_next()
+
+        raise CESKException("Malformed ctrl: this should have been unreachable")
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __repr__(self):
+        if self.body:#this will not be unique for every contral
+            return (type(self.body.block_items[self.index]).__name__+" at "+
+                    str(self.body.block_items[self.index].coord))
+        if self.node:
+            return type(self.node).__name__+" at "+str(self.node.coord)
+        return "No body in ctrl"
@@ -0,0 +1,79 @@
+""" Writes the state graph while the state space is explored. Nodes are
+    numbered by the order states are found, the label of a state is made
+    once when it is found and edges are written as they are found """
+import json
+from contextlib import contextmanager
+
+class GraphWriter:
+    """ Streams nodes and edges to an open file """
+
+    def __init__(self, graph_file):
+        self.file = graph_file
+        self.start()
+
+    def start(self):
+        """ Writes anything that comes before the first node """
+
+    def add_node(self, ident, label, failed=False):
+        """ Writes a state with its label, failed states are errors """
+        raise NotImplementedError
+
+    def add_edge(self, from_ident, to_ident):
+        """ Writes a transition between two states already written """
+        raise NotImplementedError
+
+    def finish(self):
+        """ Writes anything that comes after the last edge """
+
+class DotWriter(GraphWriter):
+    """ Graphviz dot, repeated edges are merged by the strict graph """
+
+    def start(self):
+        self.file.write('strict digraph "CESK State Graph" {\n'
+                        '  node [shape=ellipse];\n')
+
+    def add_node(self, ident, label, failed=False):
+        label = label.replace('\\', '\\\\').replace('"', '\\"')
+        label = label.replace('\n', '\\n')
+        if failed:
+            self.file.write('  %d [label="%s", shape=diamond, style=filled, '
+                            'color=red];\n' % (ident, label))
+        else:
+            self.file.write('  %d [label="%s"];\n' % (ident, label))
+
+    def add_edge(self, from_ident, to_ident):
+        self.file.write('  %d -> %d;\n' % (from_ident, to_ident))
+
+    def finish(self):
+        self.file.write('}\n')
+
+class JsonLinesWriter(GraphWriter):
+    """ One json object per line, {"node": id, "label": text, "failed": bool}
+        or {"edge": [from id, to id]}. An edge can be written more than
+        once if a state is evaluated again """
+
+    def add_node(self, ident, label, failed=False):
+        self.file.write(json.dumps({'node': ident, 'label': label,
+                                    'failed': failed}) + '\n')
+
+    def add_edge(self, from_ident, to_ident):
+        self.file.write('{"edge": [%d, %d]}\n' % (from_ident, to_ident))
+
+WRITERS = {
+    'dot': DotWriter,
+    'jsonl': JsonLinesWriter
+}
+
+@contextmanager
+def open_graph_writer(file_name, graph_format):
+    """ A writer for the format, dot or jsonl, its file is finished and
+        closed on leaving. None for graphviz, which is drawn at the end """
+    if file_name is None or graph_format not in WRITERS:
+        yield None
+        return
+    with open(file_name, 'w', encoding='utf-8') as graph_file:
+        writer = WRITERS[graph_format](graph_file)
+        try:
+            yield writer
+        finally:
+            writer.finish()
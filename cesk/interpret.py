@@ -4,35 +4,71 @@ import pycparser.c_ast as AST
 from cesk.values.base_values import BaseInteger
 from cesk.values import generate_constant_value, cast
 from cesk.values.factory import Factory
-from cesk.structures import State, Ctrl, Envr, Kont, FrameAddress
+from cesk.ctrl import Ctrl
+from cesk.structures import State, Envr, Kont, FrameAddress, Stor
 import cesk.linksearch as ls
+import cesk.trace as trace
 import cesk.library_functions as lib_func
+import cesk.config as cnf
+from cesk.summaries import Summary, Recording
 from cesk.exceptions import CESKException
 
+#number of loops around each statement while writes in loops are widened
+LOOP_DEPTH = None
+#handlers are found by name through globals(), as before HANDLERS, to compare
+DISPATCH_BY_NAME = False
+#library functions a summarized call may make, they only change the store
+SUMMARIZED_LIBRARY = frozenset(['free', 'memcpy', 'memmove', 'memset',
+                                'strlen', 'strcpy'])
+
+def set_widening(loop_depth):
+    """ Widens the store writes made by statements that loop_depth, a map of
+        statements to the number of loops around them, puts in a loop. None
+        stops widening """
+    global LOOP_DEPTH #pylint: disable=global-statement
+    LOOP_DEPTH = loop_depth
+
+def set_dispatch(by_name):
+    """ Finds the handler of a statement by its name instead of in HANDLERS
+        when by_name is set, for step_benchmark """
+    global DISPATCH_BY_NAME #pylint: disable=global-statement
+    DISPATCH_BY_NAME = by_name
+
 def execute(state):
     """Takes a state evaluates the stmt from ctrl and returns a set of
     states, and a set of error strings if an error occured"""
+    state = state.fork()
     stmt = state.ctrl.stmt()
-    obj_name = stmt.__class__.__name__
-    if obj_name in implemented_nodes():
-        states, errors = handle(stmt, state)
+    if LOOP_DEPTH is not None:
+        state.stor.widen = LOOP_DEPTH.get(stmt, 0) > 0
+    if DISPATCH_BY_NAME:
+        handle_node = handler_by_name(stmt)
+    else:
+        handle_node = HANDLERS.get(stmt.__class__)
+    if handle_node is not None:
+        states, errors = handle_node(stmt, state)
         if not isinstance(states, set):
             raise Exception("state should be in set")
+        if state.stor.calls and (len(states) > 1 or errors):
+            state.stor.stop_summaries()
         return states, errors
-    elif obj_name in should_be_transformed_nodes():
-        raise Exception(obj_name + " should be transformed but wasn't")
-    elif obj_name in todo_implement_nodes():
-        raise Exception(obj_name + " not yet implemented")
-    elif obj_name in should_not_find():
-        raise Exception(should_not_find()[obj_name])
+    message = UNHANDLED_MESSAGES.get(stmt.__class__)
+    if message is not None:
+        raise Exception(message)
 
     raise ValueError("Unknown C AST object type: {0}".format(stmt))
 
+def handler_by_name(stmt):
+    """ The handler of an implemented node looked up by its name, None for
+        the others """
+    obj_name = stmt.__class__.__name__
+    if obj_name in implemented_nodes():
+        return globals()["handle_" + obj_name]
+    return None
+
 def handle(stmt, state):
     '''Handles all implemented nodes'''
-    method_name = "handle_" + stmt.__class__.__name__
-    handle_node = globals()[method_name]
-    return handle_node(stmt, state)
+    return HANDLERS[stmt.__class__](stmt, state)
 
 def handle_Label(stmt, state): # pylint: disable=invalid-name
     '''Handles Labels'''
@@ -41,7 +77,8 @@ def handle_Label(stmt, state): # pylint: disable=invalid-name
 
 def handle_If(stmt, state): # pylint: disable=invalid-name
     '''Handles Ifs'''
-    logging.debug("If")
+    if trace.CONTROL:
+        trace.emit('control', "If")
     value, errors = get_value(stmt.cond, state)
     next_states = set()
     truth = value.get_truth_value()
@@ -59,33 +96,37 @@ def handle_If(stmt, state): # pylint: disable=invalid-name
 
 def handle_ID(stmt, state): # pylint: disable=invalid-name
     '''Handles IDs'''
-    logging.debug("ID %s", stmt.name)
+    if trace.CONTROL:
+        trace.emit('control', "ID %s", stmt.name)
     return {state.get_next()}, set()
 
 def handle_Goto(stmt, state): # pylint: disable=invalid-name
     '''Handles Gotos'''
-    logging.debug('Goto %s', stmt.name)
-    body = ls.LinkSearch.label_lut[stmt.name]
-    logging.debug(body)
-    while not isinstance(body, AST.Compound):
-        index = ls.LinkSearch.index_lut[body]
-        body = ls.LinkSearch.parent_lut[body]
-    new_ctrl = Ctrl(index, body)
+    if trace.CONTROL:
+        trace.emit('control', 'Goto %s', stmt.name)
+    new_ctrl = Ctrl.goto(stmt.name)
     return {State(new_ctrl, state.envr, state.stor, state.kont_addr)}, {}
 
 def handle_FuncCall(stmt, state, address=None): # pylint: disable=invalid-name
     '''Handles FuncCalls'''
     if isinstance(stmt.name, AST.UnaryOp):
-        logging.debug("FuncCall to %s", stmt.name)
+        if trace.CONTROL:
+            trace.emit('control', "FuncCall to %s", stmt.name)
         func_def_frame_addr, _ = get_address(stmt.name, state)
         return func(stmt, state, func_def_frame_addr, address)
 
-    logging.debug("FuncCall to %s", stmt.name.name)
+    if trace.CONTROL:
+        trace.emit('control', "FuncCall to %s", stmt.name.name)
+    library_function = lib_func.LIBRARY.get(stmt.name.name)
+    if stmt.name.name in ("setjmp", "longjmp") or \
+            (library_function is not None and
+             stmt.name.name not in SUMMARIZED_LIBRARY):
+        state.stor.stop_summaries()
     if stmt.name.name == "setjmp":
         return setjmp(stmt, state, address)
     elif stmt.name.name == "longjmp":
         return longjmp(stmt, state)
-    elif stmt.name.name in dir(lib_func):
+    elif library_function is not None:
         args = []
         error_states = set()
         if stmt.args is not None:
@@ -93,7 +134,7 @@ def handle_FuncCall(stmt, state, address=None): # pylint: disable=invalid-name
             for arg, errs in arguments:
                 args.append(arg)
                 error_states.update(errs)
-        results, errs = getattr(lib_func, stmt.name.name)(state, args, address)
+        results, errs = library_function(state, args, address)
         error_states.update(errs)
         return results, error_states
     elif is_mem_alloc(stmt):
@@ -133,12 +174,45 @@ def func(stmt, state, func_def_frame_addr, address=None):
                                 str(len(param_list)) +
                                 " parameters but received " +
                                 str(len(expr_list)))
-        state, errs = func_helper(zip(param_list, expr_list), func_def,
-                                  state, address)
+        if cnf.CONFIG['summaries'] == 'memo' and len(func_defs) == 1:
+            state, errs = summarized_call(func_def, param_list, expr_list,
+                                          state, address)
+        else:
+            state, errs = func_helper(zip(param_list, expr_list), func_def,
+                                      state, address)
         return_states.add(state)
         errors.update(errs)
     return return_states, errors
 
+def summarized_call(func_def, param_list, expr_list, state, ret_address): #pylint: disable=too-many-arguments
+    '''Makes the changes and returns the value of a summary of an earlier
+    call to func_def with the same arguments if there is one, otherwise
+    calls func_def and records a summary of the call, see cesk.summaries'''
+    args = []
+    errors = set()
+    for expr in expr_list:
+        value, errs = get_value(expr, state)
+        args.append(value)
+        errors.update(errs)
+    key = None if errors else Summary.key(func_def, args)
+    if key is None:
+        return func_helper(zip(param_list, expr_list), func_def, state,
+                           ret_address)
+    summary = Summary.find(key, state.stor.memory)
+    if summary is not None:
+        if trace.CONTROL:
+            trace.emit('control', "Summary of %s", func_def.decl.name)
+        state.stor.apply_summary(summary)
+        if ret_address:
+            errors = state.stor.write(ret_address, summary.value)
+        return state.get_next(), errors
+    recording = Recording(key)
+    state.stor.open_call(recording)
+    new_state, errors = func_helper(zip(param_list, expr_list), func_def,
+                                    state, ret_address)
+    recording.kont_addr = new_state.kont_addr
+    return new_state, errors
+
 def func_helper(params, func_def, state, ret_address):#pylint: disable=too-many-locals
     '''Prepares the next_state from param_list and expr_list'''
     next_ctrl = Ctrl(0, func_def.body) # f_0
@@ -169,6 +243,7 @@ def setjmp(stmt, state, address):
     buf_addr = get_address(buf_name, state)
     jmp_buf = Kont.allocK()
     state.stor.write_kont(jmp_buf, Kont(state, address))
+    Stor.jmp_konts.add(jmp_buf) #a root of the gc while a jmp_buf holds it
 
     # return 0
     if address:
@@ -194,22 +269,26 @@ def handle_EmptyStatement(stmt, state): #pylint: disable=invalid-name
 
 def handle_Decl(stmt, state):#pylint: disable=invalid-name
     '''Handles Decls'''
-    logging.debug("Decl %s", str(stmt.name))
+    if trace.CONTROL:
+        trace.emit('control', "Decl %s", stmt.name)
     address = decl_helper(stmt, state)
     if stmt.init:
-        logging.debug("\tinit %s", stmt.name)
+        if trace.CONTROL:
+            trace.emit('control', "\tinit %s", stmt.name)
         return assignment_helper("=", address, stmt.init, state)
     else:
         return {state.get_next()}, set()
 
 def handle_Constant(stmt, state): #pylint: disable=invalid-name
     '''Handles Constants'''
-    logging.debug("Constant %s", stmt.type)
+    if trace.CONTROL:
+        trace.emit('control', "Constant %s", stmt.type)
     return {state.get_next()}, set()
 
 def handle_Compound(stmt, state): #pylint: disable=invalid-name
     '''Handles Compounds'''
-    logging.debug("Compound")
+    if trace.CONTROL:
+        trace.emit('control', "Compound")
     if stmt.block_items is None:
         return {state.get_next()}, set()
     else:
@@ -220,21 +299,24 @@ def handle_Compound(stmt, state): #pylint: disable=invalid-name
 
 def handle_Cast(stmt, state): #pylint: disable=invalid-name,unused-argument
     '''Handles Cast'''
-    logging.debug('Cast')
+    if trace.CONTROL:
+        trace.emit('control', 'Cast')
     #is not evaluated becase the operator is not stored
     # anywhere so should not affect the program
     return {state.get_next()}, set()
 
 def handle_BinaryOp(stmt, state): #pylint: disable=invalid-name,unused-argument
     '''Handles BinaryOps'''
-    logging.debug("BinaryOp")
+    if trace.CONTROL:
+        trace.emit('control', "BinaryOp")
     #is not evaluated becase the operator is not stored
     # anywhere so should not affect the program
     return {state.get_next()}, set()
 
 def handle_Assignment(stmt, state): #pylint: disable=invalid-name
     '''Handles Assignments'''
-    logging.debug("Assignment")
+    if trace.CONTROL:
+        trace.emit('control', "Assignment")
     rexp = stmt.rvalue
     laddress, errors = get_address(stmt.lvalue, state)
     states, errs = assignment_helper(stmt.op, laddress, rexp, state)
@@ -247,7 +329,8 @@ def handle_UnaryOp(stmt, state): # pylint: disable=invalid-name,unused-argument
 
 def handle_Return(stmt, state):# pylint: disable=invalid-name
     """satisfies kont"""
-    logging.debug("Return")
+    if trace.CONTROL:
+        trace.emit('control', "Return")
     exp = stmt.expr
     value = None
     errors = set()
@@ -256,7 +339,12 @@ def handle_Return(stmt, state):# pylint: disable=invalid-name
         value, errors = state.stor.read(address) #safe
     ret_set = set()
     errors = set()
-    for kont in state.get_kont():
+    konts = state.get_kont()
+    if state.stor.calls:
+        recording = state.stor.close_call(state.kont_addr, len(konts) == 1)
+        if recording is not None:
+            Summary.add(recording, state.stor.memory, value)
+    for kont in konts:
         next_states, errs = kont.invoke(state, value)
         ret_set.update(next_states)
         errors.update(errs)
@@ -395,7 +483,8 @@ def get_int_data(integer):
 
 def get_array_length(array, state):
     """Calculates size and allocates Array. Returns address of first item"""
-    logging.debug('  Array Decl')
+    if trace.CONTROL:
+        trace.emit('control', '  Array Decl')
     if isinstance(array.type, AST.ArrayDecl):
         raise CESKException("Multidim. arrays should be transformed to single")
     elif isinstance(array.type, (AST.TypeDecl, AST.PtrDecl)):
@@ -415,56 +504,173 @@ def get_array_length(array, state):
         raise CESKException("Declarations of " + str(array.type) +
                             " are not yet implemented")
 
-def get_value(stmt, state): #pylint: disable=too-many-return-statements
+#expression node -> closure that evaluates it in a state, made on first use
+VALUE_CLOSURES = {}
+ADDRESS_CLOSURES = {}
+#constant node -> its value, each literal is decoded once
+CONSTANTS = {}
+
+def get_value(stmt, state):
     """ get value for simple id's constants or references and casts of them """
-    if isinstance(stmt, AST.Constant):
-        value = generate_constant_value(stmt.value, stmt.type)
-        return value, set()
-    elif isinstance(stmt, AST.ID):
-        return state.stor.read(get_address(stmt, state)[0])
+    closure = VALUE_CLOSURES.get(stmt)
+    if closure is None:
+        closure = value_closure(stmt)
+    return closure(state)
+
+def get_address(reference, state):
+    """get_address"""
+    closure = ADDRESS_CLOSURES.get(reference)
+    if closure is None:
+        closure = address_closure(reference)
+    return closure(state)
+
+def value_closure(stmt):
+    """ The closure that gets the value of stmt, compiled once """
+    closure = VALUE_CLOSURES.get(stmt)
+    if closure is None:
+        closure = compile_value(stmt)
+        VALUE_CLOSURES[stmt] = closure
+    return closure
+
+def address_closure(reference):
+    """ The closure that gets the address of reference, compiled once """
+    closure = ADDRESS_CLOSURES.get(reference)
+    if closure is None:
+        closure = compile_address(reference)
+        ADDRESS_CLOSURES[reference] = closure
+    return closure
+
+def constant_of(node):
+    """ The value of a Constant node, decoded on first use """
+    value = CONSTANTS.get(node)
+    if value is None:
+        value = generate_constant_value(node.value, node.type)
+        CONSTANTS[node] = value
+    return value
+
+def constant_value(stmt):
+    """ The value of an expression that does not depend on the state, or
+        None. Values are never changed once made so one can be shared """
+    try:
+        if isinstance(stmt, AST.Constant):
+            return constant_of(stmt)
+        elif isinstance(stmt, AST.Cast):
+            to_type = stmt.to_type
+            if isinstance(to_type, AST.Typename):
+                to_type = to_type.type
+            value = constant_value(stmt.expr)
+            if value is not None and isinstance(to_type, AST.TypeDecl):
+                return cast(value, to_type)
+        elif isinstance(stmt, AST.BinaryOp):
+            left = constant_value(stmt.left)
+            right = constant_value(stmt.right)
+            if left is not None and right is not None:
+                return left.perform_operation(stmt.op, right)
+    except Exception: #pylint: disable=broad-except
+        pass #let the error happen when the expression is evaluated
+    return None
+
+def compile_value(stmt): #pylint: disable=too-many-return-statements
+    """ Makes the closure get_value calls for stmt """
+    value = constant_value(stmt)
+    if value is not None and not isinstance(value, set):
+        return lambda state: (value, set())
+
+    if isinstance(stmt, AST.ID):
+        address_of = address_closure(stmt)
+        def value_of_id(state):
+            return state.stor.read(address_of(state)[0])
+        return value_of_id
     elif isinstance(stmt, AST.Cast):
-        logging.debug(stmt.expr)
-        value, errors = get_value(stmt.expr, state)
-        value = cast(value, stmt.to_type, state)
-        return value, errors
+        to_type = stmt.to_type
+        expr = stmt.expr
+        value_of_expr = value_closure(expr)
+        def value_of_cast(state):
+            value, errors = value_of_expr(state)
+            value = cast(value, to_type, state)
+            return value, errors
+        return value_of_cast
     elif isinstance(stmt, AST.BinaryOp):
-        left, errors = get_value(stmt.left, state)
-        right, errs = get_value(stmt.right, state)
-        errors.update(errs)
-        result = left.perform_operation(stmt.op, right)
-        logging.debug("\tBinop: %s %s %s", str(left), stmt.op, str(right))
-        logging.debug("\t\t= %s size %d", str(result), result.size)
-        return result, errors
+        operator = stmt.op
+        value_of_left = value_closure(stmt.left)
+        value_of_right = value_closure(stmt.right)
+        def value_of_binop(state):
+            left, errors = value_of_left(state)
+            right, errs = value_of_right(state)
+            errors.update(errs)
+            result = left.perform_operation(operator, right)
+            if trace.VALUES:
+                trace.emit('values', "Binop: %s %s %s = %s size %d", left,
+                           operator, right, result, result.size)
+            return result, errors
+        return value_of_binop
     elif isinstance(stmt, AST.UnaryOp) and stmt.op == '&':
-        value, errors = get_address(stmt.expr, state)
-        if isinstance(value, FrameAddress):
-            value = state.stor.fa2ptr(value)
-        return value, errors
+        address_of = address_closure(stmt.expr)
+        def value_of_reference(state):
+            value, errors = address_of(state)
+            if isinstance(value, FrameAddress):
+                value = state.stor.fa2ptr(value)
+            return value, errors
+        return value_of_reference
     elif isinstance(stmt, AST.UnaryOp) and stmt.op == '*':
-        address, errors = get_address(stmt, state)
-        value, errs = state.stor.read(address)
-        errors.update(errs)
-        return value, errors
+        address_of = address_closure(stmt)
+        def value_of_dereference(state):
+            address, errors = address_of(state)
+            value, errs = state.stor.read(address)
+            errors.update(errs)
+            return value, errors
+        return value_of_dereference
     elif isinstance(stmt, AST.FuncCall):
         raise CESKException("Cannot get value from " + stmt.name.name + "()")
     else:
         raise CESKException("Cannot get value from " + stmt.__class__.__name__)
 
-def get_address(reference, state):
+def identifier_name(ident):
+    """ The name an ID refers to """
+    while not isinstance(ident, str):
+        ident = ident.name
+    return ident
+
+def compile_address(reference):
     # pylint: disable=too-many-branches
-    """get_address"""
+    """ Makes the closure get_address calls for reference """
     if isinstance(reference, AST.ID):
-        ident = reference
-        while not isinstance(ident, str):
-            ident = ident.name
-        if ident not in state.envr:
-            checked_decl = ls.check_for_implicit_decl(ident)
-            if checked_decl is not None:
-                logging.debug("Found implicit decl: %s", checked_decl.name)
-                decl_helper(checked_decl, state)
-            else:
-                raise CESKException("Decl for %s not found"%(ident))
-        return state.envr.get_address(ident), set()
+        ident = identifier_name(reference)
+        layout = ls.frame_layout(ls.enclosing_function(reference))
+        index = layout.get(ident)
+        global_index = ls.frame_layout(None).get(ident)
+        def address_of_id(state):
+            envr = state.envr
+            address = envr.local_variables.get(ident)
+            if address is not None:
+                return address, set()
+            if ident not in envr:
+                checked_decl = ls.check_for_implicit_decl(ident)
+                if checked_decl is not None:
+                    if trace.CONTROL:
+                        trace.emit('control', "Found implicit decl: %s",
+                                   checked_decl.name)
+                    decl_helper(checked_decl, state)
+                else:
+                    raise CESKException("Decl for %s not found"%(ident))
+            return envr.get_address(ident), set()
+        if index is not None:
+            def address_of_local(state):
+                envr = state.envr
+                if envr.layout is layout:
+                    address = envr.slots[index]
+                    if address is not None:
+                        return address, set()
+                return address_of_id(state) #not declared yet, or implicit
+            return address_of_local
+        if global_index is not None:
+            def address_of_global(state):
+                address = Envr.global_envr.slots[global_index]
+                if address is not None:
+                    return address, set()
+                return address_of_id(state)
+            return address_of_global
+        return address_of_id
 
     elif isinstance(reference, AST.ArrayRef):
         raise CESKException("ArrayRef should be transformed")
@@ -474,25 +680,36 @@ def get_address(reference, state):
         if unary_op.op == "*":
             name = unary_op.expr
             if isinstance(name, AST.ID):
-                pointer = state.envr.get_address(name)
-                return state.stor.read(pointer)
+                address_of = address_closure(name)
+                def address_in_id(state):
+                    return state.stor.read(address_of(state)[0])
+                return address_in_id
             elif isinstance(name, AST.UnaryOp) and name.op == "&":
-                return get_address(name.expr, state) #They cancel out
+                return address_closure(name.expr) #They cancel out
             elif isinstance(name, AST.Cast):
                 if isinstance(name.to_type, AST.PtrDecl):
                     to_type = name.to_type
                 elif isinstance(name.to_type, AST.Typename):
                     to_type = name.to_type.type
-                address, errors = get_address(name.expr, state)
-                address, errs = state.stor.read(address)
-                errors.update(errs)
-                address = cast(address, to_type, state)
-                return address, errors
+                else:
+                    raise CESKException("Unsupported cast of address to "
+                                        + str(name.to_type))
+                address_of = address_closure(name.expr)
+                def address_in_cast(state):
+                    address, errors = address_of(state)
+                    address, errs = state.stor.read(address)
+                    errors.update(errs)
+                    address = cast(address, to_type, state)
+                    return address, errors
+                return address_in_cast
             elif isinstance(name, AST.UnaryOp) and name.op == "*":
-                pointer, errors = get_value(name.expr, state)
-                address, errs = state.stor.read(pointer)
-                errors.update(errs)
-                return address, errors
+                value_of = value_closure(name.expr)
+                def address_in_dereference(state):
+                    pointer, errors = value_of(state)
+                    address, errs = state.stor.read(pointer)
+                    errors.update(errs)
+                    return address, errors
+                return address_in_dereference
             else:
                 raise CESKException("Unknown Case for UnaryOp, nested part is "
                                     + str(name))
@@ -534,26 +751,28 @@ def mem_alloc(exp, state):
 def mem_alloc_helper(stmt, state, break_up_list):
     '''performs memory allocation and returns CESKPointer to allocated memory'''
     if stmt.name.name == "malloc":
-        param = stmt.args.exprs[0]
-    #TODO Implement spesifics of calloc (write all alloc with nmemb)
-    elif stmt.name.name == "calloc":
-        param = stmt.args.exprs[1]
+        params = stmt.args.exprs[:1]
+    elif stmt.name.name == "calloc": #nmemb elements of size bytes
+        params = stmt.args.exprs[:2]
     else:
-        logging.debug("Failed allocation type: %s", str(stmt.name.name))
+        if trace.STORE:
+            trace.emit('store', "Failed allocation type: %s", stmt.name.name)
         raise CESKException("Unknown type of memory allocation")
-    if isinstance(param, AST.Constant):
-        #could fetch this concretely no matter what
-        value = generate_constant_value(param.value, param.type)
-    #elif isinstance(param, AST.ID):
-    #    value, _ = get_value(param, state) #id's should not produce an error
-    #else:
-    #    raise CESKException("Constant or ID expected %s "%repr(param))
-    else:
-        value, _ = get_value(param, state) #possibilty of ignored errors
-
-    num_bytes = get_int_data(value)
-    logging.info("Memory allocation(%d) with structure: %s", num_bytes,
-                 str(break_up_list))
+    num_bytes = 1
+    for param in params:
+        if isinstance(param, AST.Constant):
+            #could fetch this concretely no matter what
+            value = constant_of(param)
+        #elif isinstance(param, AST.ID):
+        #    value, _ = get_value(param, state) #id's should not produce an error
+        #else:
+        #    raise CESKException("Constant or ID expected %s "%repr(param))
+        else:
+            value, _ = get_value(param, state) #possibilty of ignored errors
+        num_bytes *= get_int_data(value)
+    if trace.STORE:
+        trace.emit('store', "Memory allocation(%d) with structure: %s",
+                   num_bytes, break_up_list)
     heap_pointer = state.stor.allocH(state)
 
     block_size = sum(break_up_list)
@@ -564,6 +783,8 @@ def mem_alloc_helper(stmt, state, break_up_list):
     else:
         pointer = state.stor.allocM(heap_pointer, break_up_list,
                                     num_blocks, leftover)
+    if stmt.name.name == "calloc":
+        state.stor.fill_bytes(pointer, 0)
     return pointer
 
 def is_mem_alloc(stmt):
@@ -572,3 +793,24 @@ def is_mem_alloc(stmt):
         stmt = stmt.expr
     return (isinstance(stmt, AST.FuncCall) and
             stmt.name.name in ['malloc', 'alloca', 'calloc'])
+
+def build_handlers():
+    """ Maps the class of each implemented node to its handler """
+    return {getattr(AST, name): globals()["handle_" + name]
+            for name in implemented_nodes()}
+
+def build_unhandled_messages():
+    """ Maps the class of each node execute refuses to the message of
+        the exception it raises """
+    messages = {}
+    for name, reason in should_not_find().items():
+        messages[name] = reason
+    for name in todo_implement_nodes():
+        messages[name] = name + " not yet implemented"
+    for name in should_be_transformed_nodes():
+        messages[name] = name + " should be transformed but wasn't"
+    return {getattr(AST, name): message for name, message in messages.items()
+            if hasattr(AST, name)}
+
+HANDLERS = build_handlers()
+UNHANDLED_MESSAGES = build_unhandled_messages()
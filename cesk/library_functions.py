@@ -1,14 +1,42 @@
 """ Set of cstd library functions with a CESK specific implementation:
-need the state and an array containing the values of the arguements passed """
+need the state and an array containing the values of the arguements passed.
+Each is registered in LIBRARY by the name a call uses """
+import io
 import re
+import codecs
 import random
+import pycparser.c_ast
 import cesk.values as values
 import cesk.values.base_values as BV
+from cesk.values.factory import Factory
+from cesk.values.abstract_literals import AbstractLiterals as AL
 import cesk.config as cnf
 import cesk.limits as limits
-#from cesk.values.abstract_literals import AbstractLiterals as AL
+import cesk.linksearch as ls
 
+LIBRARY = {} #function by the name of the library function it models
+_OUTPUT = io.StringIO() #what the program printed, see printed
 
+def printed():
+    """ Everything the program printed since the output was reset """
+    return _OUTPUT.getvalue()
+
+def write_output(text):
+    """ Adds text to what the program printed """
+    _OUTPUT.write(text)
+
+def reset_output():
+    """ Drops what the program printed """
+    _OUTPUT.seek(0)
+    _OUTPUT.truncate()
+
+def library(function):
+    """ Registers function as the model of the library function with its
+        name """
+    LIBRARY[function.__name__] = function
+    return function
+
+@library
 def printf(state, args, return_address):#pylint: disable=unused-argument
     '''performs printf'''
     value_array = []
@@ -22,9 +50,10 @@ def printf(state, args, return_address):#pylint: disable=unused-argument
     print_string = print_string % tuple(value_array)
     print_string = print_string[1:][:-1] #drop quotes
     print_string = print_string.replace("\\n", "\n")
-    print(print_string, end="") #convert newlines
+    write_output(print_string)
     return {state.get_next()}, {}
 
+@library
 def free(state, args, return_address):#pylint: disable=unused-argument
     """ Completes a free operation """
     errs = state.stor.free(args[0])
@@ -47,18 +76,112 @@ def __VERIFIER_nondet(state, return_address,#pylint: disable=invalid-name
         # MARKER
         errs = state.stor.write(return_address, value)
     return {state.get_next()}, errs
+@library
 def __VERIFIER_nondet_int(state, args, return_address):#pylint: disable=invalid-name,unused-argument
     return __VERIFIER_nondet(state, return_address,
                              -1, 9, 'int')
+@library
 def __VERIFIER_nondet_char(state, args, return_address):#pylint: disable=invalid-name,unused-argument
     return __VERIFIER_nondet(state, return_address,
                              0, 255, 'char')
+@library
 def __VERIFIER_nondet_ulong(state, args, return_address):#pylint: disable=invalid-name,unused-argument
     return __VERIFIER_nondet(state, return_address,
                              0, 10, 'unsigned long')
 
+@library
 def __VERIFIER_error(state, args, return_address): #pylint: disable=invalid-name,unused-argument
     return set(), set()
 
+def string_chars(literal):
+    """ Char codes of a string literal and its null char """
+    text = codecs.decode(literal[1:-1], 'unicode_escape')
+    return [ord(char) for char in text] + [0]
+
+def known_int(value):
+    """ int of an integer argument, None when it is not known """
+    if isinstance(value, BV.SizedSet):
+        ints = set(known_int(item) for item in value)
+        return ints.pop() if len(ints) == 1 else None
+    if isinstance(value, BV.BaseInteger) and isinstance(value.data, int):
+        return value.data
+    return None
+
+def byte_count(value):
+    """ int of a length argument, None when it is not known. The largest
+        length a set holds is used """
+    if isinstance(value, BV.SizedSet):
+        counts = [byte_count(item) for item in value]
+        if not counts or None in counts:
+            return None
+        return max(counts)
+    return known_int(value)
+
+def declared_type(name):
+    """ Type the program declares function name to return, int for a
+        function it does not declare """
+    func_decl = ls.LinkSearch.func_decl_lut.get(name)
+    if func_decl is not None and \
+            isinstance(func_decl.type, pycparser.c_ast.TypeDecl) and \
+            isinstance(func_decl.type.type, pycparser.c_ast.IdentifierType):
+        type_of = ' '.join(func_decl.type.type.names)
+        if type_of in limits.RANGES:
+            return type_of
+    return 'int'
+
+def finish(state, return_address, value, errors):
+    """ Writes the value returned and steps past the call """
+    if return_address is not None:
+        errors.update(state.stor.write(return_address, value))
+    return {state.get_next()}, errors
+
+@library
+def memcpy(state, args, return_address):
+    """ Copies bytes between blocks """
+    errors = state.stor.copy_bytes(args[0], args[1], byte_count(args[2]))
+    return finish(state, return_address, args[0], errors)
+
+@library
+def memmove(state, args, return_address):
+    """ Copies bytes between blocks that may overlap """
+    errors = state.stor.copy_bytes(args[0], args[1], byte_count(args[2]))
+    return finish(state, return_address, args[0], errors)
+
+@library
+def memset(state, args, return_address):
+    """ Sets each byte to the low byte of the value, bytes of a value that
+        is not known are top """
+    byte = known_int(args[1])
+    if byte is not None:
+        byte &= 0xFF
+    errors = state.stor.fill_bytes(args[0], byte, byte_count(args[2]))
+    return finish(state, return_address, args[0], errors)
+
+@library
+def strlen(state, args, return_address):
+    """ Number of chars before the null char """
+    if isinstance(args[0], str):
+        shortest = longest = len(string_chars(args[0])) - 1
+    else:
+        shortest, longest = state.stor.string_length(args[0])
+    type_of = declared_type('strlen')
+    if shortest == longest:
+        length = Factory.Integer(shortest, type_of)
+    else:
+        length = Factory.Integer(AL.TOP, type_of)
+    return finish(state, return_address, length, set())
+
+@library
+def strcpy(state, args, return_address):
+    """ Copies a string and its null char """
+    if isinstance(args[1], str):
+        errors = state.stor.write_values(
+            args[0], [Factory.Char(char, 'char')
+                      for char in string_chars(args[1])])
+    else:
+        _, longest = state.stor.string_length(args[1])
+        errors = state.stor.copy_bytes(args[0], args[1], longest + 1)
+    return finish(state, return_address, args[0], errors)
+
 
 #def alloca(state, args, return_address):#pylint: disable=unused-argument,invalid-name
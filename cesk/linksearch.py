@@ -1,5 +1,6 @@
 """Functions to interpret c code directly"""
 import logging
+from collections import namedtuple
 from copy import deepcopy
 import pycparser.c_ast as AST
 from cesk.limits import StructPackingScheme as SPS
@@ -13,10 +14,14 @@ class LinkSearch(AST.NodeVisitor): #
     envr_lut = {}
     function_lut = {}
     func_name_lut = {}
+    func_decl_lut = {} #FuncDecl of each function declared, by name
     struct_lut = {}
     union_lut = {}
     scope_decl_lut = {}
     global_decl_list = []
+    frame_layout_lut = {} #see frame_layout
+    layout_lut = {} #Layout by type node and by canonical type, see get_layout
+    layout_limits = None #limits config the layouts were made for
 
     def generic_visit(self, node):
         # pylint: disable=too-many-branches
@@ -32,6 +37,9 @@ class LinkSearch(AST.NodeVisitor): #
             LinkSearch.function_lut[name] = node
             LinkSearch.func_name_lut[node] = name
 
+        if isinstance(node, AST.Decl) and isinstance(node.type, AST.FuncDecl):
+            LinkSearch.func_decl_lut[node.name] = node.type
+
         if isinstance(node, AST.Struct) and node.decls:
             name = node.name
             LinkSearch.struct_lut[name] = node
@@ -94,9 +102,61 @@ class LinkSearch(AST.NodeVisitor): #
         return node
 
 
+#sizes of each variable in a type, their sum and the alignment of the type
+Layout = namedtuple('Layout', ['sizes', 'size', 'alignment'])
+
+def layout_key(ast_type):
+    """ Key equal for types that are laid out the same, the names of a base
+        type, the definition of a struct or union and the length of an
+        array. Other nodes are their own key """
+    if isinstance(ast_type, (AST.Decl, AST.TypeDecl, AST.Typename)):
+        return layout_key(ast_type.type)
+    if isinstance(ast_type, AST.IdentifierType):
+        return tuple(ast_type.names)
+    if isinstance(ast_type, AST.PtrDecl):
+        return AST.PtrDecl
+    if isinstance(ast_type, AST.ArrayDecl):
+        if isinstance(ast_type.dim, AST.Constant):
+            length = int(ast_type.dim.value)
+        elif isinstance(ast_type.dim, AST.ID):
+            length = 1
+        else:
+            return ast_type
+        return (AST.ArrayDecl, length, layout_key(ast_type.type))
+    if isinstance(ast_type, AST.Struct) and ast_type.decls is None:
+        return LinkSearch.struct_lut.get(ast_type.name, ast_type)
+    if isinstance(ast_type, AST.Union) and ast_type.decls is None:
+        return LinkSearch.union_lut.get(ast_type.name, ast_type)
+    return ast_type
+
+def get_layout(ast_type):
+    """ Layout of the type, made once per type node and shared by the nodes
+        of the same canonical type until the limits config changes """
+    layouts = LinkSearch.layout_lut
+    if LinkSearch.layout_limits is not limits.CONFIG:
+        layouts.clear()
+        LinkSearch.layout_limits = limits.CONFIG
+    layout = layouts.get(ast_type)
+    if layout is None:
+        key = layout_key(ast_type)
+        layout = layouts.get(key)
+        if layout is None:
+            sizes = []
+            alignment = find_sizes(ast_type, sizes)
+            layout = Layout(tuple(sizes), sum(sizes), alignment)
+            layouts[key] = layout
+        layouts[ast_type] = layout
+    return layout
+
 def get_sizes(ast_type, list_so_far):
     """ Populates list_so_far with a list of sizes for each variable in
         the struct """
+    layout = get_layout(ast_type)
+    list_so_far.extend(layout.sizes)
+    return layout.alignment
+
+def find_sizes(ast_type, list_so_far):
+    """ Works out the sizes get_sizes gives without the layout cache """
     if isinstance(ast_type, AST.ArrayDecl):
         alignment = get_array_sizes(ast_type, list_so_far)
     elif isinstance(ast_type, (AST.Decl, AST.TypeDecl, AST.Typename)):
@@ -230,3 +290,39 @@ def check_for_implicit_decl(ident):
                 if decl.name == ident.name:
                     return decl
     return None
+
+def enclosing_function(node):
+    """ Name of the function node is in, None outside of functions """
+    while node is not None:
+        if isinstance(node, AST.FuncDef):
+            return LinkSearch.func_name_lut[node]
+        node = LinkSearch.parent_lut.get(node)
+    return None
+
+def frame_layout(func_name):
+    """ Slot of each identifier a frame of the function maps, its parameters
+        and the decls in its compounds. None is the layout of the globals
+        and functions, a name that is not a function has no slots """
+    layouts = LinkSearch.frame_layout_lut
+    if not layouts:
+        layouts[None] = {}
+        for name, func in LinkSearch.function_lut.items():
+            layouts[name] = layout = {}
+            params = func.decl.type.args
+            for param in params.params if params else ():
+                if isinstance(param, AST.Decl) and param.name:
+                    layout.setdefault(param.name, len(layout))
+        for compound, decls in LinkSearch.scope_decl_lut.items():
+            name = enclosing_function(compound)
+            if name is None:
+                continue
+            layout = layouts[name]
+            for decl in decls:
+                if decl.name:
+                    layout.setdefault(decl.name, len(layout))
+        layout = layouts[None]
+        for decl in LinkSearch.global_decl_list:
+            layout.setdefault(decl.name, len(layout))
+        for name in LinkSearch.function_lut:
+            layout.setdefault(name, len(layout))
+    return layouts.get(func_name, {})
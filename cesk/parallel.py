@@ -0,0 +1,170 @@
+""" Evaluates the frontier of the state space on a pool of processes """
+import io
+import sys
+import pickle
+import logging
+import multiprocessing
+import pycparser.c_ast as AST
+import cesk.linksearch as ls
+import cesk.config as cnf
+import cesk.trace as trace
+from cesk.structures import State, Envr, Kont, Stor
+from cesk.slots import Collapses
+from cesk.interpret import execute
+from cesk.library_functions import printed, reset_output, write_output
+from cesk.exceptions import CESKException, MemoryAccessViolation
+
+#every node of the tree, workers get a copy when they are forked
+_NODES = []
+_NODE_IDS = {}
+#size of the range of concrete counters given to each batch of states
+COUNTER_STRIDE = 1 << 32
+#rounds with fewer states are not worth sending to the workers
+MIN_PARALLEL_STATES = 64
+
+class StatePickler(pickle.Pickler):
+    """ Pickles AST nodes as their index in the node table so that states
+        refer to the same tree in every process """
+    def persistent_id(self, obj): #pylint: disable=method-hidden
+        if isinstance(obj, AST.Node):
+            return _NODE_IDS.get(obj)
+        return None
+
+class StateUnpickler(pickle.Unpickler):
+    """ Replaces node indexes with the nodes of this process """
+    def persistent_load(self, pid): #pylint: disable=method-hidden
+        return _NODES[pid]
+
+def dumps(obj):
+    """ Pickles obj with the nodes replaced by their index """
+    data = io.BytesIO()
+    StatePickler(data, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return data.getvalue()
+
+def loads(data):
+    """ Inverse of dumps """
+    return StateUnpickler(io.BytesIO(data)).load()
+
+def index_nodes(ast):
+    """ Numbers every node of the tree and every node linksearch found """
+    del _NODES[:]
+    _NODE_IDS.clear()
+    stack = [ast] + list(ls.LinkSearch.parent_lut)
+    while stack:
+        node = stack.pop()
+        if node in _NODE_IDS:
+            continue
+        _NODE_IDS[node] = len(_NODES)
+        _NODES.append(node)
+        stack.extend(child for _, child in node.children())
+
+def set_counters(base):
+    """ Moves the concrete allocation counters into a range that no other
+        batch of states uses """
+    if cnf.CONFIG['tick'] == 'concrete':
+        State._time = base #pylint: disable=protected-access
+    if cnf.CONFIG['allocK'] == 'concrete':
+        Kont.allocK_address = base
+    if cnf.CONFIG['allocF'] == 'concrete':
+        Envr.next_frame_id = base
+    if cnf.CONFIG['allocH'] == 'concrete':
+        Stor.heap_address_counter = base
+
+def evaluate_states(states, base):
+    """ Executes each state, returns a list of
+        (successors, errors, access violation message) """
+    set_counters(base)
+    results = []
+    for state in states:
+        try:
+            successors, errors = execute(state)
+            results.append((list(successors), list(errors), None))
+        except MemoryAccessViolation as error:
+            logging.error("Access Violation")
+            results.append(([], [], str(error)))
+    return results
+
+def evaluate_batch(task):
+    """ Worker entry point, evaluates a pickled batch of states, returns
+        the results, the slots the worker collapsed and what it printed """
+    data, base = task
+    Collapses.count = 0
+    reset_output()
+    results = evaluate_states(loads(data), base)
+    return dumps((results, Collapses.count, printed()))
+
+class ParallelEvaluator:
+    """ Explores the state space in rounds. Every state waiting at the start
+        of a round is put in a batch by the hash of its ctrl, envr and
+        kont_addr, the batches are evaluated by the workers and the results
+        are merged in batch order """
+
+    def __init__(self, ast, jobs):
+        if cnf.CONFIG['store'] != 'persistent':
+            raise CESKException("Parallel exploration needs the "
+                                "persistent store")
+        index_nodes(ast)
+        self.jobs = jobs
+        self.next_base = COUNTER_STRIDE
+        self.rounds = 0
+        self.worker_rounds = 0 #rounds the workers evaluated
+        sys.stdout.flush() #workers must not inherit buffered output
+        trace.flush() #workers do not trace, see trace.detach
+        self.pool = multiprocessing.get_context('fork').Pool(
+            jobs, initializer=trace.detach)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.pool.close()
+        else:
+            self.pool.terminate()
+        self.pool.join()
+
+    def _get_base(self):
+        """ Start of a fresh range of concrete counters """
+        base = self.next_base
+        self.next_base += COUNTER_STRIDE
+        return base
+
+    def explore(self, exploration, budget):
+        """ Evaluates states until the worklist of exploration is empty or
+            the budget is spent, which is checked between rounds """
+        worklist = exploration.worklist
+        while worklist and not budget.spent(exploration.states_evaluated):
+            batches = [[] for _ in range(self.jobs)]
+            while worklist:
+                state = worklist.pop()
+                shard = hash((state.ctrl, state.envr, state.kont_addr))
+                batches[shard % self.jobs].append(state)
+            batches = [batch for batch in batches if batch]
+
+            self.rounds += 1
+            if sum(len(batch) for batch in batches) < MIN_PARALLEL_STATES:
+                results = [evaluate_states(batch, self._get_base())
+                           for batch in batches]
+            else:
+                self.worker_rounds += 1
+                tasks = [(dumps(batch), self._get_base())
+                         for batch in batches]
+                results = []
+                for data in self.pool.map(evaluate_batch, tasks):
+                    batch_results, collapses, output = loads(data)
+                    results.append(batch_results)
+                    Collapses.count += collapses
+                    write_output(output)
+
+            for batch, batch_results in zip(batches, results):
+                for state, (successors, errors, violation) \
+                        in zip(batch, batch_results):
+                    if violation is None:
+                        exploration.record(state, successors, errors)
+                    else:
+                        exploration.add_error(state, violation)
+
+    def report(self):
+        """ Rounds explored and how many of them the workers evaluated """
+        return {'jobs': self.jobs, 'rounds': self.rounds,
+                'worker_rounds': self.worker_rounds}
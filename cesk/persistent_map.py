@@ -0,0 +1,298 @@
+""" Persistent (immutable) map backed by a hash array mapped trie.
+Updates copy only the path from the root to the changed entry, so a copy of
+the map is free and two maps created from each other share most of their
+nodes.  Equality and hashing take advantage of that sharing. """
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+def _popcount(value):
+    """ Number of set bits in value """
+    return bin(value).count('1')
+
+def _hash_key(key):
+    """ Non-negative 64 bit hash used to walk the trie """
+    return hash(key) & _HASH_MASK
+
+class _Leaf: #pylint: disable=too-few-public-methods
+    """ A single key value pair """
+    __slots__ = ('key_hash', 'key', 'value', 'cached_hash')
+
+    def __init__(self, key_hash, key, value):
+        self.key_hash = key_hash
+        self.key = key
+        self.value = value
+        self.cached_hash = None
+
+    def get_hash(self):
+        """ Hash of the entry, computed once """
+        if self.cached_hash is None:
+            self.cached_hash = hash((self.key, self.value))
+        return self.cached_hash
+
+class _Collision: #pylint: disable=too-few-public-methods
+    """ Leaves whose keys have identical hashes """
+    __slots__ = ('key_hash', 'leaves', 'cached_hash')
+
+    def __init__(self, key_hash, leaves):
+        self.key_hash = key_hash
+        self.leaves = leaves
+        self.cached_hash = None
+
+    def get_hash(self):
+        """ Order independent hash of the leaves """
+        if self.cached_hash is None:
+            self.cached_hash = sum(leaf.get_hash()
+                                   for leaf in self.leaves) & _HASH_MASK
+        return self.cached_hash
+
+class _Branch: #pylint: disable=too-few-public-methods
+    """ Interior node, children are indexed by a bitmap """
+    __slots__ = ('bitmap', 'children', 'cached_hash')
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+        self.cached_hash = None
+
+    def get_hash(self):
+        """ Hash of the subtree, computed once """
+        if self.cached_hash is None:
+            self.cached_hash = hash((self.bitmap,) +
+                                    tuple(child.get_hash()
+                                          for child in self.children))
+        return self.cached_hash
+
+_EMPTY_BRANCH = _Branch(0, ())
+
+def _find(node, key_hash, key):
+    """ Returns the leaf holding key or None """
+    shift = 0
+    while isinstance(node, _Branch):
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return None
+        node = node.children[_popcount(node.bitmap & (bit - 1))]
+        shift += _BITS
+    if isinstance(node, _Leaf):
+        if node.key_hash == key_hash and node.key == key:
+            return node
+        return None
+    if node.key_hash == key_hash:
+        for leaf in node.leaves:
+            if leaf.key == key:
+                return leaf
+    return None
+
+def _merge(first, second, shift):
+    """ Builds the smallest subtree holding two nodes with different paths """
+    if first.key_hash == second.key_hash:
+        return _Collision(first.key_hash, (first, second))
+    first_index = (first.key_hash >> shift) & _MASK
+    second_index = (second.key_hash >> shift) & _MASK
+    if first_index == second_index:
+        return _Branch(1 << first_index,
+                       (_merge(first, second, shift + _BITS),))
+    if first_index < second_index:
+        children = (first, second)
+    else:
+        children = (second, first)
+    return _Branch((1 << first_index) | (1 << second_index), children)
+
+def _insert(node, leaf, shift):
+    """ Returns (new node, True if a key was added) """
+    if isinstance(node, _Branch):
+        bit = 1 << ((leaf.key_hash >> shift) & _MASK)
+        index = _popcount(node.bitmap & (bit - 1))
+        if not node.bitmap & bit:
+            children = node.children[:index] + (leaf,) + node.children[index:]
+            return _Branch(node.bitmap | bit, children), True
+        child, added = _insert(node.children[index], leaf, shift + _BITS)
+        if child is node.children[index]:
+            return node, False
+        children = node.children[:index] + (child,) + node.children[index+1:]
+        return _Branch(node.bitmap, children), added
+
+    if isinstance(node, _Leaf):
+        if node.key_hash == leaf.key_hash and node.key == leaf.key:
+            if node.value is leaf.value:
+                return node, False
+            return leaf, False
+        return _merge(node, leaf, shift), True
+
+    #collision node
+    if node.key_hash != leaf.key_hash:
+        return _merge(node, leaf, shift), True
+    for index, old in enumerate(node.leaves):
+        if old.key == leaf.key:
+            if old.value is leaf.value:
+                return node, False
+            leaves = node.leaves[:index] + (leaf,) + node.leaves[index+1:]
+            return _Collision(node.key_hash, leaves), False
+    return _Collision(node.key_hash, node.leaves + (leaf,)), True
+
+def _delete(node, key_hash, key, shift):
+    """ Returns (new node or None if empty, True if the key was removed).
+        Branches other than the root never hold a single leaf so that the
+        shape of the trie only depends on its keys """
+    if isinstance(node, _Branch):
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return node, False
+        index = _popcount(node.bitmap & (bit - 1))
+        child, removed = _delete(node.children[index], key_hash, key,
+                                 shift + _BITS)
+        if not removed:
+            return node, False
+        if child is None:
+            bitmap = node.bitmap & ~bit
+            children = node.children[:index] + node.children[index+1:]
+        else:
+            bitmap = node.bitmap
+            children = (node.children[:index] + (child,) +
+                        node.children[index+1:])
+        if shift != 0 and len(children) == 1 and \
+                not isinstance(children[0], _Branch):
+            return children[0], True
+        if not children and shift != 0:
+            return None, True
+        return _Branch(bitmap, children), True
+
+    if isinstance(node, _Leaf):
+        if node.key_hash == key_hash and node.key == key:
+            return None, True
+        return node, False
+
+    #collision node
+    if node.key_hash != key_hash:
+        return node, False
+    leaves = tuple(leaf for leaf in node.leaves if leaf.key != key)
+    if len(leaves) == len(node.leaves):
+        return node, False
+    if len(leaves) == 1:
+        return leaves[0], True
+    return _Collision(key_hash, leaves), True
+
+def _leaves(node):
+    """ Yields every leaf below node """
+    if isinstance(node, _Branch):
+        for child in node.children:
+            yield from _leaves(child)
+    elif isinstance(node, _Leaf):
+        yield node
+    else:
+        yield from node.leaves
+
+def _equal(first, second):
+    """ Structural equality that skips shared subtrees """
+    if first is second:
+        return True
+    if type(first) is not type(second): #pylint: disable=unidiomatic-typecheck
+        return False
+    if first.cached_hash is not None and second.cached_hash is not None and \
+            first.cached_hash != second.cached_hash:
+        return False
+    if isinstance(first, _Branch):
+        return first.bitmap == second.bitmap and \
+               all(_equal(left, right) for left, right
+                   in zip(first.children, second.children))
+    if isinstance(first, _Leaf):
+        return first.key_hash == second.key_hash and \
+               first.key == second.key and first.value == second.value
+    if first.key_hash != second.key_hash or \
+            len(first.leaves) != len(second.leaves):
+        return False
+    for leaf in first.leaves:
+        match = _find(second, leaf.key_hash, leaf.key)
+        if match is None or match.value != leaf.value:
+            return False
+    return True
+
+class PersistentMap:
+    """ Immutable mapping, set and remove return a new map """
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, items=None):
+        self._root = _EMPTY_BRANCH
+        self._size = 0
+        if items is not None:
+            for key, value in items:
+                self._root, added = _insert(
+                    self._root, _Leaf(_hash_key(key), key, value), 0)
+                self._size += added
+
+    @classmethod
+    def _make(cls, root, size):
+        """ Wraps a root node in a map """
+        result = cls.__new__(cls)
+        result._root = root #pylint: disable=protected-access
+        result._size = size #pylint: disable=protected-access
+        return result
+
+    def set(self, key, value):
+        """ Returns a map that also maps key to value """
+        root, added = _insert(self._root, _Leaf(_hash_key(key), key, value), 0)
+        if root is self._root:
+            return self
+        return PersistentMap._make(root, self._size + added)
+
+    def remove(self, key):
+        """ Returns a map without key, the same map if key is missing """
+        root, removed = _delete(self._root, _hash_key(key), key, 0)
+        if not removed:
+            return self
+        return PersistentMap._make(root, self._size - 1)
+
+    def get(self, key, default=None):
+        """ Returns the value for key or default """
+        leaf = _find(self._root, _hash_key(key), key)
+        if leaf is None:
+            return default
+        return leaf.value
+
+    def __getitem__(self, key):
+        leaf = _find(self._root, _hash_key(key), key)
+        if leaf is None:
+            raise KeyError(key)
+        return leaf.value
+
+    def __contains__(self, key):
+        return _find(self._root, _hash_key(key), key) is not None
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for leaf in _leaves(self._root):
+            yield leaf.key
+
+    def keys(self):
+        """ Iterates over the keys """
+        return iter(self)
+
+    def values(self):
+        """ Iterates over the values """
+        for leaf in _leaves(self._root):
+            yield leaf.value
+
+    def items(self):
+        """ Iterates over (key, value) pairs """
+        for leaf in _leaves(self._root):
+            yield leaf.key, leaf.value
+
+    def __eq__(self, other):
+        if not isinstance(other, PersistentMap):
+            return False
+        return self._size == other._size and _equal(self._root, other._root)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self._root.get_hash()
+
+    def __repr__(self):
+        return 'PersistentMap({' + ', '.join(
+            repr(key) + ': ' + repr(value)
+            for key, value in self.items()) + '})'
@@ -0,0 +1,114 @@
+""" Counts and times the states evaluated at each program point, the
+    handlers of the interpreter and the store and value operations they use.
+    Nothing is wrapped until enable is called, a run that is not profiled
+    runs the same functions it always does
+
+    profiler.enable()
+    ...
+    result['profile'] = profiler.report()
+    profiler.disable()
+"""
+import time
+import cesk
+import cesk.interpret as interpret
+from cesk.structures import Stor
+from cesk.values.base_values import SizedSet
+
+STORE_OPERATIONS = ('read', 'write', 'allocM', 'free', 'read_kont',
+                    'write_kont', 'copy_bytes', 'write_values', 'fill_bytes',
+                    'string_length', 'collect')
+TOP = 20 #program points in the report
+
+_COUNTS = {} #kind -> name -> [calls, seconds]
+_ORIGINALS = [] #(owner, attribute, original) put back by disable
+
+def _entry(kind, name):
+    """ [calls, seconds] of name """
+    return _COUNTS.setdefault(kind, {}).setdefault(name, [0, 0.0])
+
+def _timed(kind, name, function):
+    """ function counted and timed as name. A call made while the same
+        name is running is counted but not timed again """
+    entry = _entry(kind, name)
+    running = [False]
+    def timed(*args, **kwargs):
+        entry[0] += 1
+        if running[0]:
+            return function(*args, **kwargs)
+        running[0] = True
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            entry[1] += time.perf_counter() - start
+            running[0] = False
+    return timed
+
+def _execute(execute):
+    """ execute timed by the ctrl of the state """
+    def timed(state):
+        entry = _entry('points', state.ctrl)
+        start = time.perf_counter()
+        try:
+            return execute(state)
+        finally:
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+    return timed
+
+def _replace(owner, attribute, wrapper):
+    """ Sets owner.attribute to wrapper, keeps the original for disable """
+    original = getattr(owner, attribute)
+    _ORIGINALS.append((owner, attribute, original))
+    setattr(owner, attribute, wrapper)
+
+def enable():
+    """ Wraps the functions that are profiled and clears the counts """
+    disable()
+    _COUNTS.clear()
+    _replace(cesk, 'execute', _execute(cesk.execute))
+    handlers = dict(interpret.HANDLERS)
+    _ORIGINALS.append((interpret, 'HANDLERS', handlers))
+    for node_type, handler in handlers.items():
+        interpret.HANDLERS[node_type] = _timed('handlers', handler.__name__,
+                                               handler)
+    for operation in STORE_OPERATIONS:
+        _replace(Stor, operation, _timed('store', 'Stor.' + operation,
+                                         getattr(Stor, operation)))
+    _replace(interpret, 'cast', _timed('values', 'cast', interpret.cast))
+    _replace(SizedSet, 'perform_operation',
+             _timed('values', 'SizedSet.perform_operation',
+                    SizedSet.perform_operation))
+
+def disable():
+    """ Puts back the functions enable wrapped """
+    while _ORIGINALS:
+        owner, attribute, original = _ORIGINALS.pop()
+        if owner is interpret and attribute == 'HANDLERS':
+            interpret.HANDLERS.update(original)
+        else:
+            setattr(owner, attribute, original)
+
+def _ranked(kind, limit=None):
+    """ Entries of kind that were called, the most time first. Program
+        points are named by their ctrl, ctrls with one name are joined """
+    counts = {}
+    for name, (calls, seconds) in _COUNTS.get(kind, {}).items():
+        if calls:
+            entry = counts.setdefault(repr(name) if kind == 'points'
+                                      else name, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+    entries = sorted(counts.items(),
+                     key=lambda item: (-item[1][1], -item[1][0], item[0]))
+    return [{'name': name, 'calls': calls, 'seconds': seconds}
+            for name, (calls, seconds) in entries[:limit]]
+
+def report():
+    """ Calls and seconds of the hottest program points, of every handler
+        and of the store and value operations, most time first. A handler
+        includes the handlers and operations it called """
+    return {'points': _ranked('points', TOP),
+            'handlers': _ranked('handlers'),
+            'store': _ranked('store'),
+            'values': _ranked('values')}
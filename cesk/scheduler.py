@@ -0,0 +1,192 @@
+""" Worklists that decide the order the CESK machine evaluates states in """
+import heapq
+from collections import deque
+import pycparser.c_ast as AST
+import cesk.linksearch as ls
+import cesk.config as cnf
+from cesk.ctrl import Ctrl
+from cesk.exceptions import CESKException, UnknownConfiguration
+
+class ProgramOrder:
+    """ Numbers every statement reachable from the function bodies in
+        reverse postorder and records how many loops surround it """
+
+    def __init__(self, entry_function=None):
+        self.rpo = {}
+        self.loop_depth = {}
+        functions = list(ls.LinkSearch.function_lut.values())
+        if entry_function in functions:
+            functions.remove(entry_function)
+            functions.insert(0, entry_function)
+        order = []
+        back_edges = []
+        predecessors = {}
+        for function in functions:
+            postorder = []
+            self._depth_first(function.body, postorder,
+                              back_edges, predecessors)
+            order.extend(reversed(postorder))
+        for number, node in enumerate(order):
+            self.rpo[node] = number
+            self.loop_depth[node] = 0
+        self._count_loops(back_edges, predecessors)
+
+    def _depth_first(self, root, postorder, back_edges, predecessors):
+        """ Iterative dfs that appends to postorder and finds back edges """
+        if root in self.rpo:
+            return
+        self.rpo[root] = None #mark visited, numbered later
+        on_stack = {root}
+        stack = [(root, iter(successors(root)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                predecessors.setdefault(child, []).append(node)
+                if child in on_stack:
+                    back_edges.append((node, child))
+                elif child not in self.rpo:
+                    self.rpo[child] = None
+                    on_stack.add(child)
+                    stack.append((child, iter(successors(child))))
+                    break
+            else:
+                stack.pop()
+                on_stack.remove(node)
+                postorder.append(node)
+
+    def _count_loops(self, back_edges, predecessors):
+        """ Adds one to the depth of every node in each natural loop """
+        loops = {}
+        for tail, header in back_edges:
+            body = loops.setdefault(header, {header})
+            work = [tail]
+            while work:
+                node = work.pop()
+                if node in body:
+                    continue
+                body.add(node)
+                work.extend(predecessors.get(node, []))
+        for body in loops.values():
+            for node in body:
+                self.loop_depth[node] += 1
+
+    def get_rpo(self, state):
+        """ Reverse postorder number of the statement of the state """
+        return self.rpo.get(state.ctrl.stmt(), len(self.rpo))
+
+    def get_loop_depth(self, state):
+        """ Number of loops around the statement of the state """
+        return self.loop_depth.get(state.ctrl.stmt(), 0)
+
+def successors(stmt):
+    """ Statements that can be evaluated directly after stmt within the
+        same function, calls and returns are not followed """
+    if isinstance(stmt, AST.Compound) and stmt.block_items:
+        return [stmt.block_items[0]]
+    if isinstance(stmt, AST.Label):
+        return [stmt.stmt]
+    if isinstance(stmt, AST.Goto):
+        label = ls.LinkSearch.label_lut.get(stmt.name)
+        return [label] if label is not None else []
+    if isinstance(stmt, AST.Return):
+        return []
+    result = []
+    if isinstance(stmt, AST.If) and stmt.iftrue is not None:
+        result.append(stmt.iftrue)
+    try:
+        result.append(Ctrl(stmt).get_next().stmt())
+    except CESKException: #falls off the end of the function
+        pass
+    return result
+
+class Scheduler:
+    """ Worklist of states waiting to be evaluated. A state is queued at
+        most once, pushing an equal state replaces the queued one so the
+        newest time stamp is evaluated """
+
+    def __init__(self):
+        self.pending = {}
+
+    def push(self, state):
+        """ Adds a state to the worklist """
+        if state in self.pending:
+            self.pending[state] = state
+        else:
+            self.pending[state] = state
+            self._push(state)
+
+    def pop(self):
+        """ Removes and returns the next state to evaluate """
+        return self.pending.pop(self._pop())
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __iter__(self):
+        """ The queued states, in no particular order """
+        return iter(self.pending)
+
+    def _push(self, state):
+        raise NotImplementedError
+
+    def _pop(self):
+        raise NotImplementedError
+
+class FifoScheduler(Scheduler):
+    """ Breadth first, evaluates states in the order they were found """
+
+    def __init__(self):
+        super().__init__()
+        self.queue = deque()
+
+    def _push(self, state):
+        self.queue.append(state)
+
+    def _pop(self):
+        return self.queue.popleft()
+
+class LifoScheduler(Scheduler):
+    """ Depth first, evaluates the most recently found state """
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+
+    def _push(self, state):
+        self.stack.append(state)
+
+    def _pop(self):
+        return self.stack.pop()
+
+class PriorityScheduler(Scheduler):
+    """ Evaluates the state with the smallest key first, ties are broken
+        in the order the states were found """
+
+    def __init__(self, key):
+        super().__init__()
+        self.key = key
+        self.heap = []
+        self.count = 0
+
+    def _push(self, state):
+        heapq.heappush(self.heap, (self.key(state), self.count, state))
+        self.count += 1
+
+    def _pop(self):
+        return heapq.heappop(self.heap)[2]
+
+def get_scheduler(entry_function=None):
+    """ Builds the worklist selected by CONFIG['scheduler'] """
+    choice = cnf.CONFIG['scheduler']
+    if choice == 'fifo':
+        return FifoScheduler()
+    if choice == 'lifo':
+        return LifoScheduler()
+    if choice == 'rpo':
+        order = ProgramOrder(entry_function)
+        return PriorityScheduler(order.get_rpo)
+    if choice == 'loop_depth':
+        order = ProgramOrder(entry_function)
+        return PriorityScheduler(
+            lambda state: (-order.get_loop_depth(state), order.get_rpo(state)))
+    raise UnknownConfiguration('scheduler')
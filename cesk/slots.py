@@ -0,0 +1,732 @@
+"""Memory blocks of the store, their slots and the joins of the sets of
+   values a slot holds under weak updates"""
+
+import logging
+from bisect import bisect_right
+from cesk.values import generate_unitialized_value
+from cesk.values import generate_null_pointer, generate_value
+from cesk.values.base_values import ByteValue, SizedSet, BaseInteger, \
+                                   ReferenceValue
+from cesk.values.factory import Factory
+from cesk.values.abstract_literals import AbstractLiterals as AL
+import cesk.config as cnf
+from cesk.exceptions import MemoryAccessViolation, UnknownConfiguration, \
+                           CESKException
+
+class Collapses: #pylint: disable=too-few-public-methods
+    """ Sets of values made smaller by the set_cap, see collapse """
+    count = 0
+
+def weak_join(old_values, value, widen=False):
+    """ Set of old_values and value, or None if value adds nothing. A value
+        that has a join, like an interval, is joined with the value in the
+        set it can be joined with, widened if widen is set. A set past the
+        set_cap is collapsed, a value whose top is in the set adds nothing.
+        The old set is not changed since it may be shared """
+    capped = cnf.CONFIG['set_cap'] > 0
+    new_values = value if isinstance(value, SizedSet) else [value]
+    new_values = [val for val in new_values if val not in old_values and
+                  not (capped and top_of(val) in old_values)]
+    if not new_values:
+        return None
+    values = SizedSet(old_values.size)
+    values.update(old_values)
+    for new_value in new_values:
+        if getattr(new_value, 'join', None) is None:
+            values.add(new_value)
+            continue
+        for old_value in values:
+            joined = old_value.join(new_value) \
+                     if type(old_value) is type(new_value) else None #pylint: disable=unidiomatic-typecheck
+            if joined is not None:
+                values.remove(old_value)
+                values.add(old_value.widen(joined) if widen else joined)
+                break
+        else:
+            values.add(new_value)
+    if capped and len(values) > cnf.CONFIG['set_cap']:
+        values = collapse(values)
+    if values == old_values:
+        return None
+    return values
+
+def top_of(value):
+    """ The top a value is collapsed into, the integers of its type or the
+        pointers into its block. None for values with no top, like concrete
+        values, and for values that are joined instead """
+    if cnf.CONFIG['values'] == 'concrete' or \
+            getattr(value, 'join', None) is not None:
+        return None
+    if isinstance(value, Factory.getCharClass()):
+        return Factory.Char(AL.TOP, value.type_of)
+    if isinstance(value, BaseInteger):
+        return Factory.Integer(AL.TOP, value.type_of, value.size)
+    if isinstance(value, ReferenceValue) and hasattr(value, 'offset'):
+        return Factory.Pointer(value.data, value.type_size,
+                               Factory.Integer(AL.TOP, 'long'))
+    return None
+
+def collapse(values):
+    """ Set of values past the set_cap with the values that can be joined
+        joined, like intervals, and the values that share a top, see top_of,
+        replaced by it. Counted in Collapses.count """
+    tops = {value: top_of(value) for value in values}
+    counts = {}
+    for top in tops.values():
+        counts[top] = counts.get(top, 0) + 1
+    result = SizedSet(values.size)
+    for value, top in tops.items():
+        if top is not None and counts[top] > 1:
+            result.add(top)
+            continue
+        if getattr(value, 'join', None) is not None:
+            for old_value in result:
+                joined = old_value.join(value) \
+                         if type(old_value) is type(value) else None #pylint: disable=unidiomatic-typecheck
+                if joined is not None:
+                    result.remove(old_value)
+                    value = joined
+                    break
+        result.add(value)
+    if len(result) < len(values):
+        Collapses.count += 1
+    return result
+
+class LazySlots:
+    """ Slots of a large block kept as a default value for each slot size
+        and a map of the slots written since. A smashed block maps every
+        element of the array to the slot of its field, so each field of the
+        array is one summary slot; only sound when writes are weak """
+    __slots__ = ('sizes', 'length', 'extra', 'smashed', 'defaults', 'written')
+
+    def __init__(self, sizes, length, extra, smashed, make_value):
+        self.sizes = sizes
+        self.length = length
+        self.extra = extra
+        self.smashed = smashed
+        self.defaults = {size: make_value(size) for size
+                         in set(sizes) | ({extra} if extra else set())}
+        self.written = {}
+
+    def _key(self, index):
+        """ Key of the slot at index in the written map """
+        if not self.smashed:
+            return index
+        fields = len(self.sizes)
+        if index < fields * self.length:
+            return index % fields
+        return fields
+
+    def _default(self, index):
+        """ Value of a slot that was never written """
+        fields = len(self.sizes)
+        if index < fields * self.length:
+            return self.defaults[self.sizes[index % fields]]
+        return self.defaults[self.extra]
+
+    def __getitem__(self, index):
+        value = self.written.get(self._key(index))
+        if value is None:
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+            return self._default(index)
+        return value
+
+    def __setitem__(self, index, value):
+        default = self._default(index)
+        if type(value) is type(default) and value == default: #pylint: disable=unidiomatic-typecheck
+            self.written.pop(self._key(index), None)
+        else:
+            self.written[self._key(index)] = value
+
+    def __len__(self):
+        return len(self.sizes) * self.length + (1 if self.extra else 0)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def top_indexes(self):
+        """ Index of every slot an unknown offset could reach, one index
+            for each summary slot when smashed """
+        if not self.smashed:
+            return range(len(self))
+        fields = len(self.sizes)
+        indexes = list(range(fields))
+        if self.extra:
+            indexes.append(fields * self.length)
+        return indexes
+
+    def distinct_values(self):
+        """ Values of the written slots and of the slots never written """
+        return list(self.defaults.values()) + list(self.written.values())
+
+    def join_all(self, value, widen=False):
+        """ Weak write of value to every slot, the slots never written share
+            their joined default. Returns True if a slot changed """
+        is_change = False
+        defaults = dict(self.defaults)
+        for size, default in defaults.items():
+            if size == value.size:
+                joined = weak_join(default, value, widen)
+                if joined is not None:
+                    is_change = True
+                    defaults[size] = joined
+        self.defaults = defaults #the old defaults may be shared by a copy
+        for key, values in list(self.written.items()):
+            joined = weak_join(values, value, widen)
+            if joined is not None:
+                is_change = True
+                values = joined
+            self[key] = values #drops slots that now match their default
+        return is_change
+
+    def join_each(self, value_of, widen=False):
+        """ Weak write to every slot of value_of(slot), the slots never
+            written share their joined default. Returns True if a slot
+            changed """
+        is_change = False
+        defaults = dict(self.defaults)
+        for size, default in defaults.items():
+            joined = weak_join(default, value_of(default), widen)
+            if joined is not None:
+                is_change = True
+                defaults[size] = joined
+        self.defaults = defaults
+        for key, values in list(self.written.items()):
+            joined = weak_join(values, value_of(values), widen)
+            if joined is not None:
+                is_change = True
+                values = joined
+            self[key] = values
+        return is_change
+
+    def copy(self):
+        """ Copy that shares the defaults and the written values """
+        new_slots = LazySlots.__new__(LazySlots)
+        new_slots.sizes = self.sizes
+        new_slots.length = self.length
+        new_slots.extra = self.extra
+        new_slots.smashed = self.smashed
+        new_slots.defaults = self.defaults
+        new_slots.written = dict(self.written)
+        return new_slots
+
+    def __eq__(self, other):
+        if not isinstance(other, LazySlots) or \
+                len(self.written) != len(other.written):
+            return False
+        for table, other_table in ((self.defaults, other.defaults),
+                                   (self.written, other.written)):
+            for key, mine in table.items():
+                theirs = other_table.get(key)
+                if type(mine) is not type(theirs) or mine != theirs: #pylint: disable=unidiomatic-typecheck
+                    return False
+        return True
+
+    def __hash__(self):
+        result = 0
+        for key, value in self.defaults.items():
+            if isinstance(value, set):
+                value = frozenset(value)
+            result ^= hash((-key, value))
+        for key, value in self.written.items():
+            if isinstance(value, set):
+                value = frozenset(value)
+            result ^= hash((key, value))
+        return result
+
+class MemoryBlock: #pylint: disable=too-many-instance-attributes
+    """ Block of Memory """
+    #(group size, start of each field, size of every field or None) by sizes
+    _layouts = {}
+    #blocks with at least this many slots are lazy, see LazySlots
+    LAZY_SLOTS = 64
+    #changes to a slot holding intervals before every write to it widens
+    WIDEN_AFTER = 3
+
+    def __init__(self, sizes, length, extra, owner=None):
+        self.shape = (sizes, length, extra)
+        self.size = sum(sizes)*length + extra
+        self.is_free = False
+        self.owner = owner #only the owning persistent store may write
+        self.changes = {} #times each slot holding intervals changed
+        self.hulls = {} #join of the values written to widened slots
+        self.bound = None #this block in a narrowed exploration, see _join
+
+        blocks = cnf.CONFIG['blocks']
+        if blocks == 'smashed' and length > 1:
+            if cnf.CONFIG['store_update'] != 'weak':
+                raise CESKException("Smashed blocks need weak store updates")
+            self.block = LazySlots(sizes, length, extra, True,
+                                   self._new_value)
+        elif blocks != 'eager' and \
+                len(sizes)*length + (1 if extra else 0) >= \
+                MemoryBlock.LAZY_SLOTS:
+            self.block = LazySlots(sizes, length, extra, False,
+                                   self._new_value)
+        elif blocks in ('eager', 'lazy', 'smashed'):
+            self.block = []
+            for _ in range(length):
+                for size in sizes:
+                    self.block.append(self._new_value(size))
+            if extra != 0:
+                self.block.append(self._new_value(extra))
+        else:
+            raise UnknownConfiguration('blocks')
+
+        self._bind_methods()
+
+    def _bind_methods(self):
+        """ Picks index, read and write functions for the block """
+        sizes, length, extra = self.shape
+        self._layout = MemoryBlock.get_layout(sizes)
+        if len(sizes) == 1 and length == 1 and extra == 0:
+            self._get_index = self._get_index_item
+        elif self._layout[2] is not None:
+            self._array_end = self._layout[0] * length
+            self._get_index = self._get_index_array
+        else:
+            self._get_index = self._get_index_list
+
+        if cnf.CONFIG['store_update'] == 'strong':
+            self.write = self.strong_write
+            self.read = self.strong_read
+            self.add = lambda s, v: s.add(v)
+        elif cnf.CONFIG['store_update'] == 'weak':
+            self.write = self.weak_write
+            self.read = self.weak_read
+            self.add = lambda s, v: s.update(v)
+        else:
+            raise UnknownConfiguration('store_update')
+
+    def copy(self, owner):
+        """ Shallow copy of the block given to a new owner, values are
+            immutable so only the list of slots is copied """
+        new_block = MemoryBlock.__new__(MemoryBlock)
+        new_block.shape = self.shape
+        new_block.size = self.size
+        if isinstance(self.block, LazySlots):
+            new_block.block = self.block.copy()
+        else:
+            new_block.block = list(self.block)
+        new_block.is_free = self.is_free
+        new_block.owner = owner
+        new_block.changes = dict(self.changes)
+        new_block.hulls = dict(self.hulls)
+        new_block.bound = self.bound
+        new_block._bind_methods() #pylint: disable=protected-access
+        return new_block
+
+    def __getstate__(self):
+        """ The bound read and write functions are not pickled """
+        state = dict(self.__dict__)
+        for name in ('_get_index', '_layout', '_array_end',
+                     'write', 'read', 'add'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_methods()
+
+    @staticmethod
+    def _new_value(size):
+        """ Value of a memory slot that was never written """
+        if cnf.CONFIG['store_update'] == 'strong':
+            return generate_unitialized_value(size)
+        elif cnf.CONFIG['store_update'] == 'weak':
+            return SizedSet(size)
+        raise UnknownConfiguration("store_update")
+
+    def _get_index_item(self, offset):
+        """ given an offset returns value or throws error """
+        if not isinstance(offset, int):
+            logging.error("TOP memory access made")
+            offset = 0
+        return [[0, offset]]
+
+    @staticmethod
+    def get_layout(sizes):
+        """ Offset table of a group of fields, shared by every block with the
+            same field sizes """
+        key = tuple(sizes)
+        layout = MemoryBlock._layouts.get(key)
+        if layout is None:
+            starts = []
+            group = 0
+            for size in key:
+                starts.append(group)
+                group += size
+            uniform = key[0] if key[0] > 0 and key.count(key[0]) == len(key) \
+                      else None
+            layout = MemoryBlock._layouts[key] = (group, starts, uniform)
+        return layout
+
+    def _get_index_array(self, offset):
+        """ _get_index_list for fields of equal size, offsets outside of the
+            repeated fields take the general path """
+        if isinstance(offset, int) and 0 <= offset < self._array_end:
+            return [list(divmod(offset, self._layout[2]))]
+        return self._get_index_list(offset)
+
+    def _get_index_list(self, offset):
+        """ given an offset returns the number of time a succ map
+            would need to be called to find the item and offset remaning """
+        if not isinstance(offset, int):
+            logging.error("TOP memory access made")
+            if isinstance(self.block, LazySlots):
+                return [[i, 0] for i in self.block.top_indexes()]
+            return [[i, 0] for i in range(len(self.block))]
+        group, starts, _ = self._layout
+        index, offset = divmod(offset, group)
+        if index == self.shape[1]:#accesses extra part
+            return [[index * len(starts), offset]]
+        field = bisect_right(starts, offset) - 1
+        return [[index * len(starts) + field, offset - starts[field]]]
+
+    def _is_uniform_top(self, offset, size):
+        """ True for an unknown offset into a lazy block whose slots all have
+            the given size, every slot is then read or written as a whole """
+        return not isinstance(offset, int) and \
+               isinstance(self.block, LazySlots) and \
+               not self.block.smashed and self._layout[2] == size and \
+               self.shape[2] in (0, size)
+
+    def not_in_block(self, offset, size):
+        """ function to identify if offset is in the block """
+        if isinstance(offset, int):
+            return offset < 0 or offset+size > self.size
+        else: #is abstract literal top
+            return False #add possible memory error here
+
+    def strong_read(self, offset, read_size):
+        """ return value or set of values based on read """
+        if self.not_in_block(offset, read_size):
+            raise MemoryAccessViolation("Illegal Read")
+
+        index, start = self._get_index(offset)[0]
+        if start == 0 and self.block[index].size == read_size:
+            return self.block[index]
+
+        #immoral read over/within byte boundary
+        byte_value = ByteValue()
+        bytes_to_read = read_size
+        value = self.block[index]
+        while bytes_to_read > 0:
+            num_possible = min(bytes_to_read, value.size - start)
+            value = value.get_byte_value(start, num_possible)
+            byte_value = byte_value.append(value)
+            bytes_to_read -= num_possible
+            if bytes_to_read > 0:
+                index += 1
+                start = 0
+                value = self.block[index]
+        return byte_value
+
+    def weak_read(self, offset, read_size):
+        """ return value or set of values based on read """
+        if self.not_in_block(offset, read_size):
+            raise MemoryAccessViolation("Illegal Read")
+
+        result = SizedSet(read_size)
+        if self._is_uniform_top(offset, read_size):
+            logging.error("TOP memory access made")
+            for values in self.block.distinct_values():
+                result.update(values)
+            if not result:
+                raise MemoryAccessViolation("Read from Unasigned Address")
+            return result
+        for index, start in self._get_index(offset):
+            if start == 0 and self.block[index].size == read_size:
+                result.update(self.block[index])
+                continue
+            #immoral read over/within byte boundary
+            byte_values = {ByteValue()}
+            bytes_to_read = read_size
+            value = self.block[index]
+            while bytes_to_read > 0:
+                num_possible = min(bytes_to_read, value.size - start)
+                values = value.get_byte_value(start, num_possible)
+                old_byte_values = byte_values
+                byte_values = set()
+                for front in old_byte_values:
+                    for back in values:
+                        byte_values.add(front.append(back))
+                bytes_to_read -= num_possible
+                if bytes_to_read > 0:
+                    index += 1
+                    start = 0
+                    value = self.block[index]
+            result.update(byte_values)
+
+        #return result
+        if not result:
+            raise MemoryAccessViolation("Read from Unasigned Address")
+        else:
+            return result
+
+    def strong_write(self, offset, value, widen=False): #pylint: disable=unused-argument
+        """ Writes the value given at the offset given
+            returns True if values are changed False otherwise"""
+        if self.not_in_block(offset, value.size):
+            raise MemoryAccessViolation("Illegal Write")
+        for index, start in self._get_index(offset):
+            old_value = self.block[index]
+            if start == 0 and value.size == old_value.size:
+                self.block[index] = value
+                return value != old_value
+
+            #begin a partial or overlapping write
+            bytes_to_write = value.size
+            bytes_written = 0
+
+            while bytes_to_write != 0:
+
+                #get unchanged part of value at the given pointer location
+                if start != 0:
+                    new_data = old_value.get_byte_value(0, start)
+                else:
+                    new_data = ByteValue() #empty byte value
+
+                #bytes in store represents the number of bytes in the store that
+                #are available to be overwritten
+                bytes_in_store = old_value.size - start
+                able_to_write = min(bytes_to_write, bytes_in_store)
+
+                #get value from data being written
+                new_data = new_data.append(
+                    value.get_byte_value(bytes_written, able_to_write))
+
+                bytes_to_write -= able_to_write
+                bytes_written += able_to_write
+
+                if bytes_to_write > 0:
+                    #more data left in value, write to store then continue
+                    self._write_on_offset(index, new_data, old_value)
+                    index += 1 #update pointer and old_value
+                    start = 0
+                    old_value = self.block[index]
+                elif bytes_in_store > able_to_write:
+                    #get rest of object then write
+                    offset = start+able_to_write
+                    new_data = new_data.append(
+                        old_value.get_byte_value(offset,
+                                                 bytes_in_store-able_to_write))
+                    self._write_on_offset(index, new_data, old_value)
+                else:
+                    self._write_on_offset(index, new_data, old_value)
+                    #neat finish write to store and be done
+        return True
+
+    def _write_on_offset(self, index, new_data, old_value):
+        """ Manages how to write when mixing bytes """
+        # TODO check if old/new value are sets and handle
+        self.block[index] = generate_value(new_data, old_value.type_of)
+
+    def weak_write(self, offset, value, widen=False):
+        """ Writes the value given at the offset given, widened if widen is
+            set, returns True if values are changed False otherwise"""
+        if self.not_in_block(offset, value.size):
+            raise MemoryAccessViolation("Illegal Write")
+        if self._is_uniform_top(offset, value.size):
+            logging.error("TOP memory access made")
+            self.hulls = {} #every slot may change, none can be narrowed
+            changes = self.changes.get(None, 0)
+            if self.block.join_all(value, widen or
+                                   changes >= MemoryBlock.WIDEN_AFTER):
+                self.changes[None] = changes + 1
+                return True
+            return False
+        is_change = False
+        for index, start in self._get_index(offset):
+            if start == 0 and self.block[index].size == value.size:
+                values = self._join(index, value, widen)
+                if values is not None:
+                    is_change = True
+                    self.block[index] = values
+                continue
+            #begin a partial or overlapping write
+            raise NotImplementedError("Partial weak write not implemented")
+        return is_change
+
+    def _join(self, index, value, widen):
+        """ weak_join of value into slot index. The intervals of a slot are
+            widened by writes made in a loop and by every write once the slot
+            changed WIDEN_AFTER times, since a value can also feed back into
+            itself through a call. Once a slot was widened the join of every
+            value written to it is kept in hulls, except in smashed blocks
+            where many indexes share a slot. A block bounded by a narrowed
+            earlier exploration jumps to the integers of its bound instead of
+            widening, if they hold the join """
+        old_values = self.block[index]
+        joined = weak_join(old_values, value)
+        hulls = self.hulls
+        if index in hulls:
+            hulls[index] = weak_join(hulls[index], value) or hulls[index]
+        if joined is None or \
+                all(getattr(val, 'join', None) is None for val in joined):
+            return joined
+        changes = self.changes.get(index, 0) + 1
+        self.changes[index] = changes
+        if not widen and changes < MemoryBlock.WIDEN_AFTER:
+            return joined
+        if self.bound is not None and \
+                all(isinstance(val, BaseInteger) for val in joined):
+            #pointers are left out, block ids differ between explorations
+            bound = SizedSet(joined.size)
+            bound.update(val for val in self.bound.block[index]
+                         if isinstance(val, BaseInteger))
+            if weak_join(bound, joined) is None:
+                return bound
+        values = weak_join(old_values, value, True)
+        if values != joined and index not in hulls and \
+                not getattr(self.block, 'smashed', False):
+            hulls[index] = joined
+        return values
+
+    def spans(self, offset, length):
+        """ (offset, index, start, size) of each part of a slot from offset
+            up to offset + length, start is where the part begins in the
+            slot at index and a slot inside the range is one part """
+        if offset < 0 or length < 0 or offset + length > self.size:
+            raise MemoryAccessViolation("Illegal Access")
+        end = offset + length
+        while offset < end:
+            index, start = self._get_index(offset)[0]
+            size = min(self.block[index].size - start, end - offset)
+            yield offset, index, start, size
+            offset += size
+
+    def read_range(self, offset, length):
+        """ Values of the bytes from offset up to offset + length, a slot
+            inside the range is copied as it is even if never written """
+        values = []
+        for part, index, start, size in self.spans(offset, length):
+            slot = self.block[index]
+            if start == 0 and size == slot.size:
+                values.append(slot)
+            else:
+                values.append(self.read(part, size))
+        return values
+
+    def write_range(self, offset, values, widen=False):
+        """ Writes values one after the other from offset, returns True if
+            a slot changed """
+        is_change = False
+        for value in values:
+            value = self._typed(offset, value)
+            if self.write(offset, value, widen):
+                is_change = True
+            offset += value.size
+        return is_change
+
+    def fill(self, offset, length, byte, widen=False):
+        """ Sets every byte from offset up to offset + length to byte, or
+            to top if byte is None, returns True if a slot changed """
+        if offset == 0 and length == self.size and \
+                isinstance(self.block, LazySlots) and \
+                cnf.CONFIG['store_update'] == 'weak':
+            self.hulls = {} #every slot may change, none can be narrowed
+            return self.block.join_each(lambda slot: self._typed(
+                0, MemoryBlock._bytes(byte, slot.size), slot), widen)
+        if offset == 0 and length == self.size and \
+                isinstance(self.block, LazySlots) and \
+                cnf.CONFIG['store_update'] == 'strong':
+            defaults = {size: self._typed(0, MemoryBlock._bytes(byte, size),
+                                          default)
+                        for size, default in self.block.defaults.items()}
+            is_change = bool(self.block.written) or \
+                        defaults != self.block.defaults
+            self.block.defaults = defaults
+            self.block.written = {}
+            return is_change
+        is_change = False
+        for part, _, _, size in list(self.spans(offset, length)):
+            value = self._typed(part, MemoryBlock._bytes(byte, size))
+            if self.write(part, value, widen):
+                is_change = True
+        return is_change
+
+    @staticmethod
+    def _bytes(byte, size):
+        """ ByteValue of size bytes that are all byte, top if byte is
+            None """
+        if byte is None:
+            return ByteValue(size)
+        known = (1 << (size*8)) - 1
+        return ByteValue._make(size, known, #pylint: disable=protected-access
+                               int.from_bytes(bytes([byte]) * size, 'little'))
+
+    def _typed(self, offset, value, slot=None):
+        """ The bytes of value as a value of the type held by the slot it
+            fills at offset, bytes that only fill part of a slot are kept as
+            they are """
+        if isinstance(value, SizedSet):
+            if not any(isinstance(item, ByteValue) for item in value):
+                return value
+            result = SizedSet(value.size)
+            for item in value:
+                result.add(self._typed(offset, item))
+            return result
+        if not isinstance(value, ByteValue):
+            return value
+        if slot is None:
+            index, start = self._get_index(offset)[0]
+            slot = self.block[index]
+            if start != 0 or slot.size != value.size:
+                return value
+        if isinstance(slot, SizedSet):
+            slot = next(iter(slot), None)
+        type_of = getattr(slot, 'type_of', 'uninitialized')
+        if type_of == 'pointer':
+            if value.known == (1 << (value.size*8)) - 1 and value.value == 0:
+                return generate_null_pointer()
+            type_of = 'bit_value'
+        if type_of == 'uninitialized' and value.size == 1:
+            type_of = 'char'
+        return generate_value(value, type_of)
+
+    def narrow(self):
+        """ Sets each widened slot to the join of the values written to it,
+            returns True if a slot changed """
+        is_change = False
+        for index, hull in self.hulls.items():
+            if self.block[index] != hull:
+                self.block[index] = hull
+                is_change = True
+        self.hulls = {}
+        return is_change
+
+    def free(self):
+        """ Marks the block as free """
+        self.is_free = True
+
+    def distinct_values(self):
+        """ Values of the slots, a default shared by lazy slots is once """
+        if isinstance(self.block, LazySlots):
+            return self.block.distinct_values()
+        return self.block
+
+    def __eq__(self, other):
+        if not isinstance(other, MemoryBlock):
+            return False
+        if self.shape != other.shape or self.is_free != other.is_free:
+            return False
+        if isinstance(self.block, LazySlots):
+            return self.block == other.block
+        for mine, theirs in zip(self.block, other.block):
+            if type(mine) is not type(theirs) or mine != theirs: #pylint: disable=unidiomatic-typecheck
+                return False
+        return True
+
+    def __hash__(self):
+        sizes, length, extra = self.shape
+        result = hash((tuple(sizes), length, extra, self.is_free))
+        if isinstance(self.block, LazySlots):
+            return result * 31 + hash(self.block)
+        for value in self.block:
+            if isinstance(value, set):
+                value = frozenset(value)
+            result = result * 31 + hash(value)
+        return result
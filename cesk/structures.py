@@ -1,42 +1,51 @@
 """Holds the data structures for the CESK machine"""
 
 import logging
-import pycparser
-import pycparser.c_ast as AST
+import weakref
+from bisect import bisect_left, bisect_right, insort
 import cesk.linksearch as ls
-from cesk.values import generate_unitialized_value
-from cesk.values import generate_null_pointer
-from cesk.values import generate_pointer, generate_value
-from cesk.values.base_values import ByteValue, SizedSet
+import cesk.trace as trace
+from cesk.values import generate_null_pointer, generate_pointer
+from cesk.values.base_values import SizedSet, BaseInteger, \
+                                   ReferenceValue
 from cesk.values.factory import Factory
+from cesk.values.abstract_literals import AbstractLiterals as AL
+from cesk.persistent_map import PersistentMap
+from cesk.slots import MemoryBlock
+from cesk.bulk_memory import BulkMemoryMixin
 import cesk.config as cnf
 from cesk.exceptions import MemoryAccessViolation, UnknownConfiguration, \
                            CESKException
 
 class State: #pylint:disable=too-few-public-methods
     """Holds a program state"""
-    #ctrl = None #control
-    #envr = None  #environment
-    #stor = None #store
-    #kont_addr = None #k(c)ontinuation Address
-    #time_stamp = None
+    #ctrl: control
+    #envr: environment
+    #stor: store
+    #kont_addr: k(c)ontinuation Address
+    #time_stamp
+    #_hash: hash of ctrl, envr and kont_addr, the store can still change
+    __slots__ = ('ctrl', 'envr', 'stor', 'kont_addr', 'time_stamp', '_hash')
 
     _time = 0
 
     def __init__(self, ctrl, envr, stor, kont_addr):
-        self.set_ctrl(ctrl)
-        self.set_envr(envr)
-        self.set_stor(stor)
-        self.set_kont_addr(kont_addr)
+        self.ctrl = ctrl
+        self.envr = envr
+        self.stor = stor
+        self.kont_addr = kont_addr
+        self._hash = None
         self.tick()
 
     def set_ctrl(self, ctrl):
         """attaches a control object to the state"""
         self.ctrl = ctrl
+        self._hash = None
 
     def set_envr(self, envr):
         """attaches an environment object to the state"""
         self.envr = envr
+        self._hash = None
 
     def set_stor(self, stor):
         """attaches a stor object to the state"""
@@ -45,6 +54,7 @@ class State: #pylint:disable=too-few-public-methods
     def set_kont_addr(self, kont_addr):
         """attaches a kont_addr object to the state"""
         self.kont_addr = kont_addr
+        self._hash = None
 
     def get_kont(self):
         '''returns kont'''
@@ -62,34 +72,65 @@ class State: #pylint:disable=too-few-public-methods
         """ generates an error state based on current state """
         return ErrorState(self, err_str)
 
+    def fork(self):
+        """ Returns the state with a private copy of a persistent store
+            so that executing it leaves this state untouched """
+        if self.stor is None or not self.stor.persistent:
+            return self
+        return State(self.ctrl, self.envr, Stor(self.stor), self.kont_addr)
+
     def tick(self):
         """ Sets the time stamp for the state """
         if cnf.CONFIG['tick'] == 'concrete':
             State._time += 1
             self.time_stamp = State._time
         elif cnf.CONFIG['tick'] == 'abstract':
-            if self.stor is None:
+            if self.stor is None or self.stor.persistent:
+                #a persistent store is compared with the state
                 self.time_stamp = State._time
             else:
                 self.time_stamp = self.stor.get_time()
-        elif cnf.CONFIG['tick'] == 'trivial':
+        elif cnf.CONFIG['tick'] in ('trivial', 'dependency'):
+            #dependency: states are requeued by the addresses they read
             self.time_stamp = State._time
         else:
             raise UnknownConfiguration('tick')
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, State):
             return False
         return (self.ctrl == other.ctrl and
                 self.envr == other.envr and
-                self.kont_addr == other.kont_addr)
+                self.kont_addr == other.kont_addr and
+                (not self.has_persistent_stor() or self.stor == other.stor))
+
+    def has_persistent_stor(self):
+        """ True if the store belongs to this state alone """
+        return self.stor is not None and self.stor.persistent
 
     def __hash__(self):
-        result = hash(self.ctrl)
-        result = result * hash(self.envr) + 37
-        result = result * hash(self.kont_addr) + 17
+        result = self._hash
+        if result is None:
+            result = hash(self.ctrl)
+            result = result * hash(self.envr) + 37
+            result = result * hash(self.kont_addr) + 17
+            self._hash = result
+        if self.has_persistent_stor():
+            #the store is written after the state is made, never cached
+            result = result * hash(self.stor) + 59
         return result
 
+    def __getstate__(self):
+        return (self.ctrl, self.envr, self.stor,
+                self.kont_addr, self.time_stamp)
+
+    def __setstate__(self, state):
+        self.ctrl, self.envr, self.stor, self.kont_addr, self.time_stamp = \
+            state
+        self._hash = None
+
     def __str__(self):
         return (str(self.ctrl)+"\n"+
                 str(self.envr)+"\n"+
@@ -97,6 +138,9 @@ class State: #pylint:disable=too-few-public-methods
 
 class ErrorState: #pylint: disable=too-few-public-methods
     """ Holds program state that errored upon execution """
+    __slots__ = ('ctrl', 'envr', 'stor', 'kont_addr', 'time_stamp',
+                 'message', '_hash')
+
     def __init__(self, state, msg): #ctrl, envr, stor, kont_addr, time_stamp):
         self.ctrl = state.ctrl
         self.envr = state.envr
@@ -104,137 +148,48 @@ class ErrorState: #pylint: disable=too-few-public-methods
         self.kont_addr = state.kont_addr
         self.time_stamp = state.time_stamp
         self.message = msg
+        self._hash = self._compute_hash()
+
+    def _compute_hash(self):
+        result = hash(self.ctrl) + 53
+        result = result * hash(self.envr) + 37
+        result = result * hash(self.kont_addr) + 17
+        result = result * hash(self.message)
+        return result
 
     def __eq__(self, other):
         if not isinstance(other, ErrorState):
             return False
-        return (self.ctrl == other.ctrl and
+        return (self._hash == other._hash and
+                self.ctrl == other.ctrl and
                 self.envr == other.envr and
                 self.message == other.message and
                 self.kont_addr == other.kont_addr)
 
     def __hash__(self):
-        result = hash(self.ctrl) + 53
-        result = result * hash(self.envr) + 37
-        result = result * hash(self.kont_addr) + 17
-        result = result * hash(self.message)
-        return result
+        return self._hash
+
+    def __getstate__(self):
+        return (self.ctrl, self.envr, self.stor, self.kont_addr,
+                self.time_stamp, self.message)
+
+    def __setstate__(self, state):
+        (self.ctrl, self.envr, self.stor, self.kont_addr,
+         self.time_stamp, self.message) = state
+        self._hash = self._compute_hash()
 
     def __str__(self):
         return ("Error in "+str(self.envr)+"\nat "+str(self.ctrl)+"\n"+
                 "to "+str(self.kont_addr)).replace(':', ' ')+"\n"+self.message
 
-class Ctrl: #pylint:disable=too-few-public-methods
-    """Holds the control pointer or location of the program"""
-
-    def construct_node(self, node):
-        """ sets the node """
-        self.node = node
-
-    def construct_body(self, index, body):
-        """ sets the index and body """
-        self.index = index
-        self.body = body
-
-    def __init__(self, first, second=None):
-        """There are two types of control: The normal ones that have an index in
-        a body, and the special ones that only hold a Node. This picks which
-        constructor to use"""
-        self.index = None
-        self.body = None
-        self.node = None
-        if second:
-            if isinstance(second, pycparser.c_ast.FuncDef):
-                self.construct_body(first, second.body)
-            elif isinstance(second, pycparser.c_ast.Compound):
-                self.construct_body(first, second)
-            else:
-                raise CESKException("Ctrl init body not Compound or Function: "+
-                                    str(second))
-        elif first:
-            self.construct_node(first)
-        else:
-            raise CESKException("Malformed Ctrl init")
-
-    def stmt(self):
-        """Retrieves the statement at the location."""
-        if self.node:
-            return self.node
-        return self.body.block_items[self.index]
-
-    def get_next(self):
-        """takes state and returns a state with ctrl for the next statement
-        to execute"""
-
-        if self.body: #if a standard compound-block:index ctrl
-            if self.index + 1 < len(self.body.block_items):
-                #if there are more items in the compound block go to next
-                return Ctrl(self.index + 1, self.body)
-
-            else:
-                #if we are falling off the end of a compound block
-                parent = ls.LinkSearch.parent_lut[self.body]
-                if parent is None:
-                    #we are falling off and there is no parent block
-                    raise CESKException("Expected Return Statement")
-
-                elif isinstance(parent, AST.Compound):
-                    #find current compound block position in the parent block
-                    parent_index = ls.LinkSearch.index_lut[self.body]
-                    new_ctrl = Ctrl(parent_index, parent)
-
-                else:
-                    #if the parent is not a compound (probably an if statement)
-                    new_ctrl = Ctrl(parent) #make a special ctrl and try again
-
-                return new_ctrl.get_next()
-
-        if self.node:
-            #if it is a special ctrl as created by binop or assign
-            #try to convert to normal ctrl and try again
-            parent = ls.LinkSearch.parent_lut[self.node]
-            if isinstance(parent, AST.Compound):
-                #we found the compound we can create normal ctrl
-                parent_index = ls.LinkSearch.index_lut[self.node]
-                new_ctrl = Ctrl(parent_index, parent)
-            else:
-                #we couldn't make a normal try again on parent
-                new_ctrl = Ctrl(parent)
-            return new_ctrl.get_next()
-
-        raise CESKException("Malformed ctrl: this should have been unreachable")
-
-    def __eq__(self, other):
-        if isinstance(other, int):
-            return False
-        if self.body:
-            return other.body and self.body == other.body and \
-                                 self.index == other.index
-        if self.node:
-            return self.node == other.node
-        return False
-
-    def __hash__(self):
-        if self.body:
-            return ((31 * hash(self.body)) + 62257) * hash(self.index) + 97
-        else:
-            return hash(self.node)
-
-    def __repr__(self):
-        if self.body:#this will not be unique for every contral
-            return (type(self.body.block_items[self.index]).__name__+" at "+
-                    str(self.body.block_items[self.index].coord))
-        if self.node:
-            return type(self.node).__name__+" at "+str(self.node.coord)
-        return "No body in ctrl"
-
 class FrameAddress:
     """ Contains a link between frame identifier and variable identifier """
+    __slots__ = ('frame', 'ident', '_hash')
 
     def __init__(self, frame_id, ident):
         self.frame = frame_id
         self.ident = ident
-        #super(FrameAddress, self).__init__(0, 1)
+        self._hash = 1+43*hash(ident)+73*hash(frame_id)
 
     def get_frame(self):
         """ Returns frame identifier """
@@ -245,27 +200,75 @@ class FrameAddress:
         return self.ident
 
     def __hash__(self):
-        return 1+43*hash(self.ident)+73*hash(self.frame)
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, FrameAddress):
             return False
-        return self.ident == other.ident and self.frame == other.frame
+        return (self._hash == other._hash and
+                self.ident == other.ident and self.frame == other.frame)
+
+    def __reduce__(self):
+        return (FrameAddress, (self.frame, self.ident))
 
     def __str__(self):
         return "("+str(self.frame)+", "+str(self.ident)+")"
 
 class Envr:
-    """Holds the enviorment/frame (a maping of identifiers to addresses)"""
+    """Holds the enviorment/frame (a maping of identifiers to addresses).
+    Envrs are interned by frame id and function, every call that allocF
+    gives the same frame id shares one Envr. The addresses are also kept in
+    slots by the frame layout of the function, see ls.frame_layout, so that
+    compiled lookups index a list"""
+    __slots__ = ('local_variables', 'frame_id', 'key', 'layout', 'slots',
+                 '_hash', '__weakref__')
     next_frame_id = 1 #Tracks next concrete frame id
     global_envr_id = 0
     global_envr = None
+    _table = weakref.WeakValueDictionary() #(frame id, function) -> Envr
+
+    def __new__(cls, func_name, ctrl):
+        if func_name is None:
+            func_name = 'global'
+        frame_id = Envr.allocF(func_name, ctrl)
+        return Envr.intern((frame_id, func_name), frame_id)
 
-    def __init__(self, func_name, ctrl):
+    @staticmethod
+    def intern(key, frame_id, local_variables=None):
+        """ Returns the Envr for key, making it if there is none. The
+            mappings in local_variables are added to it """
+        envr = Envr._table.get(key)
+        if envr is None:
+            envr = object.__new__(Envr)
+            Envr._setup(envr, key, frame_id)
+            Envr._table[key] = envr
+        if local_variables:
+            envr.local_variables.update(local_variables)
+            envr.set_layout(envr.layout)
+        return envr
+
+    def _setup(self, key, frame_id):
+        """ Sets the fields of a new Envr, see intern """
         self.local_variables = {} #A set of IdToAddr mappings
-        self.frame_id = self.allocF(func_name, ctrl)
+        self.frame_id = frame_id
+        self.key = key
+        self.layout = ls.frame_layout(key[1])
+        self.slots = [None] * len(self.layout) #nothing is mapped yet
+        self._hash = hash(frame_id)
+
+    def set_layout(self, layout):
+        """ Puts the addresses mapped so far in the slots of layout """
+        self.layout = layout
+        self.slots = [None] * len(layout)
+        for ident, address in self.local_variables.items():
+            index = layout.get(ident)
+            if index is not None:
+                self.slots[index] = address
 
-    def allocF(self, name, ctrl): #pylint: disable=no-self-use,invalid-name
+    @staticmethod
+    def allocF(name, ctrl): #pylint: disable=invalid-name
         """ Allocation of frame identefiers """
         value = None
         if name is None:
@@ -299,12 +302,17 @@ class Envr:
         """Add a new identifier to the mapping"""
         frame_addr = FrameAddress(self.frame_id, ident)
         self.local_variables[ident] = frame_addr
+        index = self.layout.get(ident)
+        if index is not None:
+            self.slots[index] = frame_addr
         return frame_addr
 
     @staticmethod
     def set_global(global_env):
         """ sets a global environment """
         global_env.frame_id = Envr.global_envr_id
+        global_env._hash = hash(global_env.frame_id) #pylint: disable=protected-access
+        global_env.set_layout(ls.frame_layout(None))
         Envr.global_envr = global_env
 
     def is_localy_defined(self, ident):
@@ -320,275 +328,308 @@ class Envr:
         return self.is_localy_defined(ident) or Envr.is_globaly_defined(ident)
 
     def __eq__(self, other):
-        return self.frame_id == other.frame_id
+        return self is other or self.frame_id == other.frame_id
 
     def __hash__(self):
-        return hash(self.frame_id)
+        return self._hash
+
+    def __reduce__(self):
+        return (Envr.intern, (self.key, self.frame_id, self.local_variables))
 
     def __str__(self):
         return str(self.frame_id)
 
-class MemoryBlock: #pylint: disable=too-many-instance-attributes
-    """ Block of Memory """
-
-    def __init__(self, sizes, length, extra):
-        self.shape = (sizes, length, extra)
-        self.size = sum(sizes)*length + extra
-        self.block = []
-        self.is_free = False
-
-        for _ in range(length):
-            for size in sizes:
-                self._add_value(size)
-
-        if extra != 0:
-            self._add_value(extra)
-
-        if len(sizes) == 1 and length == 1 and extra == 0:
-            self._get_index = self._get_index_item
-        else:
-            self._get_index = self._get_index_list
-
-        if cnf.CONFIG['store_update'] == 'strong':
-            self.write = self.strong_write
-            self.read = self.strong_read
-            self.add = lambda s, v: s.add(v)
-        elif cnf.CONFIG['store_update'] == 'weak':
-            self.write = self.weak_write
-            self.read = self.weak_read
-            self.add = lambda s, v: s.update(v)
-        else:
-            raise UnknownConfiguration('store_update')
-
-    def _add_value(self, size):
-        """ Adds a memory slot to store a value """
-        if cnf.CONFIG['store_update'] == 'strong':
-            self.block.append(generate_unitialized_value(size))
-        elif cnf.CONFIG['store_update'] == 'weak':
-            self.block.append(SizedSet(size))
-        else:
-            raise UnknownConfiguration("store_update")
-
-    def _get_index_item(self, offset):
-        """ given an offset returns value or throws error """
-        if not isinstance(offset, int):
-            logging.error("TOP memory access made")
-            offset = 0
-        return [[0, offset]]
-
-    def _get_index_list(self, offset):
-        """ given an offset returns the number of time a succ map
-            would need to be called to find the item and offset remaning """
-        if not isinstance(offset, int):
-            logging.error("TOP memory access made")
-            return [[i, 0] for i in range(len(self.block))]
-        group = sum(self.shape[0])
-        index = (offset // group)
-        offset = offset % group
-        if index == self.shape[1]:#accesses extra part
-            index *= len(self.shape[0])
-            return [[index, offset]]
-        index *= len(self.shape[0])
-        i = 0
-        while offset >= self.shape[0][i]:
-            offset -= self.shape[0][i]
-            index += 1
-            i += 1
-        return [[index, offset]]
-
-    def not_in_block(self, offset, size):
-        """ function to identify if offset is in the block """
-        if isinstance(offset, int):
-            return offset < 0 or offset+size > self.size
-        else: #is abstract literal top
-            return False #add possible memory error here
-
-    def strong_read(self, offset, read_size):
-        """ return value or set of values based on read """
-        if self.not_in_block(offset, read_size):
-            raise MemoryAccessViolation("Illegal Read")
-
-        index, start = self._get_index(offset)[0]
-        if start == 0 and self.block[index].size == read_size:
-            return self.block[index]
-
-        #immoral read over/within byte boundary
-        byte_value = ByteValue()
-        bytes_to_read = read_size
-        value = self.block[index]
-        while bytes_to_read > 0:
-            num_possible = min(bytes_to_read, value.size - start)
-            value = value.get_byte_value(start, num_possible)
-            byte_value = byte_value.append(value)
-            bytes_to_read -= num_possible
-            if bytes_to_read > 0:
-                index += 1
-                start = 0
-                value = self.block[index]
-        return byte_value
-
-    def weak_read(self, offset, read_size):
-        """ return value or set of values based on read """
-        if self.not_in_block(offset, read_size):
-            raise MemoryAccessViolation("Illegal Read")
-
-        result = SizedSet(read_size)
-        for index, start in self._get_index(offset):
-            if start == 0 and self.block[index].size == read_size:
-                result.update(self.block[index])
-                continue
-            #immoral read over/within byte boundary
-            byte_values = {ByteValue()}
-            bytes_to_read = read_size
-            value = self.block[index]
-            while bytes_to_read > 0:
-                num_possible = min(bytes_to_read, value.size - start)
-                values = value.get_byte_value(start, num_possible)
-                old_byte_values = byte_values
-                byte_values = set()
-                for front in old_byte_values:
-                    for back in values:
-                        byte_values.add(front.append(back))
-                bytes_to_read -= num_possible
-                if bytes_to_read > 0:
-                    index += 1
-                    start = 0
-                    value = self.block[index]
-            result.update(byte_values)
-
-        #return result
-        if not result:
-            raise MemoryAccessViolation("Read from Unasigned Address")
-        else:
-            return result
-
-    def strong_write(self, offset, value):
-        """ Writes the value given at the offset given
-            returns True if values are changed False otherwise"""
-        if self.not_in_block(offset, value.size):
-            raise MemoryAccessViolation("Illegal Write")
-        for index, start in self._get_index(offset):
-            if start == 0 and self.block[index].size == value.size:
-                self.block[index] = value
-
-            old_value = self.block[index]
-            if start == 0 and value.size == old_value.size:
-                self.block[index] = value
-                return value != old_value
-
-            #begin a partial or overlapping write
-            bytes_to_write = value.size
-            bytes_written = 0
-
-            while bytes_to_write != 0:
-
-                #get unchanged part of value at the given pointer location
-                if start != 0:
-                    new_data = old_value.get_byte_value(0, start)
-                else:
-                    new_data = ByteValue() #empty byte value
-
-                #bytes in store represents the number of bytes in the store that
-                #are available to be overwritten
-                bytes_in_store = old_value.size - start
-                able_to_write = min(bytes_to_write, bytes_in_store)
-
-                #get value from data being written
-                new_data = new_data.append(
-                    value.get_byte_value(bytes_written, able_to_write))
-
-                bytes_to_write -= able_to_write
-                bytes_written += able_to_write
-
-                if bytes_to_write > 0:
-                    #more data left in value, write to store then continue
-                    self._write_on_offset(index, new_data, old_value)
-                    index += 1 #update pointer and old_value
-                    start = 0
-                    old_value = self.block[index]
-                elif bytes_in_store > able_to_write:
-                    #get rest of object then write
-                    offset = start+able_to_write
-                    new_data = new_data.append(
-                        old_value.get_byte_value(offset,
-                                                 bytes_in_store-able_to_write))
-                    self._write_on_offset(index, new_data, old_value)
-                else:
-                    self._write_on_offset(index, new_data, old_value)
-                    #neat finish write to store and be done
-
-    def _write_on_offset(self, index, new_data, old_value):
-        """ Manages how to write when mixing bytes """
-        # TODO check if old/new value are sets and handle
-        self.block[index] = generate_value(new_data, old_value.type_of)
-
-    def weak_write(self, offset, value):
-        """ Writes the value given at the offset given
-            returns True if values are changed False otherwise"""
-        if self.not_in_block(offset, value.size):
-            raise MemoryAccessViolation("Illegal Write")
-        is_change = False
-        for index, start in self._get_index(offset):
-            if start == 0 and self.block[index].size == value.size:
-                old_values = self.block[index]
-                if isinstance(value, SizedSet):
-                    for val in value:
-                        if val not in old_values:
-                            is_change = True
-                            old_values.add(val)
-                elif value not in old_values:
-                    is_change = True
-                    old_values.add(value)
-                #else value already in store, no update
-                continue
-            #begin a partial or overlapping write
-            raise NotImplementedError("Partial weak write not implemented")
-        return is_change
-
-    def free(self):
-        """ Marks the block as free """
-        self.is_free = True
-
-class Stor: #pylint: disable=too-many-instance-attributes
+class Stor(BulkMemoryMixin): #pylint: disable=too-many-instance-attributes
     """Represents the contents of memory at a moment in time."""
     heap_address_counter = 0
+    #block id of every base while garbage is collected, a base collected and
+    #made again gets its old id so that the store can match its old self
+    gc_block_ids = {}
+    gc_next_block_id = 1
+    jmp_konts = set() #continuations saved by setjmp, see collect
 
     def __init__(self, to_copy=None):
         if to_copy is None:
             self.null_addr = generate_null_pointer()
             self.next_block_id = 1 # start at 1 so that 0 can be nullptr
-            self.memory = {}
-            self.base_pointers = {}
-            self.kont_map = {}
+            if cnf.CONFIG['store'] == 'shared':
+                self.persistent = False
+                self.memory = {}
+                self.base_pointers = {}
+                self.kont_map = {}
+            elif cnf.CONFIG['store'] == 'persistent':
+                self.persistent = True
+                self.memory = PersistentMap()
+                self.base_pointers = PersistentMap()
+                self.kont_map = PersistentMap()
+            else:
+                raise UnknownConfiguration('store')
             self.time = 0 #tracks how many times the stor has changed
+            self.block_index = [] #sorted ids of the blocks in memory
+            #a persistent store sees the first block_count ids of an index
+            #it may share with the stores it was copied from or to
+            self.block_count = 0
         elif isinstance(to_copy, Stor): #shallow copy of stor
             self.null_addr = to_copy.null_addr
             self.next_block_id = to_copy.next_block_id
+            self.persistent = to_copy.persistent
             self.memory = to_copy.memory
-            self.base_pointers = to_copy.frames
-            self.kont_map = to_copy.kont
+            self.base_pointers = to_copy.base_pointers
+            self.kont_map = to_copy.kont_map
             self.time = to_copy.time
+            self.block_index = to_copy.block_index
+            self.block_count = to_copy.block_count
         else:
             raise CESKException("Stor Copy Constructor Expects a Stor Object")
+        #blocks made or copied by this store are tagged with a fresh token
+        self.owner = object() if self.persistent else None
+        #writes are widened while a statement inside a loop is evaluated
+        self.widen = False if to_copy is None else to_copy.widen
+        #blocks of a narrowed exploration by base, see narrow
+        self.bounds = None if to_copy is None else to_copy.bounds
+        self.reads = None #addresses read and changed, see start_tracking
+        self.writes = None
+        #calls that have not returned, innermost last, see open_call
+        self.calls = () if to_copy is None else to_copy.calls
+
+    def start_tracking(self):
+        """ Starts recording the block ids and continuation addresses that
+            are read from and changed, in the order they are first seen """
+        self.reads = {}
+        self.writes = {}
+
+    def stop_tracking(self):
+        """ Stops recording, returns (addresses read, addresses changed) """
+        reads, writes = self.reads, self.writes
+        self.reads = None
+        self.writes = None
+        return reads, writes
+
+    def narrow(self):
+        """ Narrows the widened slots of every block, see MemoryBlock.narrow.
+            If any changed returns the blocks by base, a store exploring
+            again with these bounds gets the values that depend on the
+            narrowed slots without widening them. Returns None otherwise """
+        is_change = False
+        for block in self.memory.values():
+            if block.hulls and block.narrow():
+                is_change = True
+        if not is_change:
+            return None
+        return {base: self.memory[pointer.get_block()]
+                for base, pointer in self.base_pointers.items()}
+
+    def collect(self, envr, kont_addr):
+        """ Removes the blocks, bases and continuations that a state with
+            this envr and kont_addr can no longer reach. The roots are the
+            globals, the frame of the state and the frames and return
+            addresses of the continuations from kont_addr, blocks are
+            reached through the pointers they hold and continuations saved
+            by setjmp through the jmp_buf holding their address. Only for a
+            persistent store that no other state shares, returns the number
+            of (blocks, bases, continuations) removed """
+        blocks, konts = self._reachable(envr, kont_addr)
+        dead_blocks = [block_id for block_id in self.memory
+                       if block_id not in blocks]
+        dead_bases = [base for base, pointer in self.base_pointers.items()
+                      if pointer.get_block() not in blocks]
+        dead_konts = [address for address in self.kont_map
+                      if address not in konts]
+        for block_id in dead_blocks:
+            self.memory = self.memory.remove(block_id)
+        if dead_blocks:
+            live = self.block_index[:self.block_count]
+            self.block_index = [block_id for block_id in live
+                                if block_id in blocks]
+            self.block_count = len(self.block_index)
+        for base in dead_bases:
+            self.base_pointers = self.base_pointers.remove(base)
+        for address in dead_konts:
+            self.kont_map = self.kont_map.remove(address)
+        return len(dead_blocks), len(dead_bases), len(dead_konts)
+
+    def _reachable(self, envr, kont_addr):
+        """ The block ids and continuation addresses reached from the roots,
+            see collect """
+        base_pointers = self.base_pointers
+        konts = set()
+        frames = set()
+        blocks = set()
+        pending = [envr, Envr.global_envr]
+        pending.extend(self._konts_at(kont_addr, konts))
+        while pending:
+            item = pending.pop()
+            if isinstance(item, SizedSet):
+                pending.extend(item)
+            elif isinstance(item, Envr):
+                if item not in frames:
+                    frames.add(item)
+                    pending.extend(item.local_variables.values())
+            elif isinstance(item, Kont):
+                pending.append(item.envr)
+                pending.extend(self._konts_at(item.kont_addr, konts))
+                if item.return_address is not None:
+                    pending.append(item.return_address)
+            elif isinstance(item, BaseInteger):
+                if item.data in Stor.jmp_konts: #held by a jmp_buf
+                    pending.extend(self._konts_at(item.data, konts))
+            else:
+                if isinstance(item, FrameAddress):
+                    item = base_pointers.get(item)
+                if isinstance(item, ReferenceValue) and \
+                        item.get_block() not in blocks and \
+                        item.get_block() in self.memory:
+                    blocks.add(item.get_block())
+                    pending.extend(
+                        self.memory[item.get_block()].distinct_values())
+        return blocks, konts
+
+    def _konts_at(self, kont_addr, konts):
+        """ The continuations at kont_addr if it is not in konts yet, it is
+            added, see collect """
+        if kont_addr == 0 or kont_addr in konts or \
+                kont_addr not in self.kont_map:
+            return ()
+        konts.add(kont_addr)
+        return self.kont_map[kont_addr]
+
+    def open_call(self, recording):
+        """ Starts recording the blocks used by a call to be summarized, see
+            cesk.summaries """
+        self.calls = self.calls + (recording,)
+
+    def close_call(self, kont_addr, single=True):
+        """ Ends the open call returning through kont_addr. The blocks it
+            used were also used by the call around it. Returns the
+            recording if the call can be summarized, single is False when
+            it returns to more than one continuation """
+        calls = self.calls
+        depth = len(calls) - 1
+        while depth >= 0 and calls[depth].kont_addr != kont_addr:
+            depth -= 1
+        if depth < 0:
+            return None
+        recording = calls[depth]
+        #calls above it were left by a longjmp and never return
+        usable = recording.usable and single and depth == len(calls) - 1
+        self.calls = calls[:depth]
+        if self.calls:
+            outer = self.calls[-1]
+            for block_id, block in recording.reads.items():
+                outer.reads.setdefault(block_id, block)
+            outer.usable = outer.usable and usable
+        return recording if usable else None
+
+    def stop_summaries(self):
+        """ The open calls can not be summarized, they took more than one
+            path or did something a summary does not repeat """
+        for recording in self.calls:
+            recording.usable = False
+
+    def apply_summary(self, summary):
+        """ Makes the changes of a summarized call """
+        if self.calls:
+            outer = self.calls[-1]
+            for block_id, block in summary.reads.items():
+                outer.reads.setdefault(block_id, block)
+        for block_id, block in summary.effects.items():
+            self.memory = self._assign(self.memory, block_id, block)
+        if summary.effects:
+            self.time += 1
 
-    def _add_new_block(self, block):
-        """ Add new block and return pointer """
-        logging.info("Make new block: shape %s, at %d",
-                     str(block.shape), self.next_block_id)
-        pointer = generate_pointer(self.next_block_id, block.size)
-        self.memory[self.next_block_id] = block
-        self.next_block_id += block.size #Value added is arbitrary
+    def _changed(self, block_id):
+        """ Advances the time after a write changed the block """
+        self.time += 1
+        self._record(write=block_id)
+
+    def _record(self, read=None, write=None):
+        """ Notes an address that was read and/or changed while tracking,
+            and a block before the innermost open call changes it """
+        if self.calls:
+            block_id = write if read is None else read
+            if isinstance(block_id, int):
+                self.calls[-1].touch(block_id, self.memory)
+        if self.reads is None:
+            return
+        if read is not None:
+            self.reads[read] = None
+        if write is not None:
+            self.writes[write] = None
+
+    def _assign(self, table, key, value):
+        """ Maps key to value in table and returns the updated table """
+        if self.persistent:
+            return table.set(key, value)
+        table[key] = value
+        return table
+
+    def _writable_block(self, block_id):
+        """ Returns the block at block_id, copying it first if it is shared
+            with another persistent store """
+        block = self.memory[block_id]
+        if self.persistent and block.owner is not self.owner:
+            block = block.copy(self.owner)
+            self.memory = self.memory.set(block_id, block)
+        return block
+
+    def _add_new_block(self, block, block_id=None):
+        """ Add new block and return pointer, at the next block id unless
+            a block id is given """
+        if block_id is None:
+            block_id = self.next_block_id
+        if trace.STORE:
+            trace.emit('store', "Make new block: shape %s, at %d",
+                       block.shape, block_id)
+        pointer = generate_pointer(block_id, block.size)
+        self._record(write=block_id)
+        self.memory = self._assign(self.memory, block_id, block)
+        self._index_block(block_id)
+        #Value added is arbitrary
+        self.next_block_id = max(self.next_block_id, block_id + block.size)
         return pointer
 
+    def _index_block(self, block_id):
+        """ Adds block_id to the sorted block ids. A persistent store only
+            copies the index when a store sharing it added to it or the id
+            is not the largest, ids past block_count are not seen by the
+            other stores so the largest id is appended in place """
+        if not self.persistent:
+            insort(self.block_index, block_id)
+            return
+        index = self.block_index
+        position = bisect_left(index, block_id, 0, self.block_count)
+        if position < self.block_count and index[position] == block_id:
+            return
+        if position == self.block_count == len(index):
+            index.append(block_id)
+        else:
+            self.block_index = index[:self.block_count]
+            self.block_index.insert(position, block_id)
+        self.block_count += 1
+
     def allocM(self, base, list_of_sizes, length=1, extra=0): #pylint: disable=invalid-name
         ''' new allocM to have only successors and
             all pointers only have one base pointer per block '''
         if base in self.base_pointers:
             return self.base_pointers[base]
 
-        new_block = MemoryBlock(list_of_sizes, length, extra)
-        block_ptr = self._add_new_block(new_block)
-        self.base_pointers[base] = block_ptr
+        if self.calls and not isinstance(base, FrameAddress):
+            self.stop_summaries() #a summary would return the same heap block
+        new_block = MemoryBlock(list_of_sizes, length, extra, self.owner)
+        if self.bounds is not None and base in self.bounds and \
+                self.bounds[base].shape == new_block.shape:
+            new_block.bound = self.bounds[base]
+        block_id = None
+        if cnf.CONFIG['gc'] == 'reachable':
+            block_id = Stor.gc_block_ids.get(base)
+            if block_id is None:
+                block_id = Stor.gc_next_block_id
+                Stor.gc_block_ids[base] = block_id
+                Stor.gc_next_block_id += new_block.size
+        block_ptr = self._add_new_block(new_block, block_id)
+        if self.calls and cnf.CONFIG['allocF'] == 'concrete':
+            self.calls[-1].made_fresh(block_ptr.get_block())
+        self.base_pointers = self._assign(self.base_pointers, base, block_ptr)
         return block_ptr
 
     def allocH(self, state): #pylint: disable=invalid-name
@@ -643,7 +684,9 @@ class Stor: #pylint: disable=too-many-instance-attributes
         if address in self.base_pointers:
             address = self.base_pointers[address]
 
-        logging.info("Reading %s", str(address))
+        if trace.STORE:
+            trace.emit('store', "Reading %s", address)
+        self._record(read=address.get_block())
         self._check_address(address.get_block(), 'read')
         if isinstance(address.offset, int):
             offset = address.offset
@@ -675,9 +718,10 @@ class Stor: #pylint: disable=too-many-instance-attributes
         if address in self.base_pointers:
             address = self.base_pointers[address]
 
-        logging.info("Write %s to %s", str(value), str(address))
-        logging.debug("Write size %d", value.size)
-        # TODO update writes map
+        if trace.STORE:
+            trace.emit('store', "Write %s to %s, size %d",
+                       value, address, value.size)
+        self._record(read=address.get_block())
         self._check_address(address.get_block(), 'write')
         if isinstance(address.offset, int):
             offset = address.offset
@@ -685,8 +729,9 @@ class Stor: #pylint: disable=too-many-instance-attributes
             offset = address.offset.data
         else:
             raise CESKException("Unknown Offset Type")
-        if self.memory[address.get_block()].write(offset, value):
-            self.time += 1
+        if self._writable_block(address.get_block()).write(offset, value,
+                                                           self.widen):
+            self._changed(address.get_block())
 
         return set()
 
@@ -707,6 +752,7 @@ class Stor: #pylint: disable=too-many-instance-attributes
         if address in self.base_pointers:
             address = self.base_pointers[address]
 
+        self._record(read=address.get_block())
         self._check_address(address.get_block(), 'free')
         if isinstance(address.offset, int):
             offset = address.offset
@@ -717,37 +763,45 @@ class Stor: #pylint: disable=too-many-instance-attributes
         if offset != 0:
             raise MemoryAccessViolation("Can only free a base pointer")
 
-        self.memory[address.get_block()].free()
+        if not self.memory[address.get_block()].is_free:
+            self._record(write=address.get_block())
+        self._writable_block(address.get_block()).free()
         return set()
 
     def get_nearest_address(self, address):
         """ returns a pointer to the nearest address
-            with an offset set to make difference """
-        #address = generate_pointer(address, self)
-        if address == 0:
+            with an offset set to make difference. The block is found by
+            bisecting the sorted block ids. An abstract integer that is not
+            only zero could point anywhere, converting it is a violation """
+        if isinstance(address, set) and len(address) == 1:
+            address = next(iter(address))
+        if address in (0, AL.ZERO):
             return self.null_addr
         logging.error("Converting from an unknown integer to a pointer")
-        #raise MemoryAccessViolation("Convert from unknown int to pointer")
+        if not isinstance(address, int):
+            raise MemoryAccessViolation("Convert from unknown int to pointer")
         if address > self.next_block_id:
             return self.null_addr
-        if address in self.memory:
-            return generate_pointer(address, None)
-
-        nearest_address = self.null_addr
-        for key in self.memory:
-            if key.data > address:
-                break
-            nearest_address = key
-
-        if nearest_address != self.null_addr:
-            offset = address.data - nearest_address.data
-            return generate_pointer(nearest_address.data, offset)
-
-        return self.null_addr
+        count = self.block_count if self.persistent else \
+            len(self.block_index)
+        index = bisect_right(self.block_index, address, 0, count) - 1
+        if index < 0:
+            return self.null_addr
+        block_id = self.block_index[index]
+        return Factory.Pointer(block_id, None, address - block_id)
 
     def write_kont(self, kont_addr, kai):
         """ records the continuation for the continuation address """
-        if cnf.CONFIG['allocK'] == 'concrete':
+        if kai not in self.kont_map.get(kont_addr, ()) or \
+                cnf.CONFIG['allocK'] == 'concrete':
+            self._record(write=('kont', kont_addr))
+        if self.persistent:
+            if cnf.CONFIG['allocK'] == 'concrete':
+                konts = frozenset([kai])
+            else:
+                konts = self.kont_map.get(kont_addr, frozenset()) | {kai}
+            self.kont_map = self.kont_map.set(kont_addr, konts)
+        elif cnf.CONFIG['allocK'] == 'concrete':
             self.kont_map[kont_addr] = {kai}
         else: #allocK == 0-cfa or p4f or trivial
             if kont_addr not in self.kont_map:
@@ -756,6 +810,7 @@ class Stor: #pylint: disable=too-many-instance-attributes
 
     def read_kont(self, kont_addr):
         """ returns the continuation(s) for the given kont_addr """
+        self._record(read=('kont', kont_addr))
         if kont_addr not in self.kont_map:
             raise CESKException("Address not in memory: " + str(kont_addr))
         return self.kont_map[kont_addr]
@@ -764,8 +819,26 @@ class Stor: #pylint: disable=too-many-instance-attributes
         """ Updates when new address is allocated or store value is changed """
         return self.time
 
+    def __eq__(self, other):
+        if not self.persistent or not isinstance(other, Stor):
+            return self is other
+        #block ids come from gc_block_ids while garbage is collected
+        return ((self.next_block_id == other.next_block_id or
+                 cnf.CONFIG['gc'] == 'reachable') and
+                self.memory == other.memory and
+                self.base_pointers == other.base_pointers and
+                self.kont_map == other.kont_map)
+
+    def __hash__(self):
+        if not self.persistent:
+            return id(self)
+        return hash((self.memory, self.base_pointers, self.kont_map))
+
 class Kont: #pylint: disable=too-few-public-methods
-    """Kontinuations"""
+    """Kontinuations, interned so equal continuations are one object"""
+    __slots__ = ('ctrl', 'envr', 'kont_addr', 'return_address', '_hash',
+                 '__weakref__')
+    _table = weakref.WeakValueDictionary() #fields -> Kont
 
     allocK_address = 2
     @staticmethod
@@ -782,11 +855,33 @@ class Kont: #pylint: disable=too-few-public-methods
             value = Kont.allocK_address
         return value
 
-    def __init__(self, parent_state, address=None):
-        self.ctrl = parent_state.ctrl
-        self.envr = parent_state.envr
-        self.kont_addr = parent_state.kont_addr
-        self.return_address = address # If Kont returns to an assignment
+    def __new__(cls, parent_state, address=None):
+        return Kont.intern(parent_state.ctrl, parent_state.envr,
+                           parent_state.kont_addr, address)
+
+    @staticmethod
+    def intern(ctrl, envr, kont_addr, return_address):
+        """ Returns the one Kont with these fields """
+        key = (ctrl, envr, kont_addr, return_address)
+        kont = Kont._table.get(key)
+        if kont is None:
+            kont = object.__new__(Kont)
+            Kont._setup(kont, key)
+            Kont._table[key] = kont
+        return kont
+
+    def _setup(self, key):
+        """ Sets the fields of a new Kont, see intern """
+        self.ctrl, self.envr, self.kont_addr, self.return_address = key
+        #return_address is set if the Kont returns to an assignment
+        self._hash = Kont._compute_hash(key)
+
+    @staticmethod
+    def _compute_hash(key):
+        result = 7
+        for field, offset in zip(key, (37, 53, 97, 3)):
+            result = result * hash(field) + offset
+        return result
 
     def invoke(self, state, value):
         """ Evaluates the return of a function """
@@ -801,15 +896,17 @@ class Kont: #pylint: disable=too-few-public-methods
         return {new_state.get_next()}, errors
 
     def __eq__(self, other):
-        return self.ctrl == other.ctrl and \
+        if self is other:
+            return True
+        return self._hash == other._hash and \
+               self.ctrl == other.ctrl and \
                self.envr == other.envr and \
                self.kont_addr == other.kont_addr and \
                self.return_address == other.return_address
 
     def __hash__(self):
-        result = 7
-        result = result * hash(self.ctrl) + 37
-        result = result * hash(self.envr) + 53
-        result = result * hash(self.kont_addr) + 97
-        result = result * hash(self.return_address) + 3
-        return result
+        return self._hash
+
+    def __reduce__(self):
+        return (Kont.intern, (self.ctrl, self.envr,
+                              self.kont_addr, self.return_address))
@@ -0,0 +1,106 @@
+""" Summaries of function calls, the return value and the blocks a call
+    changed, reused by later calls to the function with the same arguments
+    in a store that holds the same blocks the call read """
+from collections import deque
+
+#read of a block made for a frame that no other call has, like every frame
+#under concrete allocF, a later call makes its own block
+FRESH = object()
+
+def same_block(block, other):
+    """ True if both are the same block, or both are missing """
+    if block is other:
+        return True
+    if block is None or other is None:
+        return False
+    return block == other
+
+class Recording: #pylint: disable=too-few-public-methods
+    """ A call that has not returned yet. reads has each block the call
+        used as it was before the call first used it, None for the blocks
+        the call made and FRESH for the blocks of fresh frames """
+    __slots__ = ('key', 'kont_addr', 'reads', 'usable')
+
+    def __init__(self, key):
+        self.key = key
+        self.kont_addr = None #continuation address the call returns through
+        self.reads = {}
+        self.usable = True #False once the call can not be summarized
+
+    def touch(self, block_id, memory):
+        """ Notes block_id before the call changes it """
+        if block_id not in self.reads:
+            self.reads[block_id] = memory.get(block_id)
+
+    def made_fresh(self, block_id):
+        """ Notes a block made for a fresh frame """
+        self.reads[block_id] = FRESH
+
+class Summary: #pylint: disable=too-few-public-methods
+    """ The blocks a call read, the blocks it changed as they were when it
+        returned and its return value """
+    __slots__ = ('reads', 'effects', 'value')
+    #summaries by (FuncDef, argument values), newest last
+    table = {}
+    LIMIT = 16 #summaries kept for each key
+    made = 0
+    hits = 0
+
+    def __init__(self, reads, effects, value):
+        self.reads = reads
+        self.effects = effects
+        self.value = value
+
+    @staticmethod
+    def reset():
+        """ Forgets the summaries and counts of an earlier run """
+        Summary.table = {}
+        Summary.made = 0
+        Summary.hits = 0
+
+    @staticmethod
+    def key(func_def, args):
+        """ Key of a call to func_def, None if the arguments can not be
+            hashed """
+        key = (func_def, tuple(args))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def find(key, memory):
+        """ Summary for key of a call that read the blocks in memory """
+        for summary in Summary.table.get(key, ()):
+            if all(block is FRESH or same_block(memory.get(block_id), block)
+                   for block_id, block in summary.reads.items()):
+                Summary.hits += 1
+                return summary
+        return None
+
+    @staticmethod
+    def add(recording, memory, value):
+        """ Summarizes a recording that returned value with memory """
+        effects = {}
+        for block_id, block in recording.reads.items():
+            if block is None or block is FRESH:
+                continue #made by the call, only the call could reach it
+            current = memory.get(block_id)
+            if current is None:
+                return
+            if current is not block:
+                effects[block_id] = current
+        summaries = Summary.table.get(recording.key)
+        if summaries is None:
+            summaries = Summary.table[recording.key] = \
+                deque(maxlen=Summary.LIMIT)
+        summaries.append(Summary(recording.reads, effects, value))
+        Summary.made += 1
+
+    @staticmethod
+    def report(enabled):
+        """ Summaries made and used, None if they are not """
+        if not enabled:
+            return None
+        return {'made': Summary.made, 'hits': Summary.hits}
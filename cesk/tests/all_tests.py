@@ -11,7 +11,18 @@ SUITE = unittest.TestLoader().loadTestsFromNames(
         'continuation_edge_cases',
         'transform_checks',
         'difficult_pointer',
-        'memory_access_tests'
+        'memory_access_tests',
+        'persistent_store',
+        'ticks',
+        'schedulers',
+        'parallel_exploration',
+        'tracing',
+        'graph_export',
+        'memory_blocks',
+        'interval_values',
+        'budgets',
+        'checkpoints',
+        'profiling'
     ]
 )
 TESTRESULT = unittest.TextTestRunner(verbosity=1).run(SUITE)
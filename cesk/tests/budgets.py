@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with budgets, a budget the run stays
+   within changes nothing and a spent one leaves memory safety unknown"""
+
+import json
+from os import listdir, path
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+class Budgets(CESKvsGCC):
+    """Tests the state, time and memory budgets"""
+    def test_large_budget(self):
+        """Tests basic functionality with budgets that are not spent"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--max_states", "1000000",
+                              "--max_seconds", "600", "--max_rss", "100000",
+                              strict=True)
+
+    def test_spent_budget(self):
+        """Tests that a run out of states stops with a frontier"""
+        folder = "./fixtures/basic_functionality"
+        for file_name in sorted(f for f in listdir(folder)
+                                if f.endswith('.c')):
+            results = json.loads(run_c_cesk(path.join(folder, file_name),
+                                            '--max_states', '5'))
+            budget = results.get('budget', {})
+            self.assertEqual('unknown', results['memory_safe'], file_name)
+            self.assertEqual(5, results['states_evaluated'], file_name)
+            self.assertEqual('states', budget.get('exhausted'), file_name)
+            self.assertTrue(budget.get('frontier'), file_name)
+            print_pass(file_name)
+
+if __name__ == "__main__":
+    TEST = Budgets()
+    TEST.test_large_budget()
+    TEST.test_spent_budget()
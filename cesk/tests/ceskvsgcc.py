@@ -31,23 +31,24 @@ class CESKvsGCC(TestCase):
     Unit test class for testing if a c program
     gives the same output under gcc and under our CESK interpreter.
     """
-    def assert_same_output(self, file_path): #pylint: disable=no-self-use
+    def assert_same_output(self, file_path, *options): #pylint: disable=no-self-use
         """asserts that a c file will have the same output under gcc and under
-        our cesk interpreter"""
+        our cesk interpreter, returns True if it does"""
         gcc_out = run_c(file_path)
         try:
-            cesk_out = run_c_cesk(file_path)
+            cesk_out = run_c_cesk(file_path, *options)
             results = json.loads(cesk_out)
             cesk_out = results['output'].encode()
             if gcc_out == cesk_out:
                 print_pass(path.basename(file_path))
-            else:
-                message = "Expected (gcc): \n" + str(gcc_out) +\
-                          "\nActual (cesk): \n" + str(cesk_out)
+                return True
+            message = "Expected (gcc): \n" + str(gcc_out) +\
+                      "\nActual (cesk): \n" + str(cesk_out)
 
-                print_fail(path.basename(file_path), message)
+            print_fail(path.basename(file_path), message)
         except Exception: #pylint: disable=broad-except
             print_fail(path.basename(file_path) + ' see ^^^^^', '')
+        return False
 
     def assert_memory_access(self, file_path, is_safe):
         """ Pass in a file and whether or not it is memory safe
@@ -69,19 +70,22 @@ class CESKvsGCC(TestCase):
         for file in files:
             self.assert_memory_access(file, is_safe)
 
-    def assert_all_equal(self, folder):
+    def assert_all_equal(self, folder, *options, strict=False):
         """asserts that an entire folder full of c files will have the same
-        output under gcc and under our cesk interpreter"""
+        output under gcc and under our cesk interpreter. With strict the test
+        fails if any file differs"""
         files = sorted([path.join(folder, f) for f in listdir(folder)
                         if f.endswith('.c')])
-        for file in files:
-            self.assert_same_output(file)
+        failed = [path.basename(file) for file in files
+                  if not self.assert_same_output(file, *options)]
+        if strict:
+            self.assertEqual([], failed)
 
-def run_c_cesk(file_path):
+def run_c_cesk(file_path, *options):
     """runs a c source file using the cesk tool, returns stdout as a byte
-    string."""
+    string. Extra command line options are passed on to cesk_main"""
     stdout = subprocess.check_output(['python3', '../../cesk_main.py',
-                                      '-c', 'CONCRETE', file_path])
+                                      '-c', 'CONCRETE', *options, file_path])
     return stdout.decode("utf-8")
 
 def run_c(file_path):
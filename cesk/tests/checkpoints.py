@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""Stops each basic functionality test part way with a checkpoint and
+   resumes it, the resumed run must end as a run that was never stopped"""
+
+import json
+import tempfile
+from os import listdir, path, remove
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+def explored(results):
+    """ The fields of a result that do not depend on timing """
+    return {key: value for key, value in results.items()
+            if not key.endswith('_time')}
+
+class Checkpoints(CESKvsGCC):
+    """Tests checkpoints and resuming from them"""
+    def test_resume(self):
+        """Tests that a resumed run matches an uninterrupted one"""
+        folder = "./fixtures/basic_functionality"
+        checkpoint = path.join(tempfile.gettempdir(), "censor_checkpoint")
+        for file_name in sorted(f for f in listdir(folder)
+                                if f.endswith('.c')):
+            file_path = path.join(folder, file_name)
+            if path.exists(checkpoint):
+                remove(checkpoint)
+            expected = json.loads(run_c_cesk(file_path))
+            run_c_cesk(file_path, '--max_states', '20',
+                       '--checkpoint', checkpoint)
+            results = json.loads(run_c_cesk(file_path, '--checkpoint',
+                                            checkpoint, '--resume'))
+            self.assertEqual(explored(expected), explored(results),
+                             file_name)
+            print_pass(file_name)
+
+if __name__ == "__main__":
+    TEST = Checkpoints()
+    TEST.test_resume()
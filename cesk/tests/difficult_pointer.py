@@ -2,7 +2,11 @@
 """Tests basic functionality of arithmatic, functions, and linked lists,
 using only ints and pointers, not worrying about corner cases."""
 
-from ceskvsgcc import CESKvsGCC
+import json
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+ROUND_TRIPS = ["./fixtures/difficult_pointer/04_pointer_to_long.c",
+               "./fixtures/difficult_pointer/13_long_round_trip.c"]
 
 class DifficultPointer(CESKvsGCC):
     """Tests basic functionality"""
@@ -10,6 +14,15 @@ class DifficultPointer(CESKvsGCC):
         """Tests basic functionality"""
         self.assert_all_equal("./fixtures/difficult_pointer")
 
+    def test_abstract_round_trip(self):
+        """A pointer cast to an abstract integer and back could point
+        anywhere, the run finishes and reports it as unsafe"""
+        for file_path in ROUND_TRIPS:
+            results = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT'))
+            self.assertFalse(results['memory_safe'])
+            print_pass(file_path.split('/')[-1] + ' (ABSTRACT)')
+
 if __name__ == "__main__":
     TEST = DifficultPointer()
     TEST.test_pointers()
+    TEST.test_abstract_round_trip()
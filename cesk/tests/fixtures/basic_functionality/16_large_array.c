@@ -0,0 +1,29 @@
+#include <stdio.h>
+#include <stdlib.h>
+
+struct point {
+    int x;
+    long y;
+};
+
+int main() {
+    int a[100000];
+    struct point points[20000];
+    int *heap = malloc(sizeof(int) * 100000);
+    int sum = 0;
+    int i;
+
+    for (i = 0; i < 10; i++) {
+        a[i * 9999] = i;
+        heap[99999 - i] = i * 2;
+        points[i * 1999].x = i;
+        points[i * 1999].y = i * 3;
+    }
+    for (i = 0; i < 10; i++) {
+        sum = sum + a[i * 9999] + heap[99999 - i];
+        sum = sum + points[i * 1999].x + points[i * 1999].y;
+    }
+    printf("%d\n", sum);
+    free(heap);
+    return 0;
+}
@@ -0,0 +1,35 @@
+#include <stdio.h>
+
+int counter = 0;
+int table[4];
+
+int square(int x) {
+    int result = x * x;
+    return result;
+}
+
+void bump(int amount) {
+    counter = counter + amount;
+}
+
+int lookup(int index) {
+    int value = table[index];
+    return value + square(index);
+}
+
+int main() {
+    int total = 0;
+    int i;
+    for (i = 0; i < 4; i++) {
+        table[i] = i * 3;
+    }
+    for (i = 0; i < 12; i++) {
+        total += square(i % 3);
+        total += lookup(i % 4);
+        bump(2);
+    }
+    table[1] = 100;
+    total += lookup(1);
+    printf("%d %d\n", total, counter);
+    return 0;
+}
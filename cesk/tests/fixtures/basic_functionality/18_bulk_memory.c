@@ -0,0 +1,52 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+struct pair {
+    int key;
+    char tag;
+    long value;
+};
+
+int main() {
+    char source[32];
+    char target[32];
+    int numbers[8];
+    int copies[8];
+    struct pair first;
+    struct pair second;
+    int *zeros;
+    int i;
+    int total = 0;
+
+    strcpy(source, "bulk memory");
+    printf("%d\n", (int) strlen(source));
+    memcpy(target, source, strlen(source) + 1);
+    printf("%d\n", (int) strlen(target));
+    for (i = 0; i < 8; i++) {
+        numbers[i] = i * i;
+    }
+    memcpy(copies, numbers, sizeof(numbers));
+    memmove(numbers + 1, numbers, 4 * sizeof(int));
+    for (i = 0; i < 8; i++) {
+        total += copies[i] * 10 + numbers[i];
+    }
+    printf("%d\n", total);
+    memset(target, 'x', 4);
+    printf("%c %c %d\n", target[0], target[3], (int) strlen(target));
+    memset(copies, 0, sizeof(copies));
+    printf("%d %d\n", copies[0], copies[7]);
+    first.key = 7;
+    first.tag = 'k';
+    first.value = 123456;
+    memcpy(&second, &first, sizeof(struct pair));
+    printf("%d %c %ld\n", second.key, second.tag, second.value);
+    zeros = (int *) calloc(6, sizeof(int));
+    total = 0;
+    for (i = 0; i < 6; i++) {
+        total += zeros[i] + 1;
+    }
+    printf("%d\n", total);
+    free(zeros);
+    return 0;
+}
@@ -0,0 +1,14 @@
+#include <stdio.h>
+
+int scale(int x) {
+    int y = x * 3;
+    return y + 1;
+}
+
+int main() {
+    int a = scale(4);
+    int b = scale(4);
+    int c = scale(4);
+    printf("%d %d %d\n", a, b, c);
+    return 0;
+}
@@ -0,0 +1,21 @@
+#include <stdio.h>
+#include <stdlib.h>
+
+int main(){
+    int a[4];
+    int i;
+    for (i = 0; i < 4; i++) {
+        a[i] = i * 10;
+    }
+    long base = (long) a;
+    int *q = (int *) (base + 2 * sizeof(int));
+    printf("%d\n", *q);
+
+    int *heap = malloc(3 * sizeof(int));
+    heap[1] = 7;
+    long middle = (long) &heap[1];
+    int *r = (int *) middle;
+    printf("%d\n", *r);
+    free(heap);
+    return 0;
+}
@@ -0,0 +1,12 @@
+#include <stdio.h>
+
+int main() {
+    int a[10];
+    int i;
+    for (i = 0; i < 10; i++) {
+        a[i] = i;
+    }
+    a[10] = i;
+    printf("%d\n", a[0]);
+    return 0;
+}
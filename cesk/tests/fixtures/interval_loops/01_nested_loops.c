@@ -0,0 +1,17 @@
+#include <stdio.h>
+
+int main() {
+    int a[40];
+    int i, j;
+    long total = 0;
+    for (i = 0; i < 30; i++) {
+        for (j = 0; j < 40; j++) {
+            a[j] = i + j;
+        }
+    }
+    for (j = 0; j < 40; j++) {
+        total = total + a[j];
+    }
+    printf("%ld\n", total);
+    return 0;
+}
@@ -0,0 +1,14 @@
+#include <stdio.h>
+int main() {
+    int x = 0;
+    int i;
+    int *p = 0;
+    for (i = 0; i < 1000; i++) {
+        x = 5;
+    }
+    if (x > 10) {
+        *p = 1;
+    }
+    printf("%d\n", x);
+    return 0;
+}
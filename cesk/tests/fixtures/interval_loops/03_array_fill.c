@@ -0,0 +1,16 @@
+#include <stdio.h>
+
+int main() {
+    int a[64];
+    int i;
+    int sum = 0;
+    for (i = 0; i < 64; i++) {
+        a[i] = i % 8;
+    }
+    for (i = 0; i < 64; i++) {
+        sum = sum + a[i];
+    }
+    printf("%d\n", a[5]);
+    printf("%d\n", sum);
+    return 0;
+}
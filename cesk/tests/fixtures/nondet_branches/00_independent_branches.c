@@ -0,0 +1,30 @@
+#include <stdio.h>
+
+extern int __VERIFIER_nondet_int(void);
+
+int main() {
+    int flags = 0;
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 1;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 2;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 4;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 8;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 16;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 32;
+    }
+    if (__VERIFIER_nondet_int() > 0) {
+        flags = flags + 64;
+    }
+    printf("%d\n", flags);
+    return 0;
+}
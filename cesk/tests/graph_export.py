@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests while streaming the state graph, then
+   reads the graphs back"""
+import json
+import re
+import tempfile
+from os import path, listdir
+
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+FOLDER = "./fixtures/basic_functionality"
+
+def read_jsonl(graph_file):
+    """ The node ids and edges of a json lines graph, in the order written """
+    nodes = []
+    edges = []
+    with open(graph_file, encoding='utf-8') as lines:
+        for line in lines:
+            record = json.loads(line)
+            if 'node' in record:
+                nodes.append(record['node'])
+            else:
+                edges.append((len(nodes), record['edge']))
+    return nodes, edges
+
+class GraphExport(CESKvsGCC):
+    """Tests that writing the state graph does not change output and that
+    the graph holds the states explored"""
+    def test_dot(self):
+        """Tests basic functionality writing a dot graph"""
+        graph_file = path.join(tempfile.gettempdir(), "censor_graph.dot")
+        self.assert_all_equal(FOLDER,
+                              "--graph", graph_file, "--graph_format", "dot",
+                              strict=True)
+
+    def test_jsonl(self):
+        """Tests basic functionality writing a json lines graph"""
+        graph_file = path.join(tempfile.gettempdir(), "censor_graph.jsonl")
+        self.assert_all_equal(FOLDER,
+                              "--graph", graph_file, "--graph_format", "jsonl",
+                              strict=True)
+
+    def test_graph_contents(self):
+        """Tests that every successor generated is an edge to a node written
+        before it, a state found again keeps its node, and that the dot
+        graph has the nodes of the json lines graph"""
+        dot_file = path.join(tempfile.gettempdir(), "censor_graph.dot")
+        jsonl_file = path.join(tempfile.gettempdir(), "censor_graph.jsonl")
+        for file_name in sorted(f for f in listdir(FOLDER)
+                                if f.endswith('.c')):
+            file_path = path.join(FOLDER, file_name)
+            results = json.loads(run_c_cesk(file_path, "--graph", jsonl_file,
+                                            "--graph_format", "jsonl"))
+            nodes, edges = read_jsonl(jsonl_file)
+            self.assertEqual(len(set(nodes)), len(nodes), file_name)
+            self.assertLessEqual(len(nodes), results['states_generated'],
+                                 file_name)
+            self.assertEqual(results['states_generated'] - 1, len(edges),
+                             file_name)
+            for written, edge in edges:
+                self.assertTrue(set(edge) <= set(nodes[:written]), file_name)
+
+            run_c_cesk(file_path, "--graph", dot_file, "--graph_format", "dot")
+            with open(dot_file, encoding='utf-8') as dot:
+                lines = dot.read().splitlines()
+            self.assertTrue(lines[0].startswith('strict digraph'), file_name)
+            self.assertEqual('}', lines[-1], file_name)
+            dot_nodes = [line for line in lines
+                         if re.match(r'  \d+ \[label=', line)]
+            self.assertEqual(len(nodes), len(dot_nodes), file_name)
+            print_pass(file_name + " (graph contents)")
+
+if __name__ == "__main__":
+    TEST = GraphExport()
+    TEST.test_dot()
+    TEST.test_jsonl()
+    TEST.test_graph_contents()
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Runs the interval loop tests with interval integers, a range of one value
+   acts like a concrete integer, and checks that the abstract interval
+   configuration finds the loops memory safe"""
+
+import json
+from os import listdir, path
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+class IntervalValues(CESKvsGCC):
+    """Tests interval integers"""
+    def test_interval_values(self):
+        """Tests the loops with concrete interval integers"""
+        self.assert_all_equal("./fixtures/interval_loops",
+                              "--values", "interval", strict=True)
+
+    def test_widened_loops(self):
+        """Tests that widened loops end and are memory safe"""
+        folder = "./fixtures/interval_loops"
+        for file_name in sorted(f for f in listdir(folder)
+                                if f.endswith('.c')):
+            results = json.loads(run_c_cesk(path.join(folder, file_name),
+                                            '-c', 'INTERVAL'))
+            self.assertIs(results['memory_safe'], True, file_name)
+            print_pass(file_name)
+
+    def test_narrowed_output(self):
+        """Tests that only the narrowing pass prints, the first pass
+        printed the widened value of x"""
+        results = json.loads(run_c_cesk(
+            "./fixtures/interval_loops/02_narrowed_guard.c", '-c', 'INTERVAL'))
+        self.assertIs(results['memory_safe'], True)
+        self.assertEqual("{0}\n{[0, 5]}\n", results['output'])
+        print_pass("02_narrowed_guard.c (narrowed output)")
+
+    def test_narrowing_budget(self):
+        """Tests that a budget spent by the narrowing pass keeps the error
+        the first pass found, the run then reports the first pass"""
+        file_name = "./fixtures/faulting_memory_access/05_write_past_loop.c"
+        total = json.loads(run_c_cesk(file_name, '-c', 'INTERVAL'))
+        self.assertIs(total['memory_safe'], False)
+        first = None
+        for max_states in range(20, total['states_evaluated'], 10):
+            results = json.loads(run_c_cesk(file_name, '-c', 'INTERVAL',
+                                            '--max_states', str(max_states)))
+            if first is not None or results['states_evaluated'] < max_states:
+                self.assertIs(results['memory_safe'], False, max_states)
+                self.assertNotIn('budget', results, max_states)
+                first = results['states_evaluated']
+        self.assertIsNotNone(first)
+        print_pass("05_write_past_loop.c (narrowing budget)")
+
+if __name__ == "__main__":
+    TEST = IntervalValues()
+    TEST.test_interval_values()
+    TEST.test_widened_loops()
+    TEST.test_narrowed_output()
+    TEST.test_narrowing_budget()
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with every slot of a block made
+   up front, the default keeps large blocks lazy, and checks that each way
+   of keeping blocks finds an array loop memory safe under the abstract
+   configurations"""
+
+import json
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+ARRAY_LOOP = "./fixtures/interval_loops/03_array_fill.c"
+
+class MemoryBlocks(CESKvsGCC):
+    """Tests that lazy blocks do not change output"""
+    def test_eager_blocks(self):
+        """Tests basic functionality with eager blocks"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--blocks", "eager", strict=True)
+
+    def test_abstract_blocks(self):
+        """Tests that the array loop is memory safe with eager, lazy and
+        smashed blocks under ABSTRACT and INTERVAL"""
+        for configuration in ['ABSTRACT', 'INTERVAL']:
+            for blocks in ['eager', 'lazy', 'smashed']:
+                results = json.loads(run_c_cesk(ARRAY_LOOP,
+                                                '-c', configuration,
+                                                '--blocks', blocks))
+                self.assertIs(results['memory_safe'], True,
+                              configuration + ' ' + blocks)
+                print_pass("03_array_fill.c (%s --blocks %s)" %
+                           (configuration, blocks))
+
+if __name__ == "__main__":
+    TEST = MemoryBlocks()
+    TEST.test_eager_blocks()
+    TEST.test_abstract_blocks()
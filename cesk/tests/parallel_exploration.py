@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with several worker processes and
+   checks that rounds the workers evaluate give the counters of the serial
+   run"""
+
+import json
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+COUNTERS = ['memory_safe', 'states_generated', 'states_matched',
+            'states_evaluated', 'collapses']
+
+class ParallelExploration(CESKvsGCC):
+    """Tests parallel exploration"""
+    def test_parallel_exploration(self):
+        """Tests basic functionality with two jobs"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--jobs", "2", strict=True)
+
+    def test_worker_rounds(self):
+        """Tests that rounds wide enough for the workers give the counters
+        of the serial run with the same store and tick. Every branch on an
+        unknown value doubles the states of a round"""
+        file_path = "./fixtures/nondet_branches/00_independent_branches.c"
+        serial = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                       '--store', 'persistent'))
+        parallel = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                         '--jobs', '2'))
+        self.assertGreater(parallel['parallel']['worker_rounds'], 0)
+        for counter in COUNTERS:
+            self.assertEqual(serial[counter], parallel[counter], counter)
+        print_pass("00_independent_branches.c (ABSTRACT --jobs 2)")
+
+if __name__ == "__main__":
+    TEST = ParallelExploration()
+    TEST.test_parallel_exploration()
+    TEST.test_worker_rounds()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with a persistent store per state,
+   with and without garbage collection and function summaries, and checks
+   that collecting and summarizing save states under ABSTRACT"""
+
+import json
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+class PersistentStore(CESKvsGCC):
+    """Tests the persistent store"""
+    def test_persistent_store(self):
+        """Tests basic functionality with a persistent store"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--store", "persistent", strict=True)
+
+    def test_garbage_collection(self):
+        """Tests basic functionality with the garbage collected"""
+        self.assert_all_equal("./fixtures/basic_functionality", "--gc",
+                              strict=True)
+
+    def test_function_summaries(self):
+        """Tests basic functionality with calls summarized"""
+        self.assert_all_equal("./fixtures/basic_functionality", "--summaries",
+                              strict=True)
+
+    def test_abstract_garbage_collection(self):
+        """Tests that frames left by returned calls are collected, so more
+        states match and fewer are evaluated"""
+        file_path = "./fixtures/basic_functionality/05_recursive_factorial.c"
+        kept = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                     '--store', 'persistent'))
+        collected = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                          '--gc'))
+        self.assertEqual(kept['memory_safe'], collected['memory_safe'])
+        self.assertGreater(collected['gc']['collections'], 0)
+        self.assertGreater(collected['states_matched'],
+                           kept['states_matched'])
+        self.assertLess(collected['states_evaluated'],
+                        kept['states_evaluated'])
+        print_pass("05_recursive_factorial.c (ABSTRACT --gc)")
+
+    def test_abstract_function_summaries(self):
+        """Tests that calls with the same arguments reuse a summary and
+        evaluate fewer states"""
+        file_path = "./fixtures/basic_functionality/19_same_calls.c"
+        whole = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                      '--store', 'persistent'))
+        summarized = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                           '--summaries'))
+        self.assertEqual(whole['memory_safe'], summarized['memory_safe'])
+        self.assertEqual(whole['output'], summarized['output'])
+        self.assertGreater(summarized['summaries']['hits'], 0)
+        self.assertLess(summarized['states_evaluated'],
+                        whole['states_evaluated'])
+        print_pass("19_same_calls.c (ABSTRACT --summaries)")
+
+if __name__ == "__main__":
+    TEST = PersistentStore()
+    TEST.test_persistent_store()
+    TEST.test_garbage_collection()
+    TEST.test_function_summaries()
+    TEST.test_abstract_garbage_collection()
+    TEST.test_abstract_function_summaries()
@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with the profiler on, it must not
+   change the output and must rank the program points it timed"""
+
+import json
+from os import listdir, path
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+class Profiling(CESKvsGCC):
+    """Tests the profiler"""
+    def test_profile_output(self):
+        """Tests basic functionality with the profiler on"""
+        self.assert_all_equal("./fixtures/basic_functionality", "--profile",
+                              strict=True)
+
+    def test_profile_table(self):
+        """Tests that every state is timed at its program point"""
+        folder = "./fixtures/basic_functionality"
+        for file_name in sorted(f for f in listdir(folder)
+                                if f.endswith('.c')):
+            results = json.loads(run_c_cesk(path.join(folder, file_name),
+                                            '--profile'))
+            points = results['profile']['points']
+            seconds = [point['seconds'] for point in points]
+            self.assertTrue(points, file_name)
+            self.assertEqual(sorted(seconds, reverse=True), seconds,
+                             file_name)
+            self.assertTrue(results['profile']['handlers'], file_name)
+            self.assertLessEqual(sum(point['calls'] for point in points),
+                                 results['states_evaluated'], file_name)
+            print_pass(file_name)
+
+if __name__ == "__main__":
+    TEST = Profiling()
+    TEST.test_profile_output()
+    TEST.test_profile_table()
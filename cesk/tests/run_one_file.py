@@ -35,10 +35,11 @@ class OneFileTest(CESKvsGCC):
             print(run_c(*args.file_name))
         elif args.cesk_only:
             print('Only running cesk_c')
+            trace = ['--trace', 'all'] if args.debug else []
             print(subprocess.run(['python3', '../../cesk_main.py',
-                                  *args.file_name]))
+                                  *trace, *args.file_name]))
             if args.debug:
-                print("* * * * * * * Debug Statements * * * * * * *")
+                print("* * * * * * * Logged Errors * * * * * * *")
                 subprocess.run(['cat', 'logfile.txt'])
         else:
             self.assert_same_output(*args.file_name)
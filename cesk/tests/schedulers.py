@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with each worklist order, and compares
+   the orders on branches that join"""
+
+import json
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+BRANCHES = "./fixtures/nondet_branches/00_independent_branches.c"
+
+class Schedulers(CESKvsGCC):
+    """Tests that the order states are evaluated in does not change output"""
+    def test_lifo(self):
+        """Tests depth first evaluation"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--scheduler", "lifo", strict=True)
+
+    def test_rpo(self):
+        """Tests evaluating in reverse postorder of the control flow graph"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--scheduler", "rpo", strict=True)
+
+    def test_loop_depth(self):
+        """Tests evaluating the innermost loop first"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--scheduler", "loop_depth",
+                              strict=True)
+
+    def test_fewer_states(self):
+        """Tests that the ordered schedulers join the branches before going
+        on, evaluating fewer states than fifo with the same memory safety"""
+        fifo = json.loads(run_c_cesk(BRANCHES, '-c', 'ABSTRACT',
+                                     '--scheduler', 'fifo'))
+        for scheduler in ('rpo', 'loop_depth'):
+            ordered = json.loads(run_c_cesk(BRANCHES, '-c', 'ABSTRACT',
+                                            '--scheduler', scheduler))
+            self.assertEqual(fifo['memory_safe'], ordered['memory_safe'])
+            self.assertLess(ordered['states_evaluated'],
+                            fifo['states_evaluated'])
+            print_pass(BRANCHES.split('/')[-1] + ' (' + scheduler + ')')
+
+if __name__ == "__main__":
+    TEST = Schedulers()
+    TEST.test_lifo()
+    TEST.test_rpo()
+    TEST.test_loop_depth()
+    TEST.test_fewer_states()
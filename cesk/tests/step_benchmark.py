@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""Measures how many states per second the interpreter evaluates on each
+   fixture. Every run goes through cesk_main.py in a fresh process, so the
+   counters, summaries and widening are set up as they are for a real run,
+   and the interpretation time it reports is used. Each file is run with the
+   handlers found in the dispatch table and by name, to compare them.
+   Usage python step_benchmark.py [folder] [--repeat N] [-c CONFIG]"""
+import argparse
+import json
+import subprocess
+import sys
+from os import path, listdir
+
+CESK_MAIN = path.join(path.dirname(path.abspath(__file__)),
+                      '..', '..', 'cesk_main.py')
+
+DISPATCHES = ('name', 'table') #see --dispatch of cesk_main.py
+
+def run_once(file_path, configuration, dispatch):
+    """ Interprets one file, returns the number of states evaluated and the
+        seconds spent interpreting """
+    result = json.loads(subprocess.check_output(
+        [sys.executable, CESK_MAIN, '-c', configuration,
+         '--dispatch', dispatch, file_path],
+        stderr=subprocess.DEVNULL).decode().splitlines()[-1])
+    return result['states_evaluated'], result['interpretation_time']
+
+def measure(file_path, configuration, dispatch, repeat):
+    """ States per second over repeat runs, 0 if the runs were too short to
+        be timed """
+    total_states = 0
+    total_seconds = 0
+    for _ in range(repeat):
+        states, seconds = run_once(file_path, configuration, dispatch)
+        total_states += states
+        total_seconds += seconds
+    try:
+        return states, total_states / total_seconds
+    except ZeroDivisionError:
+        return states, 0
+
+def main():
+    """ Prints a table of states per second for every fixture with each
+        dispatch """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('folder', nargs='?',
+                        default='fixtures/basic_functionality')
+    parser.add_argument('--repeat', '-r', type=int, default=5)
+    parser.add_argument('--configuration', '-c', default='CONCRETE')
+    args = parser.parse_args()
+
+    if path.isdir(args.folder):
+        files = sorted([path.join(args.folder, f)
+                        for f in listdir(args.folder) if f.endswith('.c')])
+    else:
+        files = [args.folder]
+    print("%-32s %7s" % ('file', 'states') +
+          "".join(" %10s" % (d + '/s') for d in DISPATCHES))
+    totals = {dispatch: 0 for dispatch in DISPATCHES}
+    for file_path in files:
+        rates = []
+        try:
+            for dispatch in DISPATCHES:
+                states, rate = measure(file_path, args.configuration,
+                                       dispatch, args.repeat)
+                rates.append(rate)
+        except (subprocess.CalledProcessError, ValueError, KeyError):
+            print("%-32s failed" % path.basename(file_path))
+            continue
+        if 0 in rates:
+            print("%-32s %7d too fast to time" % (path.basename(file_path),
+                                                   states))
+            continue
+        for dispatch, rate in zip(DISPATCHES, rates):
+            totals[dispatch] += states / rate
+        print("%-32s %7d" % (path.basename(file_path), states) +
+              "".join(" %10.0f" % rate for rate in rates))
+    for dispatch in DISPATCHES:
+        if totals[dispatch]:
+            print("seconds per pass over the states by %s: %.4f"
+                  % (dispatch, totals[dispatch]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""Compares the ticks on loops, requeueing states by the addresses they read
+   evaluates fewer states than stamping them with the time of the store"""
+
+import json
+import subprocess
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+LOOPS = ["./fixtures/basic_functionality/02_loop_sum.c",
+         "./fixtures/interval_loops/00_long_loop.c"]
+
+class Ticks(CESKvsGCC):
+    """Tests the dependency tick"""
+    def test_dependency_tick(self):
+        """Tests that the dependency tick evaluates fewer states on loops
+        and finds the same memory safety"""
+        for file_path in LOOPS:
+            stamped = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                            '--tick', 'abstract'))
+            requeued = json.loads(run_c_cesk(file_path, '-c', 'ABSTRACT',
+                                             '--tick', 'dependency'))
+            self.assertEqual(stamped['memory_safe'], requeued['memory_safe'])
+            self.assertLess(requeued['states_evaluated'],
+                            stamped['states_evaluated'])
+            print_pass(file_path.split('/')[-1] + ' (dependency tick)')
+
+    def test_dependency_tick_store(self):
+        """Tests that the dependency tick is refused with the persistent
+        store, which it would not track"""
+        with self.assertRaises(subprocess.CalledProcessError):
+            run_c_cesk(LOOPS[0], '-c', 'ABSTRACT', '--tick', 'dependency',
+                       '--store', 'persistent')
+        print_pass('--tick dependency --store persistent')
+
+if __name__ == "__main__":
+    TEST = Ticks()
+    TEST.test_dependency_tick()
+    TEST.test_dependency_tick_store()
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Runs the basic functionality tests with every trace category enabled,
+   then reads the trace file back"""
+import os
+import sys
+import tempfile
+from os import path
+
+from ceskvsgcc import CESKvsGCC, run_c_cesk, print_pass
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', '..'))
+from cesk.trace import CATEGORIES, read_trace_file #pylint: disable=wrong-import-position
+
+TRACE_FILE = path.join(tempfile.gettempdir(), "censor_trace")
+FIXTURE = "./fixtures/basic_functionality/09_basic_arrays.c"
+
+class Tracing(CESKvsGCC):
+    """Tests that tracing does not change output and records every
+    category enabled"""
+    def test_trace_all(self):
+        """Tests basic functionality writing every category to a file"""
+        self.assert_all_equal("./fixtures/basic_functionality",
+                              "--trace", "all", "--trace_file", TRACE_FILE,
+                              strict=True)
+
+    def test_trace_records(self):
+        """Tests that the file has records of each category enabled and
+        none of the others"""
+        for enabled in (CATEGORIES, ('store', 'values')):
+            run_c_cesk(FIXTURE, "--trace", ",".join(enabled),
+                       "--trace_file", TRACE_FILE)
+            found = {category for category, _ in read_trace_file(TRACE_FILE)}
+            self.assertEqual(set(enabled), found)
+        print_pass("09_basic_arrays.c (trace records)")
+
+    def test_trace_off(self):
+        """Tests that no trace file is written without --trace"""
+        if path.exists(TRACE_FILE):
+            os.remove(TRACE_FILE)
+        run_c_cesk(FIXTURE, "--trace_file", TRACE_FILE)
+        self.assertFalse(path.exists(TRACE_FILE))
+        print_pass("09_basic_arrays.c (trace off)")
+
+if __name__ == "__main__":
+    TEST = Tracing()
+    TEST.test_trace_all()
+    TEST.test_trace_records()
+    TEST.test_trace_off()
@@ -0,0 +1,138 @@
+""" Structured tracing of the CESK machine. Every category is off unless it
+    is enabled, traced code checks the flag of its category before it
+    builds a message so a disabled category costs one attribute lookup
+
+    if trace.STORE:
+        trace.emit('store', "Write %s to %s", value, address)
+"""
+import sys
+import struct
+from collections import deque
+
+CATEGORIES = ('store', 'control', 'values', 'transforms')
+DEFAULT_RING_SIZE = 10000
+
+#switches read by the traced code, one per category
+STORE = False
+CONTROL = False
+VALUES = False
+TRANSFORMS = False
+
+_SINK = None
+
+class RingBuffer:
+    """ Keeps the last size records in memory """
+
+    def __init__(self, size=DEFAULT_RING_SIZE):
+        self.records = deque(maxlen=size)
+
+    def write(self, category, message):
+        """ Adds a record, dropping the oldest one if the buffer is full """
+        self.records.append((category, message))
+
+    def flush(self):
+        """ Nothing is buffered outside of memory """
+
+    def close(self):
+        """ The records stay available to dump """
+
+    def dump(self, out):
+        """ Writes the records as text, oldest first """
+        for category, message in self.records:
+            out.write("%s: %s\n" % (category, message))
+
+class TraceFile:
+    """ Appends records to a binary file. A record is the index of its
+        category in CATEGORIES and the length of the message, followed by
+        the message as utf-8 """
+    HEADER = struct.Struct('<BI')
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+
+    def write(self, category, message):
+        """ Appends a record """
+        data = message.encode('utf-8', 'replace')
+        self.file.write(TraceFile.HEADER.pack(CATEGORIES.index(category),
+                                              len(data)))
+        self.file.write(data)
+
+    def flush(self):
+        """ Writes buffered records to the file """
+        self.file.flush()
+
+    def close(self):
+        """ Closes the file """
+        self.file.close()
+
+    def dump(self, out): #pylint: disable=unused-argument
+        """ The records are already in the file """
+
+def read_trace_file(path):
+    """ Yields the (category, message) records of a trace file """
+    header = TraceFile.HEADER
+    with open(path, 'rb') as trace_file:
+        while True:
+            data = trace_file.read(header.size)
+            if len(data) < header.size:
+                return
+            category, length = header.unpack(data)
+            yield CATEGORIES[category], \
+                  trace_file.read(length).decode('utf-8', 'replace')
+
+def parse_categories(text):
+    """ Turns a comma separated list of categories, or 'all', into a list
+        of categories. Raises ValueError for unknown names """
+    if text == 'all':
+        return list(CATEGORIES)
+    categories = [name.strip() for name in text.split(',') if name.strip()]
+    for name in categories:
+        if name not in CATEGORIES:
+            raise ValueError("Unknown trace category " + name +
+                             ", expected one of " + ", ".join(CATEGORIES))
+    return categories
+
+def enable(categories, sink=None):
+    """ Turns on the given categories, records go to sink which defaults
+        to a ring buffer """
+    global _SINK #pylint: disable=global-statement
+    _SINK = sink if sink is not None else RingBuffer()
+    for name in categories:
+        globals()[name.upper()] = True
+
+def disable():
+    """ Turns every category off and closes the sink """
+    global _SINK #pylint: disable=global-statement
+    for name in CATEGORIES:
+        globals()[name.upper()] = False
+    if _SINK is not None:
+        _SINK.close()
+    _SINK = None
+
+def detach():
+    """ Turns tracing off in a forked process without touching the sink
+        the parent process is still writing to """
+    global _SINK #pylint: disable=global-statement
+    for name in CATEGORIES:
+        globals()[name.upper()] = False
+    _SINK = None
+
+def emit(category, message, *args):
+    """ Records a message, formatted with args like a logging call """
+    if args:
+        message = message % args
+    _SINK.write(category, message)
+
+def flush():
+    """ Writes out anything the sink is holding, call before forking """
+    if _SINK is not None:
+        _SINK.flush()
+
+def dump(out=None):
+    """ Writes the records held in memory to out, stderr by default """
+    if _SINK is not None:
+        _SINK.dump(out if out is not None else sys.stderr)
+
+if __name__ == "__main__":
+    for CATEGORY, MESSAGE in read_trace_file(sys.argv[1]):
+        print("%s: %s" % (CATEGORY, MESSAGE))
@@ -2,10 +2,11 @@
 a value based on an assignment node"""
 import logging
 import pycparser.c_ast as AST
-from cesk.linksearch import get_sizes
+from cesk.linksearch import get_layout
 import cesk.config
 from cesk.values import base_values as BV
 import cesk.limits as limits
+import cesk.trace as trace
 from cesk.exceptions import CESKException
 from .factory import Factory
 
@@ -69,7 +70,6 @@ def generate_constant_value(value, type_of='int'):
     elif type_of == 'float' or type_of == 'double':
         return Factory.Float(*float_constant(value))
     elif type_of == 'int':
-        logging.debug(value)
         return Factory.Integer(*int_constant(value))
     elif type_of == 'char':
         return Factory.Char(*char_constant(value))
@@ -128,9 +128,7 @@ def copy_pointer(pointer, ptr_type=None):
     if ptr_type is None:
         size = pointer.type_size
     else: #cast to ptr of different type
-        sizes = []
-        get_sizes(ptr_type, sizes)  # returns alignment
-        size = sum(sizes)
+        size = get_layout(ptr_type).size
     return Factory.Pointer(pointer.data, size, pointer.offset)
 
 def generate_null_pointer():
@@ -158,9 +156,7 @@ def cast(value, typedeclt, state=None):  # pylint: disable=unused-argument
         return cast(value, typedeclt.type, state)
 
     if isinstance(value, BV.SizedSet):
-        sizes = []
-        get_sizes(typedeclt, sizes)  # returns alignment
-        size = sum(sizes)
+        size = get_layout(typedeclt).size
         result = BV.SizedSet(size)
         for item in value:
             new_item = cast(item, typedeclt, state)
@@ -186,7 +182,6 @@ def cast(value, typedeclt, state=None):  # pylint: disable=unused-argument
         if isinstance(typedeclt.type, AST.IdentifierType):
             types = typedeclt.type.names
             byte_value = value.get_byte_value()
-            logging.debug(byte_value)
             result = generate_value(byte_value, " ".join(types))
         else:
             #TODO do this the right way, the rest of casting as well
@@ -196,5 +191,6 @@ def cast(value, typedeclt, state=None):  # pylint: disable=unused-argument
         logging.error('\tUnsupported cast: %s', str(typedeclt.type))
         raise CESKException("Unsupported cast")
 
-    logging.debug("Cast %s to %s", str(value), str(result))
+    if trace.VALUES:
+        trace.emit('values', "Cast %s to %s", value, result)
     return result
@@ -14,5 +14,5 @@ class AbstractChar(Factory.getIntegerClass()):
     def __str__(self):
         try:
             return chr(self.data)
-        except ValueError: # does not map to ascii (e.g. negative chars)
+        except (ValueError, TypeError): # not ascii (e.g. negative) or a range
             return str(self.data)
@@ -1,6 +1,5 @@
 """ Abstact Pointer class that uses the
     Abstracted integer object as its offset """
-from copy import deepcopy
 import cesk.limits as limits
 from cesk.exceptions import MemoryAccessViolation
 from .base_values import ReferenceValue, ByteValue, BaseInteger
@@ -43,21 +42,18 @@ class AbstractPointer(ReferenceValue):  #pylint:disable=too-few-public-methods
         return Factory.Integer(int(self.data >= other.data), 'int')
 
     def __add__(self, other):
-        ptr = deepcopy(self)
         if isinstance(other, (Factory.getIntegerClass(), int)):
-            ptr.offset = ptr.offset + other
-        else:
-            raise Exception("Pointers can only be added to int")
-        return ptr
+            return Factory.Pointer(self.data, self.type_size,
+                                   self.offset + other)
+        raise Exception("Pointers can only be added to int")
 
     def __sub__(self, other):
-        ptr = deepcopy(self)
         if isinstance(other, Factory.getIntegerClass()):
-            ptr.offset = ptr.offset - other
-            return ptr
+            return Factory.Pointer(self.data, self.type_size,
+                                   self.offset - other)
         elif isinstance(other, int):
-            ptr.offset = ptr.offset - Factory.Integer(other, 'long')
-            return ptr
+            offset = self.offset - Factory.Integer(other, 'long')
+            return Factory.Pointer(self.data, self.type_size, offset)
         elif isinstance(other, Factory.getPointerClass()):
             if self.get_block() != other.get_block():
                 raise MemoryAccessViolation("Invalid pointer difference")
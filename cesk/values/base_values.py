@@ -1,4 +1,4 @@
-from copy import deepcopy
+import random
 from cesk.exceptions import CESKException, TransformError, \
                             MemoryAccessViolation
 
@@ -180,80 +180,119 @@ class ReferenceValue(ArithmeticValue): #pylint:disable=all
 
 #Special Case values to handle needed gaps
 class ByteValue:
-    """ Class to represent values of bits from a partial read """
+    """ Class to represent values of bits from a partial read. The bits are
+        kept in two integers laid out like an unsigned little endian number:
+        known has a 1 for every bit that is not top and value holds those
+        bits. Bit index i, as used by bit and set_bit, counts from the most
+        significant bit of the first byte """
+    __slots__ = ('size', 'known', 'value')
     one = 1
     zero = 0
     top = 2
     def __init__(self, size=0, default_value=2):
         #size in bytes
-        self.bits = [default_value]*(size*8)
         self.size = size
+        if default_value == ByteValue.top:
+            self.known = 0
+            self.value = 0
+        else:
+            self.known = (1 << (size*8)) - 1
+            self.value = self.known if default_value == ByteValue.one else 0
+
+    @classmethod
+    def _make(cls, size, known, value):
+        """ Byte value from its masks """
+        result = cls.__new__(cls)
+        result.size = size
+        result.known = known
+        result.value = value
+        return result
 
     def append(self, other):
         """ increase self by others size and add its bits to self 
             Warning this fuction does not mutate it only copies and appends"""
-        result = ByteValue()
-        result.size = self.size + other.size
-        result.bits = self.bits + other.bits
-        return result
+        shift = self.size*8
+        return ByteValue._make(self.size + other.size,
+                               self.known | (other.known << shift),
+                               self.value | (other.value << shift))
 
     def get_byte_value(self, start=-1, num_bytes=None):
         """ dummy to make casting easier """
         if start == -1:
-            return deepcopy(self)
+            return ByteValue._make(self.size, self.known, self.value)
         if start+num_bytes > self.size:
             raise CESKException("Request for too many bytes from byte value")
-        value = ByteValue()
-        value.size = num_bytes
-        value.bits = self.bits[start*8:(start+num_bytes)*8]
-        return value
+        mask = (1 << (num_bytes*8)) - 1
+        return ByteValue._make(num_bytes, (self.known >> (start*8)) & mask,
+                               (self.value >> (start*8)) & mask)
+
+    @staticmethod
+    def _position(index):
+        """ Position in the masks of bit index """
+        return 8*(index // 8) + 7 - index % 8
+
+    def bit(self, index):
+        """ one, zero or top for bit index """
+        position = ByteValue._position(index)
+        if not (self.known >> position) & 1:
+            return ByteValue.top
+        return (self.value >> position) & 1
+
+    def set_bit(self, index, bit):
+        """ Sets bit index to one, zero or top """
+        mask = 1 << ByteValue._position(index)
+        if bit == ByteValue.top:
+            self.known &= ~mask
+            self.value &= ~mask
+        else:
+            self.known |= mask
+            if bit == ByteValue.one:
+                self.value |= mask
+            else:
+                self.value &= ~mask
+
+    def has_bit(self, bit):
+        """ True if any bit is one, zero or top as asked """
+        if bit == ByteValue.top:
+            return self.known != (1 << (self.size*8)) - 1
+        if bit == ByteValue.one:
+            return self.value != 0
+        return self.known & ~self.value != 0
+
+    def to_int(self):
+        """ The bits as an unsigned integer, top bits are randomized """
+        unknown = ~self.known & ((1 << (self.size*8)) - 1)
+        if unknown:
+            return self.value | (random.getrandbits(self.size*8) & unknown)
+        return self.value
 
     def get_bytes(self):
         """ Results in a bytes-like object of len self.size and top is randomized
             for the pack module used for floats """
-        bytes_lst = []
-        for byte in range(self.size):
-            byte_val = 0
-            for bit in range(8):
-                if self.bits[byte*8+bit] == ByteValue.one or \
-                   (self.bits[byte*8+bit] == ByteValue.top and
-                        random.randint(0,1) == 1):
-                    byte_val += 2**(7-bit)
-            bytes_lst.append(byte_val)
-        return bytes(bytes_lst)
+        return self.to_int().to_bytes(self.size, 'little')
 
     def fromInt(self, int_value):
         """ writes to location equivelent to the unsigned integer value """
         assert(int_value >= 0)
-        index = 0
-        while index < self.size*8:
-            byte = int_value&255
-            int_value //= 256
-            for i in range(8):
-                self.bits[index+(7-i)] = byte & 1
-                byte //= 2
-            index += 8
+        self.known = (1 << (self.size*8)) - 1
+        self.value = int_value & self.known
 
     @classmethod
     def fromByte(cls, byte_value):
         """ Takes a int 0-255 and converts to a size 1 byte value """
         assert(byte_value >= 0 and byte_value < 256)
-        result = cls(1)
-        for index in range(8):
-            result.bits[7-index] = byte_value & 1
-            byte_value //= 2
-
-        return result
+        return cls._make(1, 255, byte_value)
 
     def __str__(self):
-       return str(self.bits)
+       return str([self.bit(i) for i in range(self.size*8)])
 
     def __eq__(self, other):
-        return str(self) == str(other)
+        return isinstance(other, ByteValue) and self.size == other.size and \
+               self.known == other.known and self.value == other.value
 
     def __hash__(self):
-        return hash(str(self))
- 
+        return hash((self.size, self.known, self.value))
+
 class UnitializedValue(ArithmeticValue):
     """ Type to represent a unitialized value of a certian size """
     bad_use_str = 'Use of a unitialized value'
@@ -292,6 +331,12 @@ class SizedSet(set):
         super().__init__()
         self.size = size
 
+    def __reduce__(self):
+        return (self.__class__, (self.size,), list(self))
+
+    def __setstate__(self, items):
+        self.update(items)
+
     def get_truth_value(self):
         """ mimic calling truth value on all items in set """
         truth_value = set()
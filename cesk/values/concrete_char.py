@@ -1,7 +1,5 @@
 """ The char class"""
-import random
 from .factory import Factory
-from .base_values import ByteValue
 
 class ConcreteChar(Factory.getIntegerClass()):
     """ implementation of an char Type"""
@@ -46,13 +44,5 @@ class ConcreteChar(Factory.getIntegerClass()):
     @classmethod
     def from_byte_value(cls, byte_value, type_of):
         """ Method for Integer Generation from a byte value """
-        data = 0
-        place = 128
-        for bit in byte_value.bits:
-            if bit == ByteValue.one:
-                data += place
-            elif bit == ByteValue.top:
-                data += place*random.randint(0, 1)#unknown pick a ranodm value
-            place //= 2
-
+        data = byte_value.to_int() & 255 #unknown bits pick a random value
         return cls(data, type_of)
@@ -1,5 +1,4 @@
 """ ConcreteInteger Class """
-import random
 import cesk.values.base_values as BV
 import cesk.limits as limits
 from .factory import Factory
@@ -91,23 +90,10 @@ class ConcreteInteger(BV.BaseInteger): #pylint:disable=too-few-public-methods
     @classmethod
     def from_byte_value(cls, byte_value, type_of):
         """ Method for Integer Generation from a byte value """
-        data = 0
-        place = 1
-        look_for = BV.ByteValue.one
-        byte_list = [byte_value.bits[i:i+8]
-                     for i in range(0, len(byte_value.bits), 8)]
-        if 'unsigned' not in type_of:
-            if byte_list[-1][0] == BV.ByteValue.one: #negative number
-                look_for = BV.ByteValue.zero
-                place = -1
-                data = -1
-        for byte in byte_list:
-            for bit in byte[::-1]:
-                if bit == look_for:
-                    data += place
-                elif bit == BV.ByteValue.top:
-                    data += place*random.randint(0, 1)#unknown pick ranodm value
-                place *= 2
+        data = byte_value.to_int() #unknown bits pick a random value
+        if 'unsigned' not in type_of and byte_value.size and \
+                byte_value.bit(8*(byte_value.size-1)) == BV.ByteValue.one:
+            data -= 1 << (8*byte_value.size) #negative number
 
         return cls(data, type_of, byte_value.size)
 
@@ -1,5 +1,4 @@
 '''Concerte Implementation of all the Types'''
-from copy import deepcopy
 import cesk.limits as limits
 from .base_values import ReferenceValue, ByteValue, BaseInteger
 from .factory import Factory
@@ -37,24 +36,19 @@ class ConcretePointer(ReferenceValue):  #pylint:disable=too-few-public-methods
         return Factory.Integer(int(self.data >= other.data), 'int')
 
     def __add__(self, other):
-        ptr = deepcopy(self)
         if isinstance(other, Factory.getIntegerClass()):
-            ptr.offset += other.data
-        elif isinstance(other, int):
-            ptr.offset += other
-        else:
+            other = other.data
+        elif not isinstance(other, int):
             raise Exception("Pointers can only be added to int")
-        return ptr
+        return Factory.Pointer(self.data, self.type_size, self.offset + other)
 
     def __sub__(self, other):
-        ptr = deepcopy(self)
-
         if isinstance(other, Factory.getIntegerClass()):
-            ptr.offset += -1 * other.data
-            return ptr
+            return Factory.Pointer(self.data, self.type_size,
+                                   self.offset - other.data)
         elif isinstance(other, int):
-            ptr.offset += -1 * other
-            return ptr
+            return Factory.Pointer(self.data, self.type_size,
+                                   self.offset - other)
         elif isinstance(other, Factory.getPointerClass()):
             return Factory.Integer((self.data+self.offset) -
                                    (other.data+other.offset), 'long')
@@ -1,9 +1,51 @@
 '''Is a factory for each value type'''
+from collections import OrderedDict
 import cesk.config
+import cesk.limits as limits
 from cesk.exceptions import UnknownConfiguration
 
+PLAIN_DATA = frozenset((int, float, str, bool))
+
+def value_key(data):
+    '''Hashable key for the data of a value that tells apart data that
+    compares equal but makes a different value, like 1, 1.0 and True'''
+    if type(data) in PLAIN_DATA: #pylint: disable=unidiomatic-typecheck
+        return type(data), data
+    if isinstance(data, set):
+        return frozenset, frozenset(data)
+    if hasattr(data, 'type_of'): #a value, like an abstract pointer offset
+        return type(data), data.type_of, data.size, value_key(data.data)
+    return type(data), data
+
 class Factory():
-    '''Factory holding the constructor for each value'''
+    '''Factory holding the constructor for each value. Values are never
+    changed once made, so integers, chars and pointers made from the same
+    arguments are shared'''
+    #value by (class, data, type_of, size) or (class, address, type_size,
+    #offset) for pointers, least recently used first
+    _values = OrderedDict()
+    #concrete values are evicted past this many, abstract values are few
+    CACHE_SIZE = 1 << 10
+    _limits = None #sizes of the shared values come from this limits config
+
+    @staticmethod
+    def shared(value_class, key, *args):
+        '''The value value_class(*args) made for key, made now if there is
+        none'''
+        values = Factory._values
+        if Factory._limits is not limits.CONFIG:
+            values.clear()
+            Factory._limits = limits.CONFIG
+        value = values.get(key)
+        if value is not None:
+            values.move_to_end(key)
+            return value
+        value = value_class(*args)
+        values[key] = value
+        if len(values) > Factory.CACHE_SIZE and \
+                cesk.config.CONFIG['values'] == 'concrete':
+            values.popitem(last=False)
+        return value
 
     @staticmethod
     def getFunctionDefinitionClass(): #pylint: disable=invalid-name
@@ -21,6 +63,8 @@ class Factory():
             from .k_integer import KInteger as Integer
         elif cesk.config.CONFIG['values'] == 'trivial':
             from .tri_integer import TriInteger as Integer
+        elif cesk.config.CONFIG['values'] == 'interval':
+            from .interval_integer import IntervalInteger as Integer
         else:
             raise UnknownConfiguration('values')
         Factory.getIntegerClass = lambda: Integer #perform checks only once
@@ -35,6 +79,8 @@ class Factory():
             from .abstract_pointer import AbstractPointer as Pointer
         elif cesk.config.CONFIG['values'] == 'trivial':
             from .abstract_pointer import AbstractPointer as Pointer
+        elif cesk.config.CONFIG['values'] == 'interval':
+            from .interval_pointer import IntervalPointer as Pointer
         else:
             raise UnknownConfiguration('values')
         Factory.getPointerClass = lambda: Pointer #perform checks only once
@@ -47,7 +93,7 @@ class Factory():
             from .concrete_char import ConcreteChar as Char
         elif cesk.config.CONFIG['values'] == 'abstract':
             from .abstract_char import AbstractChar as Char
-        elif cesk.config.CONFIG['values'] == 'trivial':
+        elif cesk.config.CONFIG['values'] in ('trivial', 'interval'):
             from .abstract_char import AbstractChar as Char
         else:
             raise UnknownConfiguration('values')
@@ -61,7 +107,7 @@ class Factory():
             from .concrete_float import ConcreteFloat as Float
         elif cesk.config.CONFIG['values'] == 'abstract':
             from .tfloat import TFloat as Float
-        elif cesk.config.CONFIG['values'] == 'trivial':
+        elif cesk.config.CONFIG['values'] in ('trivial', 'interval'):
             from .tfloat import TFloat as Float
         else:
             raise UnknownConfiguration('values')
@@ -71,7 +117,9 @@ class Factory():
     @staticmethod
     def Char(data, type_of): #pylint: disable=invalid-name
         '''Char constructor'''
-        return Factory.getCharClass()(data, type_of)
+        cls = Factory.getCharClass()
+        return Factory.shared(cls, (cls, value_key(data), type_of),
+                              data, type_of)
 
     @staticmethod
     def Float(data, type_of): #pylint: disable=invalid-name
@@ -81,12 +129,17 @@ class Factory():
     @staticmethod
     def Integer(data, type_of, size=1): #pylint: disable=invalid-name
         '''Integer constructor'''
-        return Factory.getIntegerClass()(data, type_of, size)
+        cls = Factory.getIntegerClass()
+        return Factory.shared(cls, (cls, value_key(data), type_of, size),
+                              data, type_of, size)
 
     @staticmethod
     def Pointer(address, type_size, offset=0): #pylint: disable=invalid-name
         '''Pointer constructor'''
-        return Factory.getPointerClass()(address, type_size, offset)
+        cls = Factory.getPointerClass()
+        return Factory.shared(cls, (cls, value_key(address), type_size,
+                                    value_key(offset)),
+                              address, type_size, offset)
 
     @staticmethod
     def FunctionDefinition(node): #pylint: disable=invalid-name
@@ -6,3 +6,10 @@ class FunctionDefinition:  #pylint:disable=too-few-public-methods
     def __init__(self, node):
         self.size = limits.CONFIG.get_word_size()
         self.node = node
+
+    def __eq__(self, other):
+        return isinstance(other, FunctionDefinition) and \
+               self.node is other.node
+
+    def __hash__(self):
+        return hash(self.node)
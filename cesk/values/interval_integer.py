@@ -0,0 +1,226 @@
+""" Integer known to lie in a range of values """
+import cesk.values.base_values as BV
+import cesk.limits as limits
+from .abstract_literals import AbstractLiterals as AL
+from .factory import Factory
+
+class IntervalInteger(BV.BaseInteger):
+    """ implementation of an Integral Type as the range low to high. The data
+        is an int when the range is one value and (low, high) otherwise. One
+        value wraps around like a concrete integer, a range that could
+        overflow is the whole range of the type """
+
+    def __init__(self, data, type_of, size=1):
+        self.type_of = type_of
+        if type_of == 'bit_value':
+            self.size = size
+            self.min_value = 0
+            self.max_value = 2**(size*8) - 1
+        else:
+            self.size = limits.CONFIG.get_size(type_of.split())
+            self.min_value, self.max_value = limits.RANGES[type_of]
+        if isinstance(data, tuple):
+            low, high = data
+        elif isinstance(data, (AL, set)):
+            low, high = self.min_value, self.max_value
+        else:
+            low = high = self.bound(int(data))
+        if low < self.min_value or high > self.max_value:
+            low, high = self.min_value, self.max_value
+        self.data = low if low == high else (low, high)
+
+    @staticmethod
+    def bounds(value):
+        """ (low, high) of an interval or of a value with int data, any
+            number for other values """
+        if isinstance(value.data, tuple):
+            return value.data
+        if isinstance(value.data, int):
+            return value.data, value.data
+        return float('-inf'), float('inf')
+
+    def _range(self, low, high):
+        """ Interval of this type from low to high """
+        if low == high:
+            return Factory.Integer(low, self.type_of, self.size)
+        if low < self.min_value or high > self.max_value:
+            return Factory.Integer(AL.TOP, self.type_of, self.size)
+        return Factory.Integer((low, high), self.type_of, self.size)
+
+    @staticmethod
+    def _truth(true, false):
+        """ int interval of a comparison that can be true and/or false """
+        if not false:
+            return Factory.Integer(1, 'int')
+        if not true:
+            return Factory.Integer(0, 'int')
+        return Factory.Integer((0, 1), 'int')
+
+    def get_truth_value(self):
+        """ Set of truth values """
+        low, high = IntervalInteger.bounds(self)
+        if low <= 0 <= high:
+            return {True, False} if low != high else {False}
+        return {True}
+
+    def join(self, other):
+        """ Smallest interval holding both, None for another type """
+        if self.type_of != other.type_of:
+            return None
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return self._range(min(low, other_low), max(high, other_high))
+
+    def widen(self, other):
+        """ Interval holding both where a bound of other that is past the
+            bound of self jumps to the end of the type """
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        if other_low < low:
+            low = self.min_value
+        if other_high > high:
+            high = self.max_value
+        return self._range(low, high)
+
+    def __add__(self, other):
+        if not isinstance(self.data, tuple) and \
+                not isinstance(other.data, tuple):
+            return Factory.Integer(self.data + other.data, self.type_of,
+                                   self.size)
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return self._range(low + other_low, high + other_high)
+
+    def __sub__(self, other):
+        if not isinstance(self.data, tuple) and \
+                not isinstance(other.data, tuple):
+            return Factory.Integer(self.data - other.data, self.type_of,
+                                   self.size)
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return self._range(low - other_high, high - other_low)
+
+    def __mul__(self, other):
+        if not isinstance(self.data, tuple) and \
+                not isinstance(other.data, tuple):
+            return Factory.Integer(self.data * other.data, self.type_of,
+                                   self.size)
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        corners = [low * other_low, low * other_high,
+                   high * other_low, high * other_high]
+        return self._range(min(corners), max(corners))
+
+    def __truediv__(self, other):
+        if not isinstance(self.data, tuple) and \
+                not isinstance(other.data, tuple):
+            return Factory.Integer(self.data // other.data, self.type_of,
+                                   self.size)
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        if other_low <= 0 <= other_high:
+            return Factory.Integer(AL.TOP, self.type_of, self.size)
+        corners = [low // other_low, low // other_high,
+                   high // other_low, high // other_high]
+        return self._range(min(corners), max(corners))
+
+    def __mod__(self, other):
+        if not isinstance(self.data, tuple) and \
+                not isinstance(other.data, tuple):
+            return Factory.Integer(self.data % other.data, self.type_of,
+                                   self.size)
+        other_low, other_high = IntervalInteger.bounds(other)
+        if other_low > 0: #the result has the sign of the divisor
+            return self._range(0, other_high - 1)
+        if other_high < 0:
+            return self._range(other_low + 1, 0)
+        return Factory.Integer(AL.TOP, self.type_of, self.size)
+
+    def __lt__(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(low < other_high, high >= other_low)
+
+    def __le__(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(low <= other_high, high > other_low)
+
+    def equals(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(
+            low <= other_high and other_low <= high,
+            not low == high == other_low == other_high)
+
+    def __ne__(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(
+            not low == high == other_low == other_high,
+            low <= other_high and other_low <= high)
+
+    def __gt__(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(high > other_low, low <= other_high)
+
+    def __ge__(self, other):
+        low, high = IntervalInteger.bounds(self)
+        other_low, other_high = IntervalInteger.bounds(other)
+        return IntervalInteger._truth(high >= other_low, low < other_high)
+
+    def bound(self, value):
+        """ Simulates two's complement overflow of integral types """
+        unsigned = value - self.min_value
+        umax = self.max_value - self.min_value + 1
+        return unsigned % umax + self.min_value
+
+    def get_byte_value(self, start=-1, num_bytes=None):
+        """ Value of the unsigned bits stored, the bits that differ between
+            the bounds of a range are top """
+        modulus = 1 << (self.size*8)
+        low, high = IntervalInteger.bounds(self)
+        if low < 0 <= high: #the sign bit is unknown
+            known = value = 0
+        else:
+            low %= modulus
+            unknown = (1 << (low ^ (high % modulus)).bit_length()) - 1
+            known = (modulus - 1) & ~unknown
+            value = low & known
+        if start == -1:
+            start, num_bytes = 0, self.size
+        mask = (1 << (num_bytes*8)) - 1
+        byte_value = BV.ByteValue(num_bytes)
+        byte_value.known = (known >> (start*8)) & mask
+        byte_value.value = (value >> (start*8)) & mask
+        return byte_value
+
+    @classmethod
+    def from_byte_value(cls, byte_value, type_of):
+        """ Method for Integer Generation from a byte value, the range of
+            every value the top bits could make """
+        modulus = 1 << (8*byte_value.size)
+        unknown = ~byte_value.known & (modulus - 1)
+        low, high = byte_value.value, byte_value.value | unknown
+        if 'unsigned' not in type_of and type_of != 'bit_value' and \
+                byte_value.size:
+            sign = byte_value.bit(8*(byte_value.size-1))
+            if sign == BV.ByteValue.top:
+                return Factory.Integer(AL.TOP, type_of, byte_value.size)
+            if sign == BV.ByteValue.one: #negative numbers
+                low, high = low - modulus, high - modulus
+        return Factory.Integer(low if low == high else (low, high), type_of,
+                               byte_value.size)
+
+    def __str__(self):
+        if isinstance(self.data, tuple):
+            return '[%d, %d]' % self.data
+        return str(self.data)
+
+    def __hash__(self):
+        return hash((self.type_of, self.data))
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalInteger) and \
+               self.type_of == other.type_of and self.data == other.data
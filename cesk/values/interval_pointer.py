@@ -0,0 +1,20 @@
+""" Abstract pointer with an interval offset """
+from .abstract_pointer import AbstractPointer
+from .factory import Factory
+
+class IntervalPointer(AbstractPointer):  #pylint:disable=too-few-public-methods
+    """ Pointers to the same block are joined by joining their offsets """
+
+    def join(self, other):
+        """ Pointer with the join of the offsets, None for another block """
+        if self.data != other.data or self.type_size != other.type_size:
+            return None
+        offset = self.offset.join(other.offset)
+        if offset is None:
+            return None
+        return Factory.Pointer(self.data, self.type_size, offset)
+
+    def widen(self, other):
+        """ Pointer with the offset widened by the offset of other """
+        return Factory.Pointer(self.data, self.type_size,
+                               self.offset.widen(other.offset))
@@ -1,5 +1,6 @@
 """ Abstract Integer that acts like a concrete integer from -1 to K """
 import cesk.values.base_values as BV
+import cesk.trace as trace
 from .concrete_integer import ConcreteInteger
 from .abstract_literals import AbstractLiterals as AL
 from .factory import Factory
@@ -107,9 +108,9 @@ class KInteger(ConcreteInteger):
     @classmethod
     def from_byte_value(cls, byte_value, type_of):
         """ Method for Integer Generation from a byte value """
-        import logging
-        if BV.ByteValue.top in byte_value.bits:
-            logging.debug("Top Created")
+        if byte_value.has_bit(BV.ByteValue.top):
+            if trace.VALUES:
+                trace.emit('values', "Top Created")
             return Factory.Integer(AL.TOP, type_of)
         return super().from_byte_value(byte_value, type_of)
 
@@ -182,13 +182,13 @@ class TriInteger(BaseInteger): #pylint:disable=too-few-public-methods
 
         if AL.MINUS in self.data:
             if len(self.data) == 1:
-                byte_value.bits[0] = ByteValue.one
+                byte_value.set_bit(0, ByteValue.one)
             return byte_value
 
         if AL.ZERO in self.data and len(self.data) == 1:
             byte_value = ByteValue(self.size, ByteValue.zero)
         else:
-            byte_value.bits[0] = ByteValue.zero
+            byte_value.set_bit(0, ByteValue.zero)
 
         return byte_value
 
@@ -196,12 +196,12 @@ class TriInteger(BaseInteger): #pylint:disable=too-few-public-methods
     def from_byte_value(cls, byte_value, type_of):
         """ convert to abstract from byte value """
         types = set()
-        if byte_value.bits[0] != ByteValue.zero:
+        if byte_value.bit(0) != ByteValue.zero:
             types.add(AL.MINUS)
-        if all(i != ByteValue.one for i in byte_value.bits):
+        if not byte_value.has_bit(ByteValue.one):
             types.add(AL.ZERO)
-        if byte_value.bits[0] != ByteValue.one and \
-                all(i != ByteValue.zero for i in byte_value.bits):
+        if byte_value.bit(0) != ByteValue.one and \
+                not byte_value.has_bit(ByteValue.zero):
             types.add(AL.PLUS)
 
         return cls(types, type_of, byte_value.size)
@@ -1,11 +1,8 @@
 #!/usr/bin/python3
 """Main function for cesk analyzer"""
 
-import tempfile
 import json
 import time
-import os
-import sys
 import argparse
 import pickle
 import logging
@@ -13,29 +10,115 @@ from main import parse
 from transforms import transform
 from cesk.limits import set_config
 import cesk.config as cnf
+import cesk.trace as trace
 import cesk
+import cesk.profiler as profiler
+import cesk.interpret as interpret
 from cesk.exceptions import CESKException
+from cesk.budget import Budget
+from cesk.checkpoint import Checkpoint
 
-def run_interpreter(ast, results, graph_name, injection_point):
-    """ function for redirecting the output of main to a file and
-        returning the result as a string  """
-    output = tempfile.NamedTemporaryFile()
-    prev = sys.stdout
-    prevfd = os.dup(sys.stdout.fileno())
-    os.dup2(output.fileno(), sys.stdout.fileno())
-    sys.stdout = open(output.name, "w")#I might need to close this
+REPORTED = ('memory_safe', 'states_generated', 'states_matched',
+            'states_evaluated', 'collapses', 'gc', 'summaries', 'budget',
+            'parallel', 'output') #what cesk.main returns, in order
 
-    memory_safe, states_generated, states_matched, states_evaluated \
-        = cesk.main(ast, graph_name, injection_point)
+def run_interpreter(ast, results, graph_name, injection_point, jobs=1, #pylint: disable=too-many-arguments
+                    graph_format='graphviz', budget=None, checkpoint=None):
+    """ function for running main and putting what it found, and what
+        the program printed, into results """
+    found = dict(zip(REPORTED, cesk.main(ast, graph_name, injection_point,
+                                         jobs, graph_format, budget,
+                                         checkpoint)))
+    results['output'] = found.pop('output')
+    for key, value in found.items():
+        if value is not None: #the reports of options not used are None
+            results[key] = value
 
-    os.dup2(prevfd, prev.fileno())
-    sys.stdout = prev
+def apply_options(args, parser):
+    """ Sets the configuration from the arguments, the parser reports the
+        options that can not be used together. Returns the checkpoint and
+        the budget of the run """
+    #setup passed in configuration
+    if args.configuration is not None:
+        logging.info("Current configuration: %s", str(args.configuration))
+        if args.configuration in dir(cnf):
+            cnf.CONFIG = getattr(cnf, args.configuration)
+        else:
+            print("Invalid configuration group:", args.configuration)
+            exit(0)
+    else:
+        logging.info("Current configuration: DEFAULT")
+    if args.values is not None:
+        cnf.CONFIG['values'] = args.values
+    apply_store_options(args, parser)
+    if args.scheduler is not None:
+        cnf.CONFIG['scheduler'] = args.scheduler
+    if args.blocks is not None:
+        if args.blocks == 'smashed' and cnf.CONFIG['store_update'] != 'weak':
+            parser.error('--blocks smashed needs weak store updates')
+        cnf.CONFIG['blocks'] = args.blocks
+    if args.set_cap is not None:
+        cnf.CONFIG['set_cap'] = args.set_cap
+    set_config(cnf.CONFIG['limits'])
+    interpret.set_dispatch(args.dispatch == 'name')
+    checkpoint = make_checkpoint(args, parser)
+    enable_trace(args, parser)
+    return checkpoint, Budget(args.max_states, args.max_seconds, args.max_rss)
 
-    results['output'] = open(output.name).read()
-    results['memory_safe'] = memory_safe
-    results['states_generated'] = states_generated
-    results['states_matched'] = states_matched
-    results['states_evaluated'] = states_evaluated
+def apply_store_options(args, parser):
+    """ Sets the store and the options that need a kind of store """
+    if args.store is not None:
+        cnf.CONFIG['store'] = args.store
+    if args.jobs > 1:
+        if args.store == 'shared':
+            parser.error('--jobs needs the persistent store')
+        cnf.CONFIG['store'] = 'persistent'
+    if args.gc:
+        if args.store == 'shared':
+            parser.error('--gc needs the persistent store')
+        if args.jobs > 1:
+            parser.error('--gc can not be used with --jobs')
+        cnf.CONFIG['store'] = 'persistent'
+        cnf.CONFIG['gc'] = 'reachable'
+    if args.summaries:
+        if args.store == 'shared':
+            parser.error('--summaries needs the persistent store')
+        if args.jobs > 1:
+            parser.error('--summaries can not be used with --jobs')
+        cnf.CONFIG['store'] = 'persistent'
+        cnf.CONFIG['summaries'] = 'memo'
+    if args.tick is not None:
+        if args.tick == 'dependency' and cnf.CONFIG['store'] != 'shared':
+            parser.error('--tick dependency needs the shared store')
+        cnf.CONFIG['tick'] = args.tick
+    if args.profile and args.jobs > 1:
+        parser.error('--profile can not be used with --jobs')
+
+def make_checkpoint(args, parser):
+    """ The checkpoint of the run, None without --checkpoint """
+    if args.checkpoint is None:
+        if args.resume:
+            parser.error('--resume needs --checkpoint')
+        return None
+    if args.jobs > 1:
+        parser.error('--checkpoint can not be used with --jobs')
+    if args.graph is not None:
+        parser.error('--checkpoint can not be used with --graph')
+    return Checkpoint(args.checkpoint, args.checkpoint_states,
+                      args.checkpoint_seconds, args.resume)
+
+def enable_trace(args, parser):
+    """ Turns on the trace categories asked for """
+    if args.trace is None:
+        return
+    try:
+        categories = trace.parse_categories(args.trace)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.trace_file is not None:
+        trace.enable(categories, trace.TraceFile(args.trace_file))
+    else:
+        trace.enable(categories, trace.RingBuffer(args.trace_size))
 
 #pylint: disable=too-many-statements
 def main():
@@ -50,12 +133,88 @@ def main():
     parser.add_argument('--graph', '-g',
                         required=False, type=str,
                         help='Name of graph output file')
+    parser.add_argument('--graph_format', required=False,
+                        choices=['graphviz', 'dot', 'jsonl'],
+                        default='graphviz',
+                        help='graphviz renders the graph when the run ends, '
+                        'dot and jsonl write it while states are explored '
+                        'and keep no edges in memory')
     parser.add_argument('--includes', '-I',
                         required=False, type=str,
                         help='Comma separated includes for preprocessing')
     parser.add_argument('--configuration', '-c',
                         required=False, type=str,\
                         help='Name of configuration group ex: -c CONCRETE')
+    parser.add_argument('--values', required=False,
+                        choices=['concrete', 'abstract', 'trivial', 'interval'],
+                        help='Domain of integer values')
+    parser.add_argument('--store', required=False,
+                        choices=['shared', 'persistent'],
+                        help='Share one store or give every state its own')
+    parser.add_argument('--tick', required=False,
+                        choices=['concrete', 'abstract', 'trivial',
+                                 'dependency'],
+                        help='When a seen state is evaluated again, '
+                        'dependency needs the shared store')
+    parser.add_argument('--scheduler', required=False,
+                        choices=['fifo', 'lifo', 'rpo', 'loop_depth'],
+                        help='Order in which states are evaluated')
+    parser.add_argument('--blocks', required=False,
+                        choices=['eager', 'lazy', 'smashed'],
+                        help='How memory blocks keep their slots, smashed '
+                        'arrays need weak store updates')
+    parser.add_argument('--set_cap', required=False, type=int,
+                        help='Most values kept in a store slot under weak '
+                        'updates before they are collapsed, 0 for no cap')
+    parser.add_argument('--dispatch', required=False, default='table',
+                        choices=['table', 'name'],
+                        help='Find the handler of a statement in a table '
+                        'or by its name, to compare them')
+    parser.add_argument('--gc', required=False, action='store_true',
+                        help='Collect the store addresses a state can no '
+                        'longer reach, uses the persistent store')
+    parser.add_argument('--summaries', required=False, action='store_true',
+                        help='Reuse the changes and return value of an '
+                        'earlier call with the same arguments and the same '
+                        'blocks read, uses the persistent store')
+    parser.add_argument('--jobs', required=False, type=int, default=1,
+                        help='Number of processes exploring states, '
+                        'uses the persistent store')
+    parser.add_argument('--max_states', required=False, type=int,
+                        help='Stop after evaluating this many states, '
+                        'memory_safe is then unknown unless an error was '
+                        'found')
+    parser.add_argument('--max_seconds', required=False, type=float,
+                        help='Stop once the run has taken this many seconds')
+    parser.add_argument('--max_rss', required=False, type=float,
+                        help='Stop once the process has used this many '
+                        'megabytes of resident memory')
+    parser.add_argument('--checkpoint', required=False, type=str,
+                        help='Save the exploration to this file every so '
+                        'often and when a budget is spent')
+    parser.add_argument('--checkpoint_states', required=False, type=int,
+                        help='Save a checkpoint every this many states')
+    parser.add_argument('--checkpoint_seconds', required=False, type=float,
+                        help='Save a checkpoint every this many seconds, '
+                        'the default is ' + str(Checkpoint.DEFAULT_SECONDS))
+    parser.add_argument('--resume', required=False, action='store_true',
+                        help='Go on from the checkpoint file if there is '
+                        'one, with the same program and options')
+    parser.add_argument('--profile', required=False, action='store_true',
+                        help='Count and time the program points, handlers '
+                        'and store operations, the hottest are added to '
+                        'the result')
+    parser.add_argument('--trace', required=False, type=str,
+                        help='Comma separated trace categories, any of '
+                        + ', '.join(trace.CATEGORIES) + ' or all')
+    parser.add_argument('--trace_file', required=False, type=str,
+                        help='Write the trace to this binary file instead '
+                        'of keeping the last records in memory, read it '
+                        'with python3 -m cesk.trace')
+    parser.add_argument('--trace_size', required=False, type=int,
+                        default=trace.DEFAULT_RING_SIZE,
+                        help='Number of records kept in memory, they are '
+                        'printed to stderr when the run ends')
     parser.add_argument('--inject', '-j', \
                         required=False, type=str, \
                         help='Name of injection point function')
@@ -70,18 +229,7 @@ def main():
 
     needs_preprocess = False if args.no_preprocess else True
 
-    #setup passed in configuration
-    if args.configuration is not None:
-        logging.info("Current configuration: %s", str(args.configuration))
-        if args.configuration in dir(cnf):
-            cnf.CONFIG = getattr(cnf, args.configuration)
-        else:
-            print("Invalid configuration group:", args.configuration)
-            exit(0)
-    else:
-        logging.info("Current configuration: DEFAULT")
-    set_config(cnf.CONFIG['limits'])
-
+    checkpoint, budget = apply_options(args, parser)
     result = {}
     #TODO add timing option for benchmarks
     try:
@@ -114,12 +262,21 @@ def main():
             result["transform_time"] = end - start
 
         #interpret
+        if args.profile:
+            profiler.enable()
         start = time.process_time()
-        run_interpreter(ast, result, args.graph, args.inject)
+        run_interpreter(ast, result, args.graph, args.inject, args.jobs,
+                        args.graph_format, budget, checkpoint)
         end = time.process_time()
         result["interpretation_time"] = end - start
+        if args.profile:
+            result["profile"] = profiler.report()
     except CESKException as exception:
         raise exception #todo add stack trace to result
+    finally:
+        profiler.disable()
+        trace.dump()
+        trace.disable()
     print(json.dumps(result))
 
 if __name__ == "__main__":
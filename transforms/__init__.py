@@ -28,6 +28,8 @@ Enum < TypeDef
 
 """
 
+import cesk.trace as trace
+
 # imports for transforms
 from .sizeof_type import SizeofType
 from .correct_pragma_placement import CorrectPragmaPlacement
@@ -146,6 +148,8 @@ def get_transformers(ast):
 def transform(ast):
     """Perform each transform in package"""
     for (constructor, dep_func) in get_transformers(ast):
+        if trace.TRANSFORMS:
+            trace.emit('transforms', "Running %s", constructor.__name__)
         transformer = constructor(*dep_func(ast))
         ast = transformer.visit(ast)
     return ast